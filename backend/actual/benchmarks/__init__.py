@@ -0,0 +1 @@
+# benchmarks: performance measurement scripts
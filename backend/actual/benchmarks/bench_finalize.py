@@ -0,0 +1,234 @@
+# bench_finalize.py
+# /bot/finalize의 CPU 구간을 단계별로 따로 측정 (LLM 호출 제외)
+#   recommend    : festival_service.get_festival_recommendations (축제 테이블 조회 + 규칙 기반 점수)
+#   prompt       : build_festival_data_str + build_user_preferences_str (RAG 프롬프트 입력 조립)
+#   parse        : parse_with_repair (정상 JSON 응답)
+#   parse_repair : parse_with_repair (코드 펜스·후행 설명문·누락 필드가 있는 응답 → 로컬 복구)
+# 축제 테이블은 N건의 합성 데이터(인메모리 SQLite). 단계마다 최소 --min-rounds회, --min-time초 이상 반복해
+# min/median/mean을 구하고, 타이밍과 별도로 한 번 더 실행해 tracemalloc 최대 할당량(peak)을 잰다
+#
+# Run from backend/actual:
+#   python -m benchmarks.bench_finalize [--sizes 100 10000 1000000] [--stages recommend prompt parse parse_repair]
+#   python -m benchmarks.bench_finalize --baseline benchmarks/results/bench_finalize_baseline.json --save-baseline
+#   python -m benchmarks.bench_finalize --baseline benchmarks/results/bench_finalize_baseline.json   (회귀 시 종료 코드 1)
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Callable, Dict, List
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from core.database import Base, Conversation, Festival  # noqa: E402
+from core.fake_clovax import structured_recommendation_json  # noqa: E402
+from core.structured_output import parse_with_repair  # noqa: E402
+from namdo_bot import (  # noqa: E402
+    build_festival_data_str, build_rule_based_structured_response, build_user_preferences_str,
+    fill_structured_defaults
+)
+from schemas.models import StructuredRecommendationResponse  # noqa: E402
+from services.festival_service import festival_service  # noqa: E402
+
+STAGES = ("recommend", "prompt", "parse", "parse_repair")
+
+_REGIONS = {
+    "전북특별자치도": ["전주시", "고창군", "남원시", "군산시"],
+    "전라남도": ["순천시", "담양군", "여수시", "목포시"],
+    "광주광역시": ["동구", "서구", "북구"],
+}
+_FESTIVAL_TYPES = ["음식", "문화관광", "자연경관", "선택안함"]
+_PROGRESS_TYPES = ["평지", "산지", "선택안함"]
+
+# 모든 점수 분기를 지나도록 고른 대화 조건 (travel_period가 시작일 문자열에 포함되면 계절 점수)
+CONVERSATION = Conversation(
+    session_id="bench",
+    travel_period="2025",
+    companion_type="부모님 동반 가족",
+    energy_preference="여유로운",
+    interest_focus="음식",
+    additional_requirements="오래 걷기는 힘들어요"
+)
+
+
+def make_session(n: int, seed: int = 42, chunk: int = 50000):
+    """합성 축제 N건이 들어 있는 인메모리 SQLite 세션"""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine, tables=[Festival.__table__])
+    rng = random.Random(seed)
+    first_day = date(2025, 1, 1)
+    rows = []
+    with engine.begin() as conn:
+        for i in range(n):
+            region = rng.choice(list(_REGIONS))
+            start = first_day + timedelta(days=rng.randrange(730))
+            rows.append({
+                "contentid": str(1_000_000 + i),
+                "title": f"합성 축제 {i}",
+                "region": region,
+                "addr1": f"{region} {rng.choice(_REGIONS[region])} 축제로 {rng.randrange(1, 300)}",
+                "start_date": start.strftime("%Y%m%d"),
+                "end_date": (start + timedelta(days=rng.randrange(1, 15))).strftime("%Y%m%d"),
+                "image": f"http://example.com/{i}.jpg",
+                "progresstype": rng.choice(_PROGRESS_TYPES),
+                "festivaltype": rng.choice(_FESTIVAL_TYPES),
+                "tel": "061-000-0000",
+            })
+            if len(rows) >= chunk:
+                conn.execute(Festival.__table__.insert(), rows)
+                rows = []
+        if rows:
+            conn.execute(Festival.__table__.insert(), rows)
+    return sessionmaker(bind=engine)()
+
+
+def recommend(db) -> List[dict]:
+    return festival_service.get_festival_recommendations(
+        db,
+        CONVERSATION.travel_period,
+        CONVERSATION.companion_type,
+        CONVERSATION.energy_preference,
+        CONVERSATION.interest_focus,
+        CONVERSATION.additional_requirements
+    )
+
+
+def build_prompt(recommendations: List[dict]) -> str:
+    return build_festival_data_str(recommendations) + build_user_preferences_str(CONVERSATION)
+
+
+def damaged_response(llm_response: str) -> str:
+    """모델이 흔히 내는 형태: 코드 펜스 + 후행 쉼표 + 누락 필드 + 뒤따르는 설명문"""
+    data = json.loads(llm_response)
+    data.pop("final_message", None)
+    data["top_recommendation"].pop("why_recommended", None)
+    body = json.dumps(data, ensure_ascii=False, indent=2)
+    return f"```json\n{body[:-1].rstrip()},\n}}\n```\n위 추천은 입력한 조건을 바탕으로 했습니다."
+
+
+def stage_functions(db) -> Dict[str, Callable[[], object]]:
+    recommendations = recommend(db)
+    if not recommendations:
+        raise RuntimeError("추천 결과가 없습니다. 합성 데이터·대화 조건을 확인하세요.")
+    rule_based = build_rule_based_structured_response(CONVERSATION, recommendations)
+    fill = lambda data: fill_structured_defaults(data, rule_based)  # noqa: E731
+    llm_response = structured_recommendation_json(build_festival_data_str(recommendations))
+    damaged = damaged_response(llm_response)
+    return {
+        "recommend": lambda: recommend(db),
+        "prompt": lambda: build_prompt(recommendations),
+        "parse": lambda: parse_with_repair(llm_response, StructuredRecommendationResponse, fill=fill),
+        "parse_repair": lambda: parse_with_repair(damaged, StructuredRecommendationResponse, fill=fill),
+    }
+
+
+def measure(fn: Callable[[], object], min_rounds: int, min_time: float, max_rounds: int) -> Dict[str, float]:
+    fn()
+    times = []
+    started = time.perf_counter()
+    while len(times) < max_rounds and (len(times) < min_rounds or time.perf_counter() - started < min_time):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+
+    # 타이밍에 영향을 주지 않도록 할당 추적은 따로 한 번 실행
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "rounds": len(times),
+        "min_ms": round(min(times), 4),
+        "median_ms": round(statistics.median(times), 4),
+        "mean_ms": round(statistics.fmean(times), 4),
+        "peak_kb": round((peak - before) / 1024, 1),
+    }
+
+
+def compare(results: Dict, baseline: Dict, max_regression: float, slack_ms: float, slack_kb: float) -> List[str]:
+    """기준보다 min 시간(잡음이 가장 적음) 또는 최대 할당량이 허용치를 넘은 항목"""
+    failures = []
+    for key, base in baseline.get("results", {}).items():
+        current = results.get(key)
+        if current is None:
+            continue
+        limit_ms = base["min_ms"] * (1 + max_regression) + slack_ms
+        if current["min_ms"] > limit_ms:
+            failures.append(f"{key}: min {current['min_ms']:.3f}ms > 허용 {limit_ms:.3f}ms (기준 {base['min_ms']:.3f}ms)")
+        limit_kb = base["peak_kb"] * (1 + max_regression) + slack_kb
+        if current["peak_kb"] > limit_kb:
+            failures.append(f"{key}: peak {current['peak_kb']:.1f}KB > 허용 {limit_kb:.1f}KB (기준 {base['peak_kb']:.1f}KB)")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="/bot/finalize CPU 구간 단계별 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10000, 1000000])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--min-rounds", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=0.5, help="단계별 최소 측정 시간(초)")
+    parser.add_argument("--max-rounds", type=int, default=1000)
+    parser.add_argument("--out", default=None, help="결과 JSON 경로")
+    parser.add_argument("--baseline", default=None, help="비교할 기준 결과 JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 --baseline 경로에 저장")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="min 시간·peak 할당량 허용 증가율")
+    parser.add_argument("--slack-ms", type=float, default=0.05, help="min 시간 허용 절대 증가량(ms, 잡음 흡수)")
+    parser.add_argument("--slack-kb", type=float, default=16.0, help="peak 허용 절대 증가량(KB)")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'stage':<13} {'N':>8} | {'rounds':>6} {'min ms':>10} {'median ms':>10} {'mean ms':>10} | {'peak KB':>10}")
+    for n in args.sizes:
+        started = time.perf_counter()
+        db = make_session(n)
+        print(f"-- N={n} 합성 축제 적재 {time.perf_counter() - started:.1f}s")
+        try:
+            functions = stage_functions(db)
+            for stage in args.stages:
+                r = measure(functions[stage], args.min_rounds, args.min_time, args.max_rounds)
+                results[f"{stage}@{n}"] = r
+                print(f"{stage:<13} {n:>8} | {r['rounds']:>6} {r['min_ms']:>10.3f} {r['median_ms']:>10.3f} "
+                      f"{r['mean_ms']:>10.3f} | {r['peak_kb']:>10.1f}")
+        finally:
+            db.close()
+
+    output = {"python": sys.version.split()[0], "results": results}
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(output, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.out}")
+
+    if args.baseline:
+        if args.save_baseline:
+            os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+            with open(args.baseline, "w", encoding="utf-8") as f:
+                json.dump(output, f, ensure_ascii=False, indent=2)
+            print(f"기준 저장: {args.baseline}")
+            return
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        failures = compare(results, baseline, args.max_regression, args.slack_ms, args.slack_kb)
+        if failures:
+            print("\n❌ 성능 회귀:")
+            for failure in failures:
+                print(f"  - {failure}")
+            sys.exit(1)
+        print("\n✅ 기준 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# bench_importtime.py
+# 워커 콜드 스타트 측정: `python -X importtime -c "import namdo_bot"` 결과를 모듈별로 집계하고
+# 같은 프로세스에서 RAG 워밍업까지 했을 때의 시간·최대 메모리(RSS)를 비교
+#
+# Run from backend/actual: python -m benchmarks.bench_importtime [--runs 5] [--top 15] [--warm rag]
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+# 워커 프로세스에서 실행할 코드: import 후 (선택) 워밍업, 경과 시간과 최대 RSS(KB) 출력
+_PROBE = """
+import asyncio, resource, sys, time
+started = time.perf_counter()
+import namdo_bot
+imported = time.perf_counter()
+warm = [name for name in sys.argv[1].split(",") if name]
+if warm:
+    asyncio.run(namdo_bot.service_registry.warm_up(warm))
+finished = time.perf_counter()
+print(f"{(imported - started) * 1000:.1f} {(finished - imported) * 1000:.1f} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}")
+"""
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite:///:memory:")
+    return env
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """(모듈, self µs, cumulative µs, 중첩 깊이) 목록"""
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            rows.append((match.group(4), int(match.group(1)), int(match.group(2)), len(match.group(3))))
+    return rows
+
+
+def profile_imports(top: int) -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import namdo_bot"],
+        cwd=_ROOT, env=_env(), capture_output=True, text=True,
+    )
+    rows = parse_importtime(result.stderr)
+    root = next((r for r in rows if r[0] == "namdo_bot"), None)
+    total_self = sum(r[1] for r in rows)
+    print(f"모듈 수: {len(rows)}, self 합계: {total_self / 1000:.1f}ms"
+          + (f", namdo_bot cumulative: {root[2] / 1000:.1f}ms" if root else ""))
+
+    # 최상위 패키지별 self 시간 합계
+    by_package: Dict[str, int] = {}
+    for name, self_us, _, _ in rows:
+        package = name.split(".")[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+    print(f"\n패키지별 self 시간 상위 {top}개")
+    for package, self_us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {self_us / 1000:8.1f}ms  {package}")
+
+    heavy = {"langchain", "langchain_core", "langchain_naver", "langchain_openai", "openai", "tiktoken"}
+    loaded = sorted(heavy & set(by_package))
+    print(f"\nimport 시점에 로드된 LLM 관련 패키지: {', '.join(loaded) if loaded else '없음'}")
+
+
+def measure(runs: int, warm: str) -> None:
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", _PROBE, warm], cwd=_ROOT, env=_env(), capture_output=True, text=True,
+        )
+        last = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ""
+        if len(last.split()) != 3:
+            print(result.stderr[-2000:], file=sys.stderr)
+            raise SystemExit("측정 프로세스 실패")
+        samples.append(tuple(float(v) for v in last.split()))
+
+    imports, warmups, rss = zip(*samples)
+    label = f"warm={warm}" if warm else "import only"
+    print(f"[{label}] import p50 {statistics.median(imports):.1f}ms, "
+          f"warm-up p50 {statistics.median(warmups):.1f}ms, max RSS p50 {statistics.median(rss) / 1024:.1f}MB ({runs}회)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="namdo_bot import 시간·메모리 측정")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--warm", default="rag", help="비교용으로 워밍업할 서비스 (쉼표 구분)")
+    args = parser.parse_args()
+
+    profile_imports(args.top)
+    print()
+    measure(args.runs, "")
+    if args.warm:
+        measure(args.runs, args.warm)
+
+
+if __name__ == "__main__":
+    main()
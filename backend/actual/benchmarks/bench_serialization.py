@@ -0,0 +1,89 @@
+# bench_serialization.py
+# /festivals/search 응답 직렬화 비교
+#   before: 조건에 맞는 Festival ORM 객체 전체 → jsonable_encoder → json.dumps (response_model 없는 기존 경로)
+#   after : limit개 페이지 → FestivalSearchResponse 검증 → Pydantic JSON 직렬화 (response_model 경로)
+# 축제 데이터는 llm_relevant/data/honam_festivals_base.csv 행을 반복해 N건으로 늘려 사용
+#
+# Run from backend/actual: python -m benchmarks.bench_serialization [--sizes 100 500 2000] [--limit 50]
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from typing import Callable, List
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from core.database import Festival  # noqa: E402
+from core.pagination import encode_cursor  # noqa: E402
+from schemas.models import FestivalSearchResponse  # noqa: E402
+
+_CSV_PATH = os.path.join(_ROOT, "..", "..", "llm_relevant", "data", "honam_festivals_base.csv")
+_COLUMNS = ("contentid", "title", "region", "addr1", "start_date", "end_date", "image", "progresstype", "festivaltype", "tel")
+_FILTERS = {"region": None, "period": None, "festival_type": None, "has_pet_info": False}
+
+
+def load_festivals(n: int) -> List[Festival]:
+    with open(_CSV_PATH, encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.DictReader(f))
+    festivals = []
+    for i in range(n):
+        row = rows[i % len(rows)]
+        values = {col: row.get(col) for col in _COLUMNS}
+        values["contentid"] = f"{row['contentid']}-{i}"
+        festivals.append(Festival(id=i + 1, **values))
+    return festivals
+
+
+def serialize_before(festivals: List[Festival]) -> bytes:
+    content = jsonable_encoder({"festivals": festivals, "total_count": len(festivals), "filters": _FILTERS})
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def serialize_after(festivals: List[Festival], limit: int) -> bytes:
+    page = festivals[:limit]
+    response = {
+        "festivals": [{col: getattr(f, col) for col in _COLUMNS} for f in page],
+        "total_count": len(festivals),
+        "next_cursor": encode_cursor({"id": page[-1].id}) if len(festivals) > limit else None,
+        "filters": _FILTERS,
+    }
+    return FestivalSearchResponse.model_validate(response).model_dump_json().encode("utf-8")
+
+
+def timeit(fn: Callable[[], bytes], repeat: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="축제 목록 응답 직렬화 비교")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'N':>6} | {'before ms':>10} {'before KB':>10} | {'after(all) ms':>13} | {'after(page) ms':>14} {'page KB':>8}")
+    for n in args.sizes:
+        festivals = load_festivals(n)
+        before = serialize_before(festivals)
+        after_page = serialize_after(festivals, args.limit)
+        before_ms = timeit(lambda: serialize_before(festivals), args.repeat)
+        after_all_ms = timeit(lambda: serialize_after(festivals, n), args.repeat)
+        after_page_ms = timeit(lambda: serialize_after(festivals, args.limit), args.repeat)
+        print(f"{n:>6} | {before_ms:>10.2f} {len(before) / 1024:>10.1f} | {after_all_ms:>13.2f} | "
+              f"{after_page_ms:>14.2f} {len(after_page) / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+# fake_tour_api.py
+# 오프라인 부하 테스트용 KorService2 대역 서버
+# llm_relevant/data 의 CSV로 areaCode2 / searchFestival2 / detailCommon2 / detailIntro2 / detailPetTour2 응답을 흉내냄
+#   - searchFestival2는 numOfRows·pageNo 페이지네이션과 totalCount를 실제 API와 같은 형태로 반환
+#   - 지연(latency/jitter), 500 오류 비율, 429(요청 제한) 비율을 설정 가능
+#   - 결과가 없으면 실제 API처럼 "items": "" 반환
+#
+# Run from backend/actual: python -m benchmarks.fake_tour_api [--port 8090] [--latency-ms 50] [--error-rate 0.01] [--throttle-rate 0.05]
+# 앱 쪽은 TOUR_API_BASE_URL=http://127.0.0.1:8090/B551011/KorService2, TOUR_API_KEY=(아무 값)으로 실행
+
+import argparse
+import asyncio
+import csv
+import os
+import random
+import sys
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from dotenv import load_dotenv  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+load_dotenv()
+
+_DATA_DIR = os.path.join(_ROOT, "..", "..", "llm_relevant", "data")
+BASE_PATH = "/B551011/KorService2"
+
+# CSV에 있는 광역 지역만 제공 (TourAPI 지역 코드)
+AREA_CODES = {"광주": "5", "전북특별자치도": "37", "전라남도": "38"}
+
+_PET_COLUMNS = ("acmpyPsblCpam", "relaRntlPrdlst", "relaFrnshPrdlst", "acmpyNeedMtr", "etcAcmpyInfo",
+                "relaPurcPrdlst", "relaAcdntRiskMtr", "acmpyTypeCd", "relaPosesFclty")
+
+
+@dataclass
+class FakeTourAPIConfig:
+    latency_ms: float = float(os.getenv("FAKE_TOUR_API_LATENCY_MS", "0"))
+    jitter_ms: float = float(os.getenv("FAKE_TOUR_API_JITTER_MS", "0"))
+    error_rate: float = float(os.getenv("FAKE_TOUR_API_ERROR_RATE", "0"))
+    throttle_rate: float = float(os.getenv("FAKE_TOUR_API_THROTTLE_RATE", "0"))
+    copies: int = int(os.getenv("FAKE_TOUR_API_COPIES", "1"))  # 축제 데이터를 N배로 복제 (contentid 뒤에 _N)
+    shift_dates: bool = os.getenv("FAKE_TOUR_API_SHIFT_DATES", "true").lower() == "true"
+    seed: Optional[int] = None
+
+
+def _read_csv(name: str) -> List[Dict[str, str]]:
+    with open(os.path.join(_DATA_DIR, name), encoding="utf-8-sig", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def _shift_year(value: str, years: int) -> str:
+    if years and len(value or "") == 8 and value.isdigit():
+        return f"{int(value[:4]) + years}{value[4:]}"
+    return value
+
+
+class FakeTourDataset:
+    def __init__(self, copies: int = 1, shift_dates: bool = True):
+        base = _read_csv("honam_festivals_base.csv")
+        self.common = {row["contentid"]: row for row in _read_csv("honam_festivals_common.csv")}
+        self.intro = {row["contentid"]: row for row in _read_csv("honam_festivals_intro.csv")}
+        self.pet = {
+            row["contentid"]: {col: row.get(col, "") for col in _PET_COLUMNS}
+            for row in base if any(row.get(col) for col in _PET_COLUMNS)
+        }
+
+        # CSV 날짜가 지났으면 연 단위로 미뤄서 오늘 이후 검색(collect_all_honam_festivals)에도 걸리게 함
+        years = 0
+        if shift_dates:
+            latest = max((row["end_date"] for row in base if row.get("end_date")), default="")
+            if latest:
+                years = max(0, datetime.today().year - int(latest[:4]) + (1 if latest[4:] < datetime.today().strftime("%m%d") else 0))
+        self.year_shift = years
+
+        # 시군구 코드는 주소 두 번째 토큰(예: 고창군)을 이름순으로 번호 매김
+        sigungu_names = defaultdict(set)
+        for row in base:
+            sigungu_names[row["region"]].add(self._sigungu_name(row["addr1"]))
+        self.sigungu_codes = {
+            region: {name: str(i + 1) for i, name in enumerate(sorted(n for n in names if n))}
+            for region, names in sigungu_names.items()
+        }
+
+        self.festivals: List[Dict[str, str]] = []
+        for copy in range(1, max(copies, 1) + 1):
+            for row in base:
+                self.festivals.append(self._festival_item(row, copy, years))
+
+    @staticmethod
+    def _sigungu_name(addr1: str) -> str:
+        parts = (addr1 or "").split()
+        return parts[1] if len(parts) > 1 else ""
+
+    @staticmethod
+    def source_id(contentid: str) -> str:
+        return contentid.split("_", 1)[0]
+
+    def _festival_item(self, row: Dict[str, str], copy: int, years: int) -> Dict[str, str]:
+        common = self.common.get(row["contentid"], {})
+        area_code = AREA_CODES.get(row["region"], "")
+        return {
+            "addr1": row["addr1"],
+            "addr2": common.get("addr2", ""),
+            "areacode": area_code,
+            "sigungucode": self.sigungu_codes.get(row["region"], {}).get(self._sigungu_name(row["addr1"]), ""),
+            "cat1": "A02",
+            "cat2": "A0207",
+            "cat3": "A02070200",
+            "contentid": row["contentid"] if copy == 1 else f"{row['contentid']}_{copy}",
+            "contenttypeid": "15",
+            "createdtime": common.get("createdtime", ""),
+            "eventstartdate": _shift_year(row["start_date"], years),
+            "eventenddate": _shift_year(row["end_date"], years),
+            "firstimage": row.get("image", ""),
+            "firstimage2": common.get("firstimage2", ""),
+            "mapx": common.get("mapx", ""),
+            "mapy": common.get("mapy", ""),
+            "mlevel": common.get("mlevel", ""),
+            "modifiedtime": common.get("modifiedtime", ""),
+            "tel": row.get("tel", ""),
+            "title": row["title"],
+            "progresstype": row.get("progresstype", ""),
+            "festivaltype": row.get("festivaltype", ""),
+        }
+
+    def area_codes(self, area_code: str = "") -> List[Dict[str, str]]:
+        if not area_code:
+            return [{"rnum": i + 1, "code": code, "name": name} for i, (name, code) in enumerate(AREA_CODES.items())]
+        region = next((name for name, code in AREA_CODES.items() if code == area_code), None)
+        codes = self.sigungu_codes.get(region, {})
+        return [{"rnum": i + 1, "code": code, "name": name} for i, (name, code) in enumerate(codes.items())]
+
+    def search_festivals(self, area_code: str = "", sigungu_code: str = "",
+                         event_start_date: str = "", event_end_date: str = "") -> List[Dict[str, str]]:
+        """기간 조건: 축제 종료일 >= eventStartDate, 시작일 <= eventEndDate"""
+        return [
+            item for item in self.festivals
+            if (not area_code or item["areacode"] == area_code)
+            and (not sigungu_code or item["sigungucode"] == sigungu_code)
+            and (not event_start_date or item["eventenddate"] >= event_start_date)
+            and (not event_end_date or item["eventstartdate"] <= event_end_date)
+        ]
+
+
+def _ok(items: List[Dict], page_no: int = 1, num_of_rows: Optional[int] = None, total_count: Optional[int] = None) -> Dict:
+    return {
+        "response": {
+            "header": {"resultCode": "0000", "resultMsg": "OK"},
+            "body": {
+                "items": {"item": items} if items else "",
+                "numOfRows": num_of_rows if num_of_rows is not None else len(items),
+                "pageNo": page_no,
+                "totalCount": total_count if total_count is not None else len(items),
+            },
+        }
+    }
+
+
+def _int_param(request: Request, name: str, default: int) -> int:
+    try:
+        return max(1, int(request.query_params.get(name, default)))
+    except ValueError:
+        return default
+
+
+def create_app(config: Optional[FakeTourAPIConfig] = None, dataset: Optional[FakeTourDataset] = None) -> FastAPI:
+    config = config or FakeTourAPIConfig()
+    dataset = dataset or FakeTourDataset(copies=config.copies, shift_dates=config.shift_dates)
+    rng = random.Random(config.seed)
+    stats: Counter = Counter()
+    app = FastAPI(title="Fake KorService2", docs_url=None, redoc_url=None)
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if not request.url.path.startswith(BASE_PATH):
+            return await call_next(request)
+        operation = request.url.path.rsplit("/", 1)[-1]
+        stats[f"{operation}.requests"] += 1
+
+        delay = config.latency_ms + (rng.uniform(-config.jitter_ms, config.jitter_ms) if config.jitter_ms else 0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if config.throttle_rate and rng.random() < config.throttle_rate:
+            stats[f"{operation}.throttled"] += 1
+            return JSONResponse(
+                status_code=429,
+                content={"response": {"header": {"resultCode": "22", "resultMsg": "LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR"}}},
+                headers={"Retry-After": "1"}
+            )
+        if config.error_rate and rng.random() < config.error_rate:
+            stats[f"{operation}.errors"] += 1
+            return JSONResponse(
+                status_code=500,
+                content={"response": {"header": {"resultCode": "99", "resultMsg": "UNKNOWN_ERROR"}}}
+            )
+        return await call_next(request)
+
+    @app.get(f"{BASE_PATH}/areaCode2")
+    async def area_code2(request: Request):
+        items = dataset.area_codes(request.query_params.get("areaCode", ""))
+        return _ok(items)
+
+    @app.get(f"{BASE_PATH}/searchFestival2")
+    async def search_festival2(request: Request):
+        params = request.query_params
+        page_no = _int_param(request, "pageNo", 1)
+        num_of_rows = _int_param(request, "numOfRows", 10)
+        matched = dataset.search_festivals(
+            area_code=params.get("areaCode", ""),
+            sigungu_code=params.get("sigunguCode", ""),
+            event_start_date=params.get("eventStartDate", ""),
+            event_end_date=params.get("eventEndDate", ""),
+        )
+        start = (page_no - 1) * num_of_rows
+        return _ok(matched[start:start + num_of_rows], page_no, num_of_rows, len(matched))
+
+    @app.get(f"{BASE_PATH}/detailCommon2")
+    async def detail_common2(request: Request):
+        contentid = request.query_params.get("contentId", "")
+        row = dataset.common.get(dataset.source_id(contentid))
+        if not row:
+            return _ok([])
+        return _ok([{**row, "contentid": contentid, "contenttypeid": "15"}])
+
+    @app.get(f"{BASE_PATH}/detailIntro2")
+    async def detail_intro2(request: Request):
+        contentid = request.query_params.get("contentId", "")
+        row = dataset.intro.get(dataset.source_id(contentid))
+        if not row:
+            return _ok([])
+        return _ok([{
+            **row,
+            "contentid": contentid,
+            "contenttypeid": "15",
+            "eventstartdate": _shift_year(row.get("eventstartdate", ""), dataset.year_shift),
+            "eventenddate": _shift_year(row.get("eventenddate", ""), dataset.year_shift),
+        }])
+
+    @app.get(f"{BASE_PATH}/detailPetTour2")
+    async def detail_pet_tour2(request: Request):
+        contentid = request.query_params.get("contentId", "")
+        row = dataset.pet.get(dataset.source_id(contentid))
+        return _ok([{**row, "contentid": contentid}] if row else [])
+
+    @app.get("/_stats")
+    async def fake_stats():
+        """엔드포인트별 요청 수와 주입한 오류 수"""
+        return {"festivals": len(dataset.festivals), "year_shift": dataset.year_shift, "counters": dict(stats)}
+
+    return app
+
+
+def main() -> None:
+    defaults = FakeTourAPIConfig()
+    parser = argparse.ArgumentParser(description="오프라인 부하 테스트용 KorService2 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=defaults.jitter_ms)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="500 응답 비율 (0~1)")
+    parser.add_argument("--throttle-rate", type=float, default=defaults.throttle_rate, help="429 응답 비율 (0~1)")
+    parser.add_argument("--copies", type=int, default=defaults.copies, help="축제 데이터 복제 배수")
+    parser.add_argument("--no-shift-dates", action="store_true", help="CSV 날짜를 그대로 사용")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = FakeTourAPIConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        copies=args.copies,
+        shift_dates=not args.no_shift_dates,
+        seed=args.seed,
+    )
+    import uvicorn
+
+    print(f"Fake KorService2: http://{args.host}:{args.port}{BASE_PATH}")
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
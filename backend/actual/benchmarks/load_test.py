@@ -0,0 +1,375 @@
+# load_test.py
+# 대화 흐름 전체를 도는 가상 사용자 부하 테스트
+#   bot  시나리오: /register → /token → /bot/greeting → PUT /bot/conversation ×3 → /bot/finalize
+#   chat 시나리오: /register → /token → /initialize → /chat ×3 → /recommendations/{session_id}
+# --target을 주지 않으면 오프라인 대역(fake TourAPI 서버 + LLM_PROVIDER=fake)과 SQLite로 앱을 띄워서 측정하고,
+# 엔드포인트별 처리량과 p50/p95/p99 지연을 JSON으로 저장. --baseline을 주면 기준 대비 회귀 시 종료 코드 1
+# 가상 사용자가 모두 127.0.0.1에서 오므로 로컬 스택은 요청 제한을 끄고 띄움 (RATE_LIMIT_ENABLED=true로 덮어쓸 수 있음).
+# 429는 오류율과 따로 rate_limited로 집계
+#
+# Run from backend/actual:
+#   python -m benchmarks.load_test [--users 20] [--journeys 5] [--scenario bot|chat]
+#   python -m benchmarks.load_test --database-url mysql+pymysql://...   (로컬 MySQL)
+#   python -m benchmarks.load_test --target http://127.0.0.1:8000       (이미 떠 있는 서버)
+#   python -m benchmarks.load_test --baseline benchmarks/results/baseline.json [--save-baseline]
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import requests
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_RESULTS_DIR = os.path.join(_ROOT, "benchmarks", "results")
+
+TRAVEL_PERIODS = ["9월", "10월", "11월"]
+COMPANION_TYPES = ["혼자", "연인", "친구", "아이 동반 가족", "부모님 동반 가족"]
+
+# bot 시나리오에서 /chat 3턴에 해당하는 대화 상태 갱신
+BOT_TURNS = [
+    {"energy_preference": "활기찬"},
+    {"interest_focus": "음식"},
+    {"additional_requirements": "오래 걷기는 힘들어요"},
+]
+CHAT_TURNS = [
+    {"user_response": "활기찬 분위기가 좋아요", "selected_option": "A"},
+    {"user_response": "맛있는 음식", "selected_option": "B"},
+    {"user_response": "오래 걷기는 힘들어요", "selected_option": None},
+]
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class Recorder:
+    """엔드포인트별 지연(ms)·상태 코드 집계 (여러 스레드에서 호출)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.journeys: List[float] = []
+        self.failed_journeys = 0
+
+    def record(self, name: str, elapsed_ms: float, status: str) -> None:
+        with self._lock:
+            self.latencies[name].append(elapsed_ms)
+            self.statuses[name][status] += 1
+
+    def journey(self, elapsed_ms: Optional[float]) -> None:
+        with self._lock:
+            if elapsed_ms is None:
+                self.failed_journeys += 1
+            else:
+                self.journeys.append(elapsed_ms)
+
+    def summary(self, wall_seconds: float) -> Dict[str, Dict]:
+        endpoints = {}
+        for name, values in sorted(self.latencies.items()):
+            statuses = dict(self.statuses[name])
+            rate_limited = statuses.get("429", 0)
+            errors = sum(count for code, count in statuses.items() if not code.startswith("2")) - rate_limited
+            endpoints[name] = {
+                "count": len(values),
+                "errors": errors,
+                "rate_limited": rate_limited,
+                "error_rate": round(errors / len(values), 4),
+                "status_codes": statuses,
+                "rps": round(len(values) / wall_seconds, 2),
+                "p50_ms": round(percentile(values, 0.5), 2),
+                "p95_ms": round(percentile(values, 0.95), 2),
+                "p99_ms": round(percentile(values, 0.99), 2),
+                "max_ms": round(max(values), 2),
+            }
+        return {
+            "endpoints": endpoints,
+            "journeys": {
+                "completed": len(self.journeys),
+                "failed": self.failed_journeys,
+                "per_second": round(len(self.journeys) / wall_seconds, 2),
+                "p50_ms": round(percentile(self.journeys, 0.5), 2),
+                "p95_ms": round(percentile(self.journeys, 0.95), 2),
+                "p99_ms": round(percentile(self.journeys, 0.99), 2),
+            },
+        }
+
+
+class JourneyFailed(Exception):
+    pass
+
+
+class VirtualUser:
+    def __init__(self, base_url: str, recorder: Recorder, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.recorder = recorder
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def call(self, name: str, method: str, path: str, expect_json: bool = True, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            self.recorder.record(name, (time.perf_counter() - started) * 1000, type(e).__name__)
+            raise JourneyFailed(f"{name}: {e}") from e
+        self.recorder.record(name, (time.perf_counter() - started) * 1000, str(response.status_code))
+        if not response.ok:
+            raise JourneyFailed(f"{name}: HTTP {response.status_code} {response.text[:200]}")
+        return response.json() if expect_json else response
+
+    def login(self) -> None:
+        username = f"lt_{uuid.uuid4().hex[:12]}"
+        password = "loadtest-password"
+        self.call("POST /register", "POST", "/register",
+                  json={"username": username, "email": f"{username}@example.com", "password": password,
+                        "full_name": "부하 테스트"})
+        token = self.call("POST /token", "POST", "/token", data={"username": username, "password": password})
+        self.session.headers["Authorization"] = f"Bearer {token['access_token']}"
+
+    def run_bot(self, travel_period: str, companion_type: str) -> None:
+        greeting = self.call("POST /bot/greeting", "POST", "/bot/greeting",
+                             json={"travel_period": travel_period, "companion_type": companion_type})
+        session_id = greeting["session_id"]
+        for update in BOT_TURNS:
+            self.call("PUT /bot/conversation/{session_id}", "PUT", f"/bot/conversation/{session_id}", json=update)
+        self.call("POST /bot/finalize", "POST", "/bot/finalize", json={"session_id": session_id})
+
+    def run_chat(self, travel_period: str, companion_type: str) -> None:
+        started = self.call("POST /initialize", "POST", "/initialize",
+                            json={"travel_period": travel_period, "companion_type": companion_type})
+        session_id = started["session_id"]
+        for turn in CHAT_TURNS:
+            self.call("POST /chat", "POST", "/chat", json={"session_id": session_id, **turn})
+        self.call("GET /recommendations/{session_id}", "GET", f"/recommendations/{session_id}")
+
+
+def run_user(index: int, args: argparse.Namespace, base_url: str, recorder: Recorder) -> None:
+    user = VirtualUser(base_url, recorder, args.timeout)
+    try:
+        user.login()
+    except JourneyFailed:
+        recorder.journey(None)
+        return
+    for j in range(args.journeys):
+        travel_period = TRAVEL_PERIODS[(index + j) % len(TRAVEL_PERIODS)]
+        companion_type = COMPANION_TYPES[(index + j) % len(COMPANION_TYPES)]
+        started = time.perf_counter()
+        try:
+            if args.scenario == "chat":
+                user.run_chat(travel_period, companion_type)
+            else:
+                user.run_bot(travel_period, companion_type)
+            recorder.journey((time.perf_counter() - started) * 1000)
+        except JourneyFailed:
+            recorder.journey(None)
+
+
+# ==================== 오프라인 대역 서버 ====================
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(url: str, process: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"서버가 시작 중 종료되었습니다: {url}")
+        try:
+            if requests.get(url, timeout=1).status_code < 500:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"서버 준비 대기 시간 초과: {url}")
+
+
+class LocalStack:
+    """fake TourAPI 서버와 앱(uvicorn)을 하위 프로세스로 실행"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.processes: List[subprocess.Popen] = []
+        self.tmpdir = tempfile.mkdtemp(prefix="flova_load_")
+        self.base_url = ""
+        self.log = open(args.server_log, "a", encoding="utf-8") if args.server_log else subprocess.DEVNULL
+
+    def __enter__(self) -> "LocalStack":
+        args = self.args
+        tour_port, app_port = _free_port(), _free_port()
+        env = dict(os.environ)
+        env.update({
+            # 셸에 설정된 DATABASE_URL(운영 DB일 수 있음)을 물려받지 않도록 항상 지정
+            "DATABASE_URL": args.database_url or f"sqlite:///{os.path.join(self.tmpdir, 'load.db')}",
+            "LLM_PROVIDER": "fake",
+            "TOUR_API_BASE_URL": f"http://127.0.0.1:{tour_port}/B551011/KorService2",
+            "TOUR_API_KEY": env.get("TOUR_API_KEY") or "fake",
+            "WARMUP_SERVICES": "database,rag",
+            "RECOMMENDATION_CACHE_SIZE": env.get("RECOMMENDATION_CACHE_SIZE", "0" if args.no_cache else "512"),
+            # 모든 가상 사용자가 같은 IP라 기본 한도로는 몇 번째 여정부터 429가 됨
+            "RATE_LIMIT_ENABLED": env.get("RATE_LIMIT_ENABLED", "false"),
+        })
+
+        self.processes.append(subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.fake_tour_api", "--port", str(tour_port),
+             "--latency-ms", str(args.tour_latency_ms), "--copies", str(args.tour_copies)],
+            cwd=_ROOT, env=env, stdout=self.log, stderr=self.log
+        ))
+        _wait_ready(f"http://127.0.0.1:{tour_port}/_stats", self.processes[-1])
+
+        self.processes.append(subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "namdo_bot:app", "--host", "127.0.0.1", "--port", str(app_port),
+             "--workers", str(args.workers), "--log-level", "warning"],
+            cwd=_ROOT, env=env, stdout=self.log, stderr=self.log
+        ))
+        self.base_url = f"http://127.0.0.1:{app_port}"
+        _wait_ready(f"{self.base_url}/health/ready", self.processes[-1])
+        return self
+
+    def seed(self) -> int:
+        """축제 데이터를 fake TourAPI에서 수집 (bot 시나리오의 /bot/finalize가 DB 축제를 사용)"""
+        seeder = VirtualUser(self.base_url, Recorder(), timeout=600)
+        seeder.login()
+        return seeder.call("POST /festivals/collect", "POST", "/festivals/collect")["total_collected"]
+
+    def __exit__(self, *exc) -> None:
+        for process in reversed(self.processes):
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if self.log is not subprocess.DEVNULL:
+            self.log.close()
+
+
+# ==================== 기준 비교 ====================
+
+def compare(result: Dict, baseline: Dict, max_regression: float, slack_ms: float, max_error_rate: float) -> List[str]:
+    """회귀 항목 설명 목록 (비어 있으면 통과)"""
+    failures = []
+    for name, base in baseline.get("endpoints", {}).items():
+        current = result["endpoints"].get(name)
+        if current is None:
+            failures.append(f"{name}: 이번 실행에서 호출되지 않음")
+            continue
+        for key in ("p95_ms", "p99_ms"):
+            limit = base[key] * (1 + max_regression) + slack_ms
+            if current[key] > limit:
+                failures.append(f"{name}: {key} {current[key]:.1f}ms > 허용 {limit:.1f}ms (기준 {base[key]:.1f}ms)")
+        if current["error_rate"] > max(max_error_rate, base["error_rate"]):
+            failures.append(f"{name}: 오류율 {current['error_rate']:.2%} > 허용 {max(max_error_rate, base['error_rate']):.2%}")
+    return failures
+
+
+def print_report(result: Dict) -> None:
+    print(f"\n{'endpoint':<38} {'count':>6} {'err':>5} {'429':>5} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, s in result["endpoints"].items():
+        print(f"{name:<38} {s['count']:>6} {s['errors']:>5} {s.get('rate_limited', 0):>5} {s['rps']:>8.1f} "
+              f"{s['p50_ms']:>8.1f}ms {s['p95_ms']:>8.1f}ms {s['p99_ms']:>8.1f}ms")
+    j = result["journeys"]
+    print(f"\njourneys: {j['completed']} 완료 / {j['failed']} 실패, {j['per_second']:.2f}/s, "
+          f"p50 {j['p50_ms']:.0f}ms, p95 {j['p95_ms']:.0f}ms, p99 {j['p99_ms']:.0f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="대화 흐름 E2E 부하 테스트")
+    parser.add_argument("--scenario", choices=["bot", "chat"], default="bot")
+    parser.add_argument("--users", type=int, default=20, help="동시 가상 사용자 수")
+    parser.add_argument("--journeys", type=int, default=5, help="사용자당 대화 흐름 반복 횟수")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃(초)")
+    parser.add_argument("--target", default=None, help="이미 떠 있는 서버 주소 (없으면 로컬 대역으로 실행)")
+    parser.add_argument("--database-url", default=None, help="로컬 실행 시 DB (기본: 임시 SQLite 파일)")
+    parser.add_argument("--workers", type=int, default=1, help="로컬 실행 시 uvicorn 워커 수")
+    parser.add_argument("--tour-latency-ms", type=float, default=30.0, help="fake TourAPI 응답 지연")
+    parser.add_argument("--tour-copies", type=int, default=1, help="fake TourAPI 축제 복제 배수")
+    parser.add_argument("--no-cache", action="store_true", help="추천 응답 캐시를 끄고 측정")
+    parser.add_argument("--server-log", default=None, help="로컬 실행 시 서버 stdout/stderr를 남길 파일")
+    parser.add_argument("--no-seed", action="store_true", help="시작 전 축제 수집(/festivals/collect) 생략")
+    parser.add_argument("--out", default=None, help="결과 JSON 경로 (기본: benchmarks/results/load_<시각>.json)")
+    parser.add_argument("--baseline", default=None, help="비교할 기준 결과 JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 --baseline 경로에 저장")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="p95/p99 허용 증가율")
+    parser.add_argument("--slack-ms", type=float, default=5.0, help="p95/p99 허용 절대 증가량(ms, 잡음 흡수)")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    args = parser.parse_args()
+
+    stack = None
+    try:
+        if args.target:
+            base_url = args.target
+        else:
+            stack = LocalStack(args).__enter__()
+            base_url = stack.base_url
+            if not args.no_seed:
+                print(f"축제 데이터 수집: {stack.seed()}건")
+
+        recorder = Recorder()
+        print(f"{args.scenario} 시나리오: 사용자 {args.users}명 × {args.journeys}회 → {base_url}")
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.users) as pool:
+            for future in [pool.submit(run_user, i, args, base_url, recorder) for i in range(args.users)]:
+                future.result()
+        wall_seconds = time.perf_counter() - started
+    finally:
+        if stack is not None:
+            stack.__exit__(None, None, None)
+
+    result = {
+        "meta": {
+            "scenario": args.scenario,
+            "users": args.users,
+            "journeys_per_user": args.journeys,
+            "target": args.target or "local",
+            "database": "custom" if args.database_url else ("target" if args.target else "sqlite"),
+            "workers": args.workers,
+            "tour_latency_ms": args.tour_latency_ms,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "wall_seconds": round(wall_seconds, 2),
+        },
+        **recorder.summary(wall_seconds),
+    }
+    print_report(result)
+
+    out = args.out or os.path.join(_RESULTS_DIR, f"load_{args.scenario}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {out}")
+
+    if args.baseline:
+        if args.save_baseline:
+            with open(args.baseline, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+            print(f"기준 저장: {args.baseline}")
+            return
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        failures = compare(result, baseline, args.max_regression, args.slack_ms, args.max_error_rate)
+        if failures:
+            print("\n❌ 성능 회귀:")
+            for failure in failures:
+                print(f"  - {failure}")
+            sys.exit(1)
+        print("\n✅ 기준 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
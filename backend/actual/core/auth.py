@@ -95,6 +95,12 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+def get_current_admin_user(current_user: User = Depends(get_current_active_user)) -> User:
+    """현재 관리자 사용자 조회 (users.is_admin)"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="관리자 권한이 필요합니다.")
+    return current_user
+
 # ==================== 사용자 생성 헬퍼 ====================
 
 def create_user_helper(db: Session, username: str, email: str, password: str, full_name: str = None, profile_picture: str = None) -> User:
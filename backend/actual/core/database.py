@@ -1,10 +1,11 @@
 # database.py
 
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import create_engine, text, Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Index, Float
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.sql import func
 import os
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -13,8 +14,19 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL 환경변수가 설정되지 않았습니다.")
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# 엔진(DB 드라이버 로드 포함)은 첫 사용 시점에 생성
+_engine = None
+_engine_lock = threading.Lock()
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine(DATABASE_URL)
+                SessionLocal.configure(bind=_engine)
+    return _engine
 
 Base = declarative_base()
 
@@ -28,6 +40,7 @@ class User(Base):
     hashed_password = Column(String(255), nullable=False)
     profile_picture = Column(String(255), nullable=True)
     is_active = Column(Boolean, default=True)
+    is_admin = Column(Boolean, default=False, nullable=False, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -66,6 +79,12 @@ class Festival(Base):
     region = Column(String(100), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # 축제 검색 키셋 페이지네이션 정렬 키 (start_date, contentid)
+    __table_args__ = (
+        Index("idx_festivals_start_contentid", "start_date", "contentid"),
+        Index("idx_festivals_region_start_contentid", "region", "start_date", "contentid"),
+    )
+
 class FestivalDetail(Base):
     __tablename__ = "festival_details"
 
@@ -81,12 +100,16 @@ class FestivalDetail(Base):
     firstimage2 = Column(String(1000), nullable=True)
     addr1 = Column(String(500), nullable=True)
     addr2 = Column(String(500), nullable=True)
-    mapx = Column(String(50), nullable=True)
-    mapy = Column(String(50), nullable=True)
+    mapx = Column(Float, nullable=True)  # 경도 (WGS84)
+    mapy = Column(Float, nullable=True)  # 위도 (WGS84)
     mlevel = Column(String(50), nullable=True)
     overview = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        Index("idx_festival_details_mapy_mapx", "mapy", "mapx"),
+    )
+
 class FestivalIntro(Base):
     __tablename__ = "festival_intros"
 
@@ -108,7 +131,7 @@ class PetInfo(Base):
     __tablename__ = "pet_infos"
 
     id = Column(Integer, primary_key=True, index=True)
-    contentid = Column(String(50), ForeignKey("festivals.contentid"), nullable=False)
+    contentid = Column(String(50), ForeignKey("festivals.contentid"), index=True, nullable=False)
     acmpyPsblCpam = Column(String(200), nullable=True)
     relaRntlPrdlst = Column(String(500), nullable=True)
     acmpyNeedMtr = Column(String(500), nullable=True)
@@ -119,7 +142,16 @@ class PetInfo(Base):
     relaPosesFclty = Column(String(500), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+class DatasetVersion(Base):
+    """데이터셋(예: festivals)별 버전 카운터 — 수집 파이프라인이 올리고 ETag/Last-Modified에 사용"""
+    __tablename__ = "dataset_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
 def get_db():
+    get_engine()
     db = SessionLocal()
     try:
         yield db
@@ -127,4 +159,29 @@ def get_db():
         db.close()
 
 def create_tables():
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
+
+def check_connection():
+    """커넥션 풀에 연결 하나를 열어 DB 접속 확인 (서비스 레지스트리 워밍업용)"""
+    engine = get_engine()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    return engine
+
+def probe_connection(engine):
+    """readiness 점검: SELECT 1 왕복 후 커넥션 풀 상태 반환 (풀이 고갈되면 연결 대기 중 점검 시간 초과)"""
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    return get_pool_stats()
+
+def get_pool_stats():
+    """커넥션 풀 상태 (엔진이 아직 만들어지지 않았으면 None, 지표 수집용)"""
+    if _engine is None:
+        return None
+    pool = _engine.pool
+    stats = {}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    return stats
@@ -0,0 +1,65 @@
+# dataset_version.py
+# 데이터셋 버전 카운터 (DB의 dataset_versions 테이블)
+# 읽기 API의 ETag/Last-Modified 계산용. 매 요청 DB 조회를 피하기 위해 프로세스 내에서 짧게 캐시하며,
+# 다른 워커의 수집 결과는 최대 DATASET_VERSION_TTL초 뒤에 반영된다.
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from core.database import DatasetVersion
+
+load_dotenv()
+
+DATASET_VERSION_TTL = float(os.getenv("DATASET_VERSION_TTL", "5"))
+
+FESTIVALS = "festivals"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite는 timezone 정보 없이 돌려주므로 UTC로 간주
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class DatasetVersionTracker:
+    def __init__(self, ttl_seconds: float = 5.0):
+        self.ttl_seconds = ttl_seconds
+        self._cache: Dict[str, Tuple[float, int, datetime]] = {}
+        self._lock = threading.Lock()
+
+    def current(self, db: Session, name: str = FESTIVALS) -> Tuple[int, datetime]:
+        """(버전, 마지막 변경 시각). 아직 한 번도 수집하지 않았으면 (0, epoch)"""
+        now = time.monotonic()
+        cached = self._cache.get(name)
+        if cached and cached[0] > now:
+            return cached[1], cached[2]
+
+        row = db.get(DatasetVersion, name)
+        version, updated_at = (row.version, _as_utc(row.updated_at)) if row else (0, _EPOCH)
+        with self._lock:
+            self._cache[name] = (now + self.ttl_seconds, version, updated_at)
+        return version, updated_at
+
+    def bump(self, db: Session, name: str = FESTIVALS) -> int:
+        """버전을 1 올리고 커밋 (수집 파이프라인이 데이터 반영 후 호출)"""
+        now = datetime.now(timezone.utc)
+        updated = db.query(DatasetVersion).filter(DatasetVersion.name == name).update(
+            {DatasetVersion.version: DatasetVersion.version + 1, DatasetVersion.updated_at: now},
+            synchronize_session=False,
+        )
+        if not updated:
+            db.add(DatasetVersion(name=name, version=1, updated_at=now))
+        db.commit()
+        with self._lock:
+            self._cache.pop(name, None)
+        return self.current(db, name)[0]
+
+
+dataset_versions = DatasetVersionTracker(ttl_seconds=DATASET_VERSION_TTL)
@@ -0,0 +1,191 @@
+# fake_clovax.py
+# 네트워크 없이 LLM 경로를 실행·측정하기 위한 ClovaX 대역 (LLM_PROVIDER=fake)
+# - 채팅: 프롬프트의 축제 목록으로 StructuredRecommendationResponse 스키마에 맞는 JSON을 결정적으로 생성
+#         첫 토큰 지연 + 토큰당 지연을 흉내내며 스트리밍 지원 → 모델 지연과 우리 쪽 오버헤드를 분리해 측정
+# - 임베딩: 문자 bigram 해시 벡터 (같은 텍스트는 항상 같은 벡터, 글자가 겹칠수록 가까움)
+
+import asyncio
+import hashlib
+import math
+import os
+import re
+import time
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional
+
+from dotenv import load_dotenv
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import BaseModel
+
+from schemas.models import FestivalRecommendationItem, StructuredRecommendationResponse
+
+load_dotenv()
+
+FAKE_LLM_FIRST_TOKEN_MS = float(os.getenv("FAKE_LLM_FIRST_TOKEN_MS", "300"))
+FAKE_LLM_TOKEN_MS = float(os.getenv("FAKE_LLM_TOKEN_MS", "15"))
+FAKE_LLM_CHARS_PER_TOKEN = int(os.getenv("FAKE_LLM_CHARS_PER_TOKEN", "4"))
+FAKE_EMBEDDING_LATENCY_MS = float(os.getenv("FAKE_EMBEDDING_LATENCY_MS", "0"))
+FAKE_EMBEDDING_DIM = int(os.getenv("FAKE_EMBEDDING_DIM", "256"))
+
+# 프롬프트 속 축제 한 줄 ('제목: …, 지역: …, 기간: …~…, 위치: …' 또는 '- 축제명: …, 주소: …, 기간: …~…')
+_TITLE_RE = re.compile(r"(?:제목|축제명):\s*([^,\n]+)")
+_REGION_RE = re.compile(r"지역:\s*([^,\n]+)")
+_PERIOD_RE = re.compile(r"기간:\s*([^~,\n]*)~([^,\n]*)")
+_LOCATION_RE = re.compile(r"(?:위치|주소):\s*([^,\n]+)")
+
+
+def _stable_int(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _search(pattern: re.Pattern, line: str, default: str = "") -> str:
+    match = pattern.search(line)
+    return match.group(1).strip() if match else default
+
+
+def structured_recommendation_json(prompt: str) -> str:
+    """프롬프트에 나온 축제로 만든 StructuredRecommendationResponse JSON (같은 프롬프트면 같은 결과)"""
+    items = []
+    for line in prompt.splitlines():
+        title = _search(_TITLE_RE, line)
+        if not title:
+            continue
+        location = _search(_LOCATION_RE, line)
+        period = _PERIOD_RE.search(line)
+        score = 60 + _stable_int(title + prompt) % 40
+        items.append(FestivalRecommendationItem(
+            title=title,
+            region=_search(_REGION_RE, line, location.split(" ")[0] if location else ""),
+            start_date=period.group(1).strip() if period else "",
+            end_date=period.group(2).strip() if period else "",
+            location=location,
+            score=score,
+            reasons=["지역 조건 일치", "여행 시기와 축제 기간이 겹침"],
+            why_recommended=f"'{title}'은(는) 입력한 여행 조건과 잘 맞는 축제입니다."
+        ))
+    if not items:
+        items.append(FestivalRecommendationItem(
+            title="호남 축제", region="전라남도", start_date="", end_date="", location="",
+            score=60, reasons=["기본 추천"], why_recommended="조건에 맞는 축제 정보가 없어 기본 추천을 드립니다."
+        ))
+    items.sort(key=lambda item: (-item.score, item.title))
+    top = items[0]
+    return StructuredRecommendationResponse(
+        user_profile_summary="입력한 여행 조건을 바탕으로 한 추천",
+        top_recommendation=top,
+        alternative_recommendations=items[1:5],
+        score_breakdown={
+            "region_compatibility": top.score // 5,
+            "season_matching": top.score // 5,
+            "companion_optimization": top.score // 5,
+            "interest_matching": top.score // 5,
+            "accessibility_consideration": top.score - 4 * (top.score // 5),
+            "total_score": top.score,
+        },
+        reasoning_explanation=f"'{top.title}'의 조건 일치 점수가 {top.score}점으로 가장 높습니다.",
+        final_message="즐거운 호남 축제 여행 되세요!"
+    ).model_dump_json()
+
+
+class FakeClovaXChat(BaseChatModel):
+    """ChatClovaX 대역. response_factory(프롬프트 텍스트) → 응답 텍스트"""
+
+    model: str = "fake-clovax"
+    first_token_ms: float = FAKE_LLM_FIRST_TOKEN_MS
+    token_ms: float = FAKE_LLM_TOKEN_MS
+    chars_per_token: int = FAKE_LLM_CHARS_PER_TOKEN
+    response_factory: Callable[[str], str] = structured_recommendation_json
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-clovax"
+
+    def _respond(self, messages: List[BaseMessage]) -> str:
+        return self.response_factory("\n".join(str(message.content) for message in messages))
+
+    def _pieces(self, text: str) -> List[str]:
+        size = max(self.chars_per_token, 1)
+        return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+    def _usage(self, messages: List[BaseMessage], text: str) -> dict:
+        size = max(self.chars_per_token, 1)
+        input_tokens = math.ceil(sum(len(str(message.content)) for message in messages) / size)
+        output_tokens = math.ceil(len(text) / size)
+        return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+    def _chunks(self, messages: List[BaseMessage], text: str) -> List[tuple]:
+        """(조각, usage). ChatClovaX 스트리밍처럼 사용량은 마지막 조각에만 붙임"""
+        pieces = self._pieces(text)
+        return [(piece, self._usage(messages, text) if i == len(pieces) - 1 else None)
+                for i, piece in enumerate(pieces)]
+
+    def _result(self, messages: List[BaseMessage], text: str) -> ChatResult:
+        message = AIMessage(content=text, usage_metadata=self._usage(messages, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _total_seconds(self, text: str) -> float:
+        return (self.first_token_ms + self.token_ms * len(self._pieces(text))) / 1000
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        text = self._respond(messages)
+        time.sleep(self._total_seconds(text))
+        return self._result(messages, text)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        text = self._respond(messages)
+        await asyncio.sleep(self._total_seconds(text))
+        return self._result(messages, text)
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        text = self._respond(messages)
+        time.sleep(self.first_token_ms / 1000)
+        for piece, usage in self._chunks(messages, text):
+            time.sleep(self.token_ms / 1000)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece, usage_metadata=usage))
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        text = self._respond(messages)
+        await asyncio.sleep(self.first_token_ms / 1000)
+        for piece, usage in self._chunks(messages, text):
+            await asyncio.sleep(self.token_ms / 1000)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece, usage_metadata=usage))
+
+
+class FakeClovaXEmbeddings(BaseModel, Embeddings):
+    """ClovaXEmbeddings 대역. 문자 bigram을 차원에 해시해 L2 정규화한 결정적 벡터"""
+
+    model: str = "fake-clir-emb"
+    dimensions: int = FAKE_EMBEDDING_DIM
+    latency_ms: float = FAKE_EMBEDDING_LATENCY_MS
+
+    def _vector(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        compact = "".join(text.lower().split())
+        grams = [compact[i:i + 2] for i in range(len(compact) - 1)] or [compact]
+        for gram in grams:
+            h = _stable_int(gram)
+            vector[h % self.dimensions] += 1.0 if (h >> 32) & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency_ms * len(texts) / 1000)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency_ms / 1000)
+        return self._vector(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self.latency_ms * len(texts) / 1000)
+        return [self._vector(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        await asyncio.sleep(self.latency_ms / 1000)
+        return self._vector(text)
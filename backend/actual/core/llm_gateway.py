@@ -0,0 +1,162 @@
+# llm_gateway.py
+# ClovaX 체인 비동기 호출 게이트웨이
+# - 호출별 마감 시간(대기열 대기 + 실제 호출 포함)으로 꼬리 지연을 LLM_TIMEOUT_SECONDS 이내로 제한
+# - 전역 동시 호출 수 제한 (초과 요청은 대기열에서 기다림)과 대기열/지연 지표
+# - 대기열이 LLM_MAX_QUEUE를 넘으면 기다리게 하지 않고 즉시 거절 (LLMOverloadedError → 429 + Retry-After)
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from dotenv import load_dotenv
+
+from core.metrics import llm_call_duration, llm_calls, llm_queue_wait, llm_tokens
+from core.request_timing import record
+from core.structured_output import JSONStreamScanner
+
+load_dotenv()
+
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "8"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "16"))
+
+
+class LLMUnavailableError(Exception):
+    """LLM 응답을 마감 시간 안에 받지 못함 (호출 측은 규칙 기반 결과로 대체)"""
+
+
+class LLMOverloadedError(Exception):
+    """동시 실행 대기열이 가득 차 호출을 받지 않음 (호출 측은 429 + Retry-After로 응답)"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"추천 요청이 몰려 있습니다. {retry_after}초 후 다시 시도해 주세요.")
+        self.retry_after = retry_after
+
+
+def _percentile(values: Deque[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class LLMGateway:
+    def __init__(self, max_concurrency: int = 4, timeout_seconds: float = 8.0, max_queue: int = 16):
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight = 0
+        self._waiting = 0
+        self._queue_wait_ms: Deque[float] = deque(maxlen=1000)
+        self._call_ms: Deque[float] = deque(maxlen=1000)
+        self.stats = {"completed": 0, "timeouts": 0, "errors": 0, "shed": 0, "max_waiting": 0}
+
+    async def run(self, chain: Any, timeout: Optional[float] = None, **inputs: Any) -> str:
+        """chain.ainvoke(inputs)의 출력 문자열. 마감 초과·호출 실패 시 LLMUnavailableError"""
+        return await self._guarded(chain, lambda: self._invoke(chain, inputs), timeout)
+
+    async def stream_json(self, chain: Any, timeout: Optional[float] = None, **inputs: Any) -> str:
+        """LLMChain의 프롬프트→LLM을 스트리밍 호출하고, 최상위 JSON 객체가 닫히면 뒤따르는 토큰은 기다리지 않음"""
+        return await self._guarded(chain, lambda: self._stream(chain, inputs), timeout)
+
+    async def _guarded(self, chain: Any, call: Callable[[], Awaitable[str]], timeout: Optional[float]) -> str:
+        if chain is None:
+            raise LLMUnavailableError("RAG 체인이 초기화되지 않았습니다.")
+        if self._in_flight + self._waiting >= self.max_concurrency + self.max_queue:
+            self.stats["shed"] += 1
+            llm_calls.inc("shed")
+            raise LLMOverloadedError(self.retry_after())
+        deadline = timeout if timeout is not None else self.timeout_seconds
+        try:
+            return await asyncio.wait_for(self._limited(call), timeout=deadline)
+        except asyncio.TimeoutError as e:
+            self.stats["timeouts"] += 1
+            llm_calls.inc("timeout")
+            raise LLMUnavailableError(f"LLM 응답이 {deadline:.1f}초 안에 오지 않았습니다.") from e
+        except Exception as e:
+            self.stats["errors"] += 1
+            llm_calls.inc("error")
+            raise LLMUnavailableError(f"LLM 호출 실패: {e}") from e
+
+    async def _limited(self, call: Callable[[], Awaitable[str]]) -> str:
+        queued_at = time.perf_counter()
+        self._waiting += 1
+        self.stats["max_waiting"] = max(self.stats["max_waiting"], self._waiting)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        try:
+            started = time.perf_counter()
+            queue_wait_ms = (started - queued_at) * 1000
+            self._queue_wait_ms.append(queue_wait_ms)
+            record("llm_queue", queue_wait_ms)
+            llm_queue_wait.observe(value=queue_wait_ms / 1000)
+            try:
+                result = await call()
+            finally:
+                call_seconds = time.perf_counter() - started
+                record("llm", call_seconds * 1000)
+                llm_call_duration.observe(value=call_seconds)
+            self._call_ms.append(call_seconds * 1000)
+            self.stats["completed"] += 1
+            llm_calls.inc("completed")
+            return result
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    def retry_after(self) -> int:
+        """대기열이 한 번 빠질 때까지의 예상 시간(초): 호출 지연 중앙값 × (대기 수 + 1) / 동시 실행 수"""
+        call_seconds = _percentile(self._call_ms, 0.5) / 1000 or self.timeout_seconds
+        return min(60, max(1, math.ceil(call_seconds * (self._waiting + 1) / self.max_concurrency)))
+
+    @staticmethod
+    async def _invoke(chain: Any, inputs: Dict[str, Any]) -> str:
+        result = await chain.ainvoke(inputs)
+        return result[chain.output_keys[0]]
+
+    @staticmethod
+    async def _stream(chain: Any, inputs: Dict[str, Any]) -> str:
+        scanner = JSONStreamScanner()
+        parts = []
+        usage = None
+        stream = (chain.prompt | chain.llm).astream(inputs)
+        try:
+            async for chunk in stream:
+                text = getattr(chunk, "content", chunk)
+                parts.append(text)
+                usage = getattr(chunk, "usage_metadata", None) or usage
+                if scanner.feed(text):
+                    break
+        finally:
+            await stream.aclose()
+            if usage:
+                llm_tokens.inc("input", amount=usage.get("input_tokens", 0))
+                llm_tokens.inc("output", amount=usage.get("output_tokens", 0))
+            else:
+                llm_tokens.inc("output", amount=sum(1 for part in parts if part))
+        return "".join(parts)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "timeout_seconds": self.timeout_seconds,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            **self.stats,
+            "queue_wait_ms_p50": _percentile(self._queue_wait_ms, 0.5),
+            "queue_wait_ms_p95": _percentile(self._queue_wait_ms, 0.95),
+            "call_ms_p50": _percentile(self._call_ms, 0.5),
+            "call_ms_p95": _percentile(self._call_ms, 0.95),
+        }
+
+
+llm_gateway = LLMGateway(max_concurrency=LLM_MAX_CONCURRENCY, timeout_seconds=LLM_TIMEOUT_SECONDS, max_queue=LLM_MAX_QUEUE)
@@ -0,0 +1,52 @@
+# llm_provider.py
+# LLM·임베딩 구현 선택 (LLM_PROVIDER=clovax | fake)
+# 구현 모듈(langchain_naver, fake_clovax)은 생성 시점에 처음 import
+# backend(namdo_bot)와 llm_relevant/rag/langchain_RAG.py가 모두 이 함수로 모델을 만듦
+
+import os
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "clovax").strip().lower()
+
+PROVIDERS = ("clovax", "fake")
+
+
+def _check_provider() -> None:
+    if LLM_PROVIDER not in PROVIDERS:
+        raise ValueError(f"지원하지 않는 LLM_PROVIDER: {LLM_PROVIDER} ({', '.join(PROVIDERS)} 중 하나)")
+
+
+def _clova_api_key() -> str:
+    api_key = os.getenv("CLOVASTUDIO_API_KEY")
+    if not api_key:
+        raise RuntimeError("CLOVASTUDIO_API_KEY 환경변수가 설정되지 않았습니다.")
+    return api_key
+
+
+def create_chat_model(model: str, temperature: float = 0.1, callbacks: Optional[list] = None,
+                      fake_response: Optional[Callable[[str], str]] = None, **kwargs):
+    """ChatClovaX 또는 FakeClovaXChat. fake_response(프롬프트 텍스트) → 응답 텍스트는 대역에서만 사용
+    (기본은 추천 JSON)"""
+    _check_provider()
+    if LLM_PROVIDER == "fake":
+        from core.fake_clovax import FakeClovaXChat
+        fake_options = {"response_factory": fake_response} if fake_response else {}
+        return FakeClovaXChat(model=f"fake-{model}", callbacks=callbacks, **fake_options)
+
+    from langchain_naver import ChatClovaX
+    return ChatClovaX(model=model, api_key=_clova_api_key(), temperature=temperature, callbacks=callbacks, **kwargs)
+
+
+def create_embeddings(model: str = "clir-emb-dolphin", **kwargs):
+    """ClovaXEmbeddings 또는 FakeClovaXEmbeddings"""
+    _check_provider()
+    if LLM_PROVIDER == "fake":
+        from core.fake_clovax import FakeClovaXEmbeddings
+        return FakeClovaXEmbeddings(model=f"fake-{model}")
+
+    from langchain_naver import ClovaXEmbeddings
+    return ClovaXEmbeddings(model=model, api_key=_clova_api_key(), **kwargs)
@@ -0,0 +1,318 @@
+# metrics.py
+# Prometheus 텍스트 형식 지표 (/metrics)
+# - 카운터·히스토그램은 프로세스 내에서 누적하고, 풀·캐시·LLM 대기열 같은 현재 값은 수집 시점에 콜백으로 읽음
+# - uvicorn 워커가 여러 개면 METRICS_DIR에 워커별 스냅샷(JSON)을 METRICS_FLUSH_SECONDS마다 기록하고,
+#   /metrics를 받은 워커가 최근 METRICS_STALE_SECONDS 안의 스냅샷을 모두 합쳐 응답
+#   (카운터·히스토그램은 합산, 게이지는 worker 레이블로 구분)
+# - 미설정 시 요청을 받은 워커 자신의 값만 보임
+
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import requests
+from dotenv import load_dotenv
+
+load_dotenv()
+
+METRICS_DIR = os.getenv("METRICS_DIR")  # 미설정 시 워커별 지표만 노출
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+METRICS_STALE_SECONDS = float(os.getenv("METRICS_STALE_SECONDS", "300"))
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Sequence[object]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name}: 레이블 {self.labelnames}에 맞지 않는 값 {labels}")
+        return tuple(str(v) for v in labels)
+
+    def describe(self) -> Dict[str, object]:
+        return {"type": self.kind, "help": self.help, "labelnames": list(self.labelnames)}
+
+    def samples(self) -> List[list]:
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: object, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, *labels: object, value: float) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def inc(self, *labels: object, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, *labels: object, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, *labels: object, value: float) -> None:
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def describe(self) -> Dict[str, object]:
+        return {**super().describe(), "buckets": list(self.buckets)}
+
+    def samples(self) -> List[list]:
+        with self._lock:
+            return [[list(key), [list(counts), total, count]] for key, (counts, total, count) in self._values.items()]
+
+
+# 수집 콜백: () → [(이름, 종류, 설명, 레이블 이름, [(레이블 값, 값), ...]), ...]
+Collector = Callable[[], Iterable[Tuple[str, str, str, Sequence[str], Iterable[Tuple[Sequence[object], float]]]]]
+
+
+class MetricsRegistry:
+    def __init__(self, directory: Optional[str] = None, flush_seconds: float = 5.0, stale_seconds: float = 300.0):
+        self.directory = directory
+        self.flush_seconds = flush_seconds
+        self.stale_seconds = stale_seconds
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Collector] = []
+        self._flusher: Optional[threading.Thread] = None
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def _register(self, metric: _Metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    # ==================== 스냅샷·워커 간 합산 ====================
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """이 워커의 지표 (JSON 직렬화 가능)"""
+        result = {name: {**metric.describe(), "samples": metric.samples()} for name, metric in self._metrics.items()}
+        for collector in self._collectors:
+            try:
+                collected = list(collector())
+            except Exception:
+                continue  # 수집 실패한 지표는 이번 응답에서만 빠짐
+            for name, kind, help_text, labelnames, samples in collected:
+                result[name] = {
+                    "type": kind, "help": help_text, "labelnames": list(labelnames),
+                    "samples": [[[str(v) for v in labels], float(value)] for labels, value in samples],
+                }
+        return result
+
+    def _snapshot_path(self) -> str:
+        return os.path.join(self.directory, f"worker-{os.getpid()}.json")
+
+    def flush(self) -> None:
+        """이 워커의 스냅샷을 METRICS_DIR에 기록 (원자적 교체)"""
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._snapshot_path()
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"pid": os.getpid(), "metrics": self.snapshot()}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def start_flusher(self) -> None:
+        """METRICS_DIR이 설정된 경우 주기적으로 스냅샷을 기록하는 데몬 스레드 시작"""
+        if not self.directory or self._flusher is not None:
+            return
+
+        def loop() -> None:
+            while True:
+                try:
+                    self.flush()
+                except OSError:
+                    pass
+                time.sleep(self.flush_seconds)
+
+        self._flusher = threading.Thread(target=loop, name="metrics-flusher", daemon=True)
+        self._flusher.start()
+
+    def _worker_snapshots(self) -> List[Tuple[str, Dict[str, Dict[str, object]]]]:
+        if not self.directory:
+            return [("", self.snapshot())]
+        try:
+            self.flush()
+        except OSError:
+            return [(str(os.getpid()), self.snapshot())]
+        snapshots = []
+        now = time.time()
+        for filename in os.listdir(self.directory):
+            if not (filename.startswith("worker-") and filename.endswith(".json")):
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                if now - os.path.getmtime(path) > self.stale_seconds:
+                    continue  # 종료된 워커
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            snapshots.append((str(data.get("pid", filename)), data.get("metrics", {})))
+        return snapshots
+
+    @staticmethod
+    def _merge(snapshots: List[Tuple[str, Dict[str, Dict[str, object]]]]) -> Dict[str, Dict[str, object]]:
+        merged: Dict[str, Dict[str, object]] = {}
+        for worker, metrics in snapshots:
+            for name, metric in metrics.items():
+                target = merged.setdefault(name, {**metric, "samples": {}})
+                if metric["type"] == "gauge" and worker:
+                    target["labelnames"] = list(metric["labelnames"]) + ["worker"]
+                for labels, value in metric["samples"]:
+                    if metric["type"] == "gauge":
+                        key = tuple(labels) + ((worker,) if worker else ())
+                        target["samples"][key] = value
+                    elif metric["type"] == "histogram":
+                        current = target["samples"].get(tuple(labels))
+                        if current is None:
+                            target["samples"][tuple(labels)] = [list(value[0]), value[1], value[2]]
+                        else:
+                            current[0] = [a + b for a, b in zip(current[0], value[0])]
+                            current[1] += value[1]
+                            current[2] += value[2]
+                    else:
+                        target["samples"][tuple(labels)] = target["samples"].get(tuple(labels), 0.0) + value
+        return merged
+
+    def render(self, extra: Iterable[Tuple[str, str, str, Sequence[str], Iterable[Tuple[Sequence[object], float]]]] = ()) -> str:
+        """Prometheus 텍스트 형식. extra는 워커와 무관한 전역 값(DB 집계 등)으로 합산하지 않음"""
+        merged = self._merge(self._worker_snapshots())
+        for name, kind, help_text, labelnames, samples in extra:
+            merged[name] = {
+                "type": kind, "help": help_text, "labelnames": list(labelnames),
+                "samples": {tuple(str(v) for v in labels): float(value) for labels, value in samples},
+            }
+
+        lines = []
+        for name in sorted(merged):
+            metric = merged[name]
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            labelnames = metric["labelnames"]
+            for labels, value in sorted(metric["samples"].items()):
+                if metric["type"] == "histogram":
+                    counts, total, count = value
+                    cumulative = 0
+                    for bound, bucket_count in zip(list(metric["buckets"]) + ["+Inf"], counts):
+                        cumulative += bucket_count
+                        le = bound if bound == "+Inf" else _format_value(bound)
+                        lines.append(f"{name}_bucket{_labels(list(labelnames) + ['le'], list(labels) + [le])} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(labelnames, labels)} {_format_value(total)}")
+                    lines.append(f"{name}_count{_labels(labelnames, labels)} {count}")
+                else:
+                    lines.append(f"{name}{_labels(labelnames, labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+metrics = MetricsRegistry(directory=METRICS_DIR, flush_seconds=METRICS_FLUSH_SECONDS, stale_seconds=METRICS_STALE_SECONDS)
+
+# ==================== 지표 정의 ====================
+
+http_requests = metrics.counter("namdo_http_requests_total", "HTTP 요청 수", ("method", "route", "status"))
+http_request_duration = metrics.histogram("namdo_http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route"))
+http_requests_in_progress = metrics.gauge("namdo_http_requests_in_progress", "처리 중인 HTTP 요청 수")
+stage_duration = metrics.histogram("namdo_request_stage_duration_seconds", "요청 하나에서 구간별로 쓴 시간 (Server-Timing 구간)", ("stage",))
+
+upstream_requests = metrics.counter("namdo_upstream_requests_total", "외부 API 호출 수 (status는 HTTP 코드 또는 예외 이름)", ("upstream", "operation", "status"))
+upstream_duration = metrics.histogram("namdo_upstream_request_duration_seconds", "외부 API 호출 시간", ("upstream", "operation"))
+
+llm_calls = metrics.counter("namdo_llm_calls_total", "ClovaX 호출 수", ("outcome",))
+llm_call_duration = metrics.histogram("namdo_llm_call_duration_seconds", "ClovaX 호출 시간 (대기열 대기 제외)")
+llm_queue_wait = metrics.histogram("namdo_llm_queue_wait_seconds", "ClovaX 동시 실행 제한 대기 시간")
+llm_tokens = metrics.counter("namdo_llm_tokens_total", "ClovaX 토큰 수 (usage 미제공 시 output은 스트리밍 조각 수로 추정)", ("type",))
+
+rate_limited = metrics.counter("namdo_rate_limited_total", "429로 거절한 요청 수 (reason: ip / user / llm_overload)", ("reason",))
+
+
+def observe_request(method: str, route: str, status_code: int, total_ms: float, stages: Dict[str, Dict[str, float]]) -> None:
+    http_requests.inc(method, route, status_code)
+    http_request_duration.observe(method, route, value=total_ms / 1000)
+    for stage, entry in stages.items():
+        stage_duration.observe(stage, value=entry["ms"] / 1000)
+
+
+class MeteredSession(requests.Session):
+    """호출마다 (operation=URL 마지막 경로, 상태 코드 또는 예외 이름, 소요 시간)을 기록하는 requests 세션"""
+
+    def __init__(self, upstream: str):
+        super().__init__()
+        self.upstream = upstream
+
+    def request(self, method, url, *args, **kwargs):
+        operation = urlparse(str(url)).path.rstrip("/").rsplit("/", 1)[-1] or "/"
+        started = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except requests.RequestException as e:
+            upstream_requests.inc(self.upstream, operation, type(e).__name__)
+            raise
+        finally:
+            upstream_duration.observe(self.upstream, operation, value=time.perf_counter() - started)
+        upstream_requests.inc(self.upstream, operation, response.status_code)
+        return response
@@ -0,0 +1,24 @@
+# pagination.py
+# 커서 기반 페이지네이션용 불투명(opaque) 커서 인코딩
+
+import base64
+import json
+from typing import Any, Dict
+
+
+def encode_cursor(position: Dict[str, Any]) -> str:
+    """{'id': 123} → URL에 그대로 쓸 수 있는 문자열"""
+    raw = json.dumps(position, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """encode_cursor의 역변환. 형식이 잘못되면 ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("잘못된 커서입니다.") from e
+    if not isinstance(position, dict):
+        raise ValueError("잘못된 커서입니다.")
+    return position
@@ -0,0 +1,132 @@
+# profiling.py
+# 운영 워커 온디맨드 프로파일링 (관리자 전용 /admin/profile/* 에서 사용)
+# - CPU: 별도 스레드가 interval마다 sys._current_frames()로 모든 스레드의 스택을 샘플링해
+#   collapsed stack 형식("스레드;모듈:함수;... 횟수")으로 반환 → flamegraph.pl, speedscope에서 바로 열림
+#   (cProfile과 달리 이벤트 루프·threadpool 스레드를 함께 보고, 대상 코드에 훅을 걸지 않음)
+# - 메모리: 구간 시작·끝에 tracemalloc 스냅샷을 떠서 증가량 상위 항목을 비교
+# - 요청이 없을 때는 샘플링 스레드도 할당 추적도 없으므로 유휴 오버헤드 없음. 워커당 한 번에 한 건만 실행
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+
+# 스택 맨 위가 이 함수들이면 대기 중인 스레드로 보고 기본적으로 제외 (이벤트 루프 select, threadpool 대기 등)
+IDLE_FRAMES = {
+    "selectors:select",
+    "threading:wait",
+    "queue:get",
+    "concurrent.futures.thread:_worker",
+    "socket:accept",
+}
+
+
+class ProfilerBusyError(RuntimeError):
+    """이 워커에서 이미 프로파일링이 진행 중"""
+
+
+_lock = threading.Lock()
+
+
+def _frame_label(frame, include_lines: bool) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    label = f"{module}:{frame.f_code.co_name}"
+    return f"{label}:{frame.f_lineno}" if include_lines else label
+
+
+def _stack(frame, include_lines: bool) -> List[str]:
+    """바깥 호출부터 안쪽 순서의 프레임 이름"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame, include_lines))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def sample_cpu(seconds: float, interval_ms: float = 10.0, include_idle: bool = False,
+               include_lines: bool = False) -> Tuple[str, Dict]:
+    """seconds 동안 모든 스레드 스택을 샘플링해 (collapsed stack 텍스트, 요약)을 반환"""
+    if not _lock.acquire(blocking=False):
+        raise ProfilerBusyError("이미 프로파일링이 진행 중입니다.")
+    try:
+        own = threading.get_ident()
+        interval = max(interval_ms, 1.0) / 1000
+        stacks: Counter = Counter()
+        rounds = idle = 0
+        started = time.perf_counter()
+        deadline = started + min(seconds, PROFILE_MAX_SECONDS)
+        while time.perf_counter() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if not include_idle and _frame_label(frame, False) in IDLE_FRAMES:
+                    idle += 1
+                    continue
+                stacks[";".join([names.get(ident, f"thread-{ident}")] + _stack(frame, include_lines))] += 1
+            rounds += 1
+            time.sleep(interval)
+        elapsed = time.perf_counter() - started
+    finally:
+        _lock.release()
+
+    text = "\n".join(f"{stack} {count}" for stack, count in stacks.most_common()) + "\n"
+    return text, {
+        "pid": os.getpid(),
+        "seconds": round(elapsed, 2),
+        "rounds": rounds,
+        "samples": sum(stacks.values()),
+        "idle_samples": idle,
+    }
+
+
+def memory_diff(seconds: float, top: int = 30, group_by: str = "lineno", nframes: int = 1) -> Tuple[str, Dict]:
+    """seconds 동안의 할당 증가량 상위 top개 (tracemalloc 스냅샷 비교)"""
+    if not _lock.acquire(blocking=False):
+        raise ProfilerBusyError("이미 프로파일링이 진행 중입니다.")
+    try:
+        # 이미 켜져 있으면(PYTHONTRACEMALLOC 등) 그대로 쓰고 끄지 않음
+        started_here = not tracemalloc.is_tracing()
+        if started_here:
+            tracemalloc.start(nframes if group_by == "traceback" else 1)
+        try:
+            exclude = [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            ]
+            before = tracemalloc.take_snapshot().filter_traces(exclude)
+            time.sleep(min(seconds, PROFILE_MAX_SECONDS))
+            after = tracemalloc.take_snapshot().filter_traces(exclude)
+            traced, peak = tracemalloc.get_traced_memory()
+        finally:
+            if started_here:
+                tracemalloc.stop()
+    finally:
+        _lock.release()
+
+    diff = after.compare_to(before, group_by)
+    lines = []
+    for stat in diff[:top]:
+        lines.append(str(stat))
+        if group_by == "traceback":
+            lines.extend(f"    {line}" for line in stat.traceback.format())
+    growth = sum(stat.size_diff for stat in diff)
+    return "\n".join(lines) + "\n", {
+        "pid": os.getpid(),
+        "seconds": min(seconds, PROFILE_MAX_SECONDS),
+        "size_diff_kb": round(growth / 1024, 1),
+        "traced_kb": round(traced / 1024, 1),
+        "peak_kb": round(peak / 1024, 1),
+        "started_tracing": started_here,
+    }
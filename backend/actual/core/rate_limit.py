@@ -0,0 +1,187 @@
+# rate_limit.py
+# LLM을 호출하는 엔드포인트(/recommendations/{session_id}, /bot/finalize)의 토큰 버킷 요청 제한
+# - 사용자 id별, 클라이언트 IP별 버킷을 따로 둠 (둘 중 하나라도 비면 429 + Retry-After)
+#   사용자 버킷을 먼저 보므로, 한 사용자가 계속 거절돼도 같은 IP(NAT 뒤 다른 사용자)의 토큰은 줄지 않고,
+#   IP 버킷에서 거절되면 이미 쓴 사용자 토큰은 되돌려 실행되지 않은 요청이 사용자 한도를 깎지 않음
+# - 기본은 프로세스 내 상태. RATE_LIMIT_DB를 지정하면 여러 워커가 SQLite 파일 하나의 버킷을 공유
+#   (공유 저장소 오류 시 프로세스 내 버킷으로 대체해 요청 처리는 막지 않음)
+# - 프록시 뒤에서는 uvicorn --proxy-headers --forwarded-allow-ips 로 실제 클라이언트 IP가 request.client에 들어오게 설정
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+from fastapi import Depends, HTTPException, Request, status
+
+from core.auth import get_current_active_user
+from core.database import User
+from core.metrics import rate_limited
+
+load_dotenv()
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_USER_PER_MINUTE = float(os.getenv("RATE_LIMIT_USER_PER_MINUTE", "6"))
+RATE_LIMIT_USER_BURST = float(os.getenv("RATE_LIMIT_USER_BURST", "3"))
+RATE_LIMIT_IP_PER_MINUTE = float(os.getenv("RATE_LIMIT_IP_PER_MINUTE", "30"))
+RATE_LIMIT_IP_BURST = float(os.getenv("RATE_LIMIT_IP_BURST", "10"))
+RATE_LIMIT_DB = os.getenv("RATE_LIMIT_DB")  # 미설정 시 프로세스 내 버킷만 사용
+
+
+class TokenBucketLimiter:
+    """분당 rate_per_minute개씩 채워지고 최대 burst개까지 쌓이는 키별 토큰 버킷"""
+
+    def __init__(self, name: str, rate_per_minute: float, burst: float,
+                 sqlite_path: Optional[str] = None, max_keys: int = 10000):
+        self.name = name
+        self.rate = rate_per_minute / 60
+        self.burst = max(burst, 1.0)
+        self.sqlite_path = sqlite_path
+        self.max_keys = max_keys
+        # 오래 쓰지 않은 키부터 버림 (버려진 키는 가득 찬 버킷과 같음)
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()  # key → (토큰, 갱신 시각)
+        self._lock = threading.Lock()
+        self._shared_calls = 0
+        self.stats = {"allowed": 0, "limited": 0, "refunded": 0, "shared_errors": 0}
+
+        if sqlite_path:
+            conn = self._connect()
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+                    " bucket_key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+                )
+            finally:
+                conn.close()
+
+    def acquire(self, key: str) -> float:
+        """토큰 하나를 쓰면 0, 부족하면 다음 토큰까지 남은 초"""
+        if self.rate <= 0:
+            return 0.0
+        now = time.time()
+        retry_after = None
+        if self.sqlite_path:
+            retry_after = self._acquire_shared(key, now)
+        if retry_after is None:
+            retry_after = self._acquire_local(key, now)
+        self.stats["limited" if retry_after > 0 else "allowed"] += 1
+        return retry_after
+
+    def refund(self, key: str) -> None:
+        """acquire로 쓴 토큰 하나를 되돌림 (뒤이은 다른 제한에서 요청이 거절된 경우)"""
+        if self.rate <= 0:
+            return
+        if not (self.sqlite_path and self._refund_shared(key)):
+            self._refund_local(key)
+        self.stats["refunded"] += 1
+
+    # ==================== 내부 구현 ====================
+
+    def _take(self, tokens: float, updated_at: float, now: float) -> Tuple[float, float]:
+        """(남은 토큰, 재시도까지 초)"""
+        tokens = min(self.burst, tokens + max(0.0, now - updated_at) * self.rate)
+        if tokens >= 1:
+            return tokens - 1, 0.0
+        return tokens, (1 - tokens) / self.rate
+
+    def _acquire_local(self, key: str, now: float) -> float:
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (self.burst, now))
+            tokens, retry_after = self._take(tokens, updated_at, now)
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+    def _refund_local(self, key: str) -> None:
+        with self._lock:
+            if key in self._buckets:
+                tokens, updated_at = self._buckets[key]
+                self._buckets[key] = (min(self.burst, tokens + 1), updated_at)
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: BEGIN IMMEDIATE로 읽기-갱신을 워커 간 원자적으로 처리
+        return sqlite3.connect(self.sqlite_path, timeout=2, isolation_level=None)
+
+    def _acquire_shared(self, key: str, now: float) -> Optional[float]:
+        bucket_key = f"{self.name}:{key}"
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT tokens, updated_at FROM rate_limit_buckets WHERE bucket_key = ?", (bucket_key,)
+                ).fetchone()
+                tokens, retry_after = self._take(*(row or (self.burst, now)), now)
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_limit_buckets (bucket_key, tokens, updated_at) VALUES (?, ?, ?)",
+                    (bucket_key, tokens, now),
+                )
+                self._shared_calls += 1
+                if self._shared_calls % 1000 == 0:
+                    # 다시 가득 찼을 시간이 지난 버킷은 지워도 결과가 같음
+                    conn.execute(
+                        "DELETE FROM rate_limit_buckets WHERE bucket_key LIKE ? AND updated_at < ?",
+                        (f"{self.name}:%", now - self.burst / self.rate),
+                    )
+                conn.execute("COMMIT")
+                return retry_after
+            finally:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                conn.close()
+        except sqlite3.Error:
+            self.stats["shared_errors"] += 1
+            return None
+
+    def _refund_shared(self, key: str) -> bool:
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "UPDATE rate_limit_buckets SET tokens = MIN(?, tokens + 1) WHERE bucket_key = ?",
+                    (self.burst, f"{self.name}:{key}"),
+                )
+                return True
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            self.stats["shared_errors"] += 1
+            return False
+
+
+user_rate_limiter = TokenBucketLimiter("user", RATE_LIMIT_USER_PER_MINUTE, RATE_LIMIT_USER_BURST, RATE_LIMIT_DB)
+ip_rate_limiter = TokenBucketLimiter("ip", RATE_LIMIT_IP_PER_MINUTE, RATE_LIMIT_IP_BURST, RATE_LIMIT_DB)
+
+
+def _reject(reason: str, retry_after: float) -> None:
+    rate_limited.inc(reason)
+    seconds = math.ceil(retry_after)
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=f"요청이 너무 잦습니다. {seconds}초 후 다시 시도해 주세요.",
+        headers={"Retry-After": str(seconds)},
+    )
+
+
+def enforce_llm_rate_limit(request: Request, current_user: User = Depends(get_current_active_user)) -> User:
+    """LLM 엔드포인트 의존성: 사용자 → IP 순으로 토큰을 쓰고, 부족하면 429 + Retry-After
+    (IP에서 거절되면 사용자 토큰은 되돌림)"""
+    if not RATE_LIMIT_ENABLED:
+        return current_user
+    client_ip = request.client.host if request.client else "unknown"
+    user_key = str(current_user.id)
+    retry_after = user_rate_limiter.acquire(user_key)
+    if retry_after > 0:
+        _reject(user_rate_limiter.name, retry_after)
+    retry_after = ip_rate_limiter.acquire(client_ip)
+    if retry_after > 0:
+        user_rate_limiter.refund(user_key)
+        _reject(ip_rate_limiter.name, retry_after)
+    return current_user
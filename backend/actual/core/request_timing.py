@@ -0,0 +1,124 @@
+# request_timing.py
+# 요청 단위 구간 시간 측정 (DB, 규칙 점수, TourAPI, LLM, 파싱)
+# - timed("db") 를 with 문 또는 데코레이터(동기·비동기 함수)로 사용하면 현재 요청의 구간 합계에 누적
+# - 미들웨어가 요청마다 RequestTimings를 ContextVar에 넣고, 응답에 Server-Timing 헤더를 붙임
+#   (threadpool에서 실행되는 동기 엔드포인트·asyncio 태스크에도 같은 객체가 전달됨)
+# - 같은 구간이 중첩되면(CRUD 함수가 다른 CRUD 함수 호출) 바깥 구간만 기록해 이중 집계하지 않음
+# - 요청 밖(배치 수집, 벤치마크)에서 호출하면 아무것도 기록하지 않음
+
+import functools
+import inspect
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+
+
+class RequestTimings:
+    """한 요청의 구간별 누적 시간(ms)과 호출 횟수"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, elapsed_ms: float) -> None:
+        with self._lock:
+            entry = self.stages.setdefault(stage, {"ms": 0.0, "count": 0})
+            entry["ms"] += elapsed_ms
+            entry["count"] += 1
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self, total_ms: Optional[float] = None) -> str:
+        """Server-Timing 헤더 값 (예: db;dur=3.1, llm;dur=812.4, total;dur=830.2)"""
+        parts = [f"{stage};dur={entry['ms']:.1f}" for stage, entry in self.stages.items()]
+        parts.append(f"total;dur={self.total_ms if total_ms is None else total_ms:.1f}")
+        return ", ".join(parts)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {stage: {"ms": round(entry["ms"], 1), "count": entry["count"]} for stage, entry in self.stages.items()}
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+_active_stages: ContextVar[frozenset] = ContextVar("request_timing_active_stages", default=frozenset())
+
+
+def start_request() -> RequestTimings:
+    timings = RequestTimings()
+    _current.set(timings)
+    return timings
+
+
+def current() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def record(stage: str, elapsed_ms: float) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.add(stage, elapsed_ms)
+
+
+def _enter(stage: str):
+    """측정을 시작하면 (시작 시각, 토큰), 요청 밖이거나 같은 구간 안이면 None"""
+    timings = _current.get()
+    active = _active_stages.get()
+    if timings is None or stage in active:
+        return None
+    return time.perf_counter(), _active_stages.set(active | {stage})
+
+
+def _exit(stage: str, entered) -> None:
+    if entered is None:
+        return
+    started, token = entered
+    _active_stages.reset(token)
+    record(stage, (time.perf_counter() - started) * 1000)
+
+
+class timed:
+    """with timed("db"): ... 또는 @timed("tour_api")"""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._entered = None
+
+    def __enter__(self) -> "timed":
+        self._entered = _enter(self.stage)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _exit(self.stage, self._entered)
+
+    def __call__(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        stage = self.stage
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                entered = _enter(stage)
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    _exit(stage, entered)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            entered = _enter(stage)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _exit(stage, entered)
+        return wrapper
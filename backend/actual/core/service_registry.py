@@ -0,0 +1,175 @@
+# service_registry.py
+# 무거운 의존성(LangChain·ClovaX 체인, DB 엔진 등)을 import 시점이 아니라
+# startup 워밍업 또는 첫 사용 시점에 초기화하고, 서브시스템별 준비 상태를 제공하는 레지스트리
+# probe를 등록하면 readiness 확인 시 실제로 의존성을 점검 (결과는 READINESS_CACHE_SECONDS 동안 재사용,
+# 동시에 들어온 확인 요청은 진행 중인 점검 하나를 함께 기다림)
+# 필수 서비스가 아직 초기화되지 않았거나 실패 후 재시도 대기 시간이 지났으면 점검 시 초기화를 다시 시도
+# (startup 때 DB가 내려가 있었어도 복구되면 ready로 돌아옴)
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+READINESS_CACHE_SECONDS = float(os.getenv("READINESS_CACHE_SECONDS", "5"))
+READINESS_PROBE_TIMEOUT = float(os.getenv("READINESS_PROBE_TIMEOUT", "2"))
+
+
+class ServiceUnavailableError(RuntimeError):
+    """서비스 초기화 실패 (재시도 대기 시간 동안은 다시 초기화하지 않음)"""
+
+
+@dataclass
+class _Service:
+    factory: Optional[Callable[[], Any]]
+    required: bool
+    probe: Optional[Callable[[Any], Optional[Dict[str, Any]]]] = None
+    state: str = "cold"  # cold / warming / warm / failed
+    instance: Any = None
+    error: Optional[str] = None
+    init_ms: Optional[float] = None
+    failed_at: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ServiceRegistry:
+    def __init__(self, retry_seconds: float = 30.0, probe_cache_seconds: float = 5.0, probe_timeout: float = 2.0):
+        self.retry_seconds = retry_seconds
+        self.probe_cache_seconds = probe_cache_seconds
+        self.probe_timeout = probe_timeout
+        self._services: Dict[str, _Service] = {}
+        self._probe_result: Optional[Dict[str, Any]] = None
+        self._probe_checked_at = 0.0
+        self._probe_task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, factory: Callable[[], Any], required: bool = False,
+                 probe: Optional[Callable[[Any], Optional[Dict[str, Any]]]] = None) -> None:
+        """required=True인 서비스가 준비되지 않으면 readiness가 실패로 보고됨.
+        probe(인스턴스)는 실패 시 예외를 던지고, 성공 시 상세 정보 dict(또는 None)를 반환"""
+        self._services[name] = _Service(factory=factory, required=required, probe=probe)
+
+    def register_probe(self, name: str, probe: Callable[[Any], Optional[Dict[str, Any]]], required: bool = False) -> None:
+        """초기화할 인스턴스 없이 점검만 하는 외부 의존성 (TourAPI 등). probe에는 None이 전달됨"""
+        self._services[name] = _Service(factory=None, required=required, probe=probe, state="warm")
+
+    def get(self, name: str) -> Any:
+        """초기화된 인스턴스 반환 (처음이면 이 스레드에서 초기화)"""
+        service = self._services[name]
+        if service.state == "warm":
+            return service.instance
+        with service.lock:
+            if service.state == "warm":
+                return service.instance
+            if service.state == "failed" and time.monotonic() - service.failed_at < self.retry_seconds:
+                raise ServiceUnavailableError(f"{name} 초기화 실패: {service.error}")
+
+            service.state = "warming"
+            started = time.perf_counter()
+            try:
+                service.instance = service.factory()
+            except Exception as e:
+                service.state = "failed"
+                service.error = str(e)
+                service.failed_at = time.monotonic()
+                logger.error(f"❌ {name} 초기화 실패: {e}")
+                raise ServiceUnavailableError(f"{name} 초기화 실패: {e}") from e
+
+            service.state = "warm"
+            service.error = None
+            service.init_ms = (time.perf_counter() - started) * 1000
+            logger.info(f"✅ {name} 초기화 완료 ({service.init_ms:.0f}ms)")
+            return service.instance
+
+    async def aget(self, name: str) -> Any:
+        """이벤트 루프를 막지 않도록 초기화는 스레드에서 실행"""
+        service = self._services[name]
+        if service.state == "warm":
+            return service.instance
+        return await asyncio.to_thread(self.get, name)
+
+    async def warm_up(self, names: Optional[Iterable[str]] = None) -> None:
+        for name in names if names is not None else list(self._services):
+            if name not in self._services:
+                logger.warning(f"알 수 없는 워밍업 대상: {name}")
+                continue
+            try:
+                await self.aget(name)
+            except ServiceUnavailableError:
+                pass
+
+    def is_ready(self) -> bool:
+        return all(service.state == "warm" for service in self._services.values() if service.required)
+
+    # ==================== 의존성 점검 (readiness) ====================
+
+    async def check(self) -> Dict[str, Any]:
+        """모든 서비스 점검 결과. probe_cache_seconds 안의 재요청은 캐시된 결과를 그대로 반환"""
+        if self._probe_result is not None and time.monotonic() - self._probe_checked_at < self.probe_cache_seconds:
+            return {**self._probe_result, "cached": True}
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.ensure_future(self._run_probes())
+        result = await asyncio.shield(self._probe_task)
+        return {**result, "cached": False}
+
+    async def _run_probes(self) -> Dict[str, Any]:
+        names = list(self._services)
+        results = await asyncio.gather(*(self._probe(name) for name in names))
+        services = {name: {**self.status()[name], **result} for name, result in zip(names, results)}
+        result = {
+            "ready": all(entry["status"] == "ok" for entry in services.values() if entry["required"]),
+            "checked_at": time.time(),
+            "services": services,
+        }
+        self._probe_result, self._probe_checked_at = result, time.monotonic()
+        return result
+
+    async def _probe(self, name: str) -> Dict[str, Any]:
+        service = self._services[name]
+        if service.state in ("cold", "failed") and service.required and service.factory is not None:
+            # 재시도 대기 시간 안이면 get()이 바로 ServiceUnavailableError를 던지므로 초기화를 반복하지 않음
+            try:
+                await asyncio.wait_for(self.aget(name), timeout=self.probe_timeout)
+            except (ServiceUnavailableError, asyncio.TimeoutError):
+                pass
+        if service.state != "warm":
+            # 선택 서비스는 점검이 초기화를 일으키지 않음 (RAG 체인 로딩 등은 워밍업·첫 사용 시점에만)
+            return {"status": service.state, "latency_ms": None, "details": None}
+        if service.probe is None:
+            return {"status": "ok", "latency_ms": None, "details": None}
+
+        instance = service.instance if service.factory is not None else None
+        started = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(asyncio.to_thread(service.probe, instance), timeout=self.probe_timeout)
+            status, error = "ok", None
+        except asyncio.TimeoutError:
+            details, status, error = None, "timeout", f"{self.probe_timeout:.1f}초 안에 응답 없음"
+        except Exception as e:
+            details, status, error = None, "failed", str(e)
+        entry = {"status": status, "latency_ms": round((time.perf_counter() - started) * 1000, 1), "details": details}
+        if error:
+            entry["error"] = error
+        return entry
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "state": service.state,
+                "required": service.required,
+                "init_ms": service.init_ms,
+                "error": service.error,
+            }
+            for name, service in self._services.items()
+        }
+
+
+service_registry = ServiceRegistry(probe_cache_seconds=READINESS_CACHE_SECONDS, probe_timeout=READINESS_PROBE_TIMEOUT)
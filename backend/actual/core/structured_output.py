@@ -0,0 +1,135 @@
+# structured_output.py
+# LLM JSON 응답 파싱·로컬 복구 (모델 재호출 없음)
+# - 스트리밍 중 최상위 JSON 객체의 끝을 감지하여 뒤따르는 설명문을 기다리지 않음
+# - 코드 펜스, 앞뒤 설명문, 후행 쉼표, 잘린 응답(닫히지 않은 문자열·괄호), 누락 필드를 복구
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from core.request_timing import timed
+
+T = TypeVar("T", bound=BaseModel)
+
+# 문자열 리터럴을 통째로 먼저 매칭해 그 안의 ', ]' 같은 내용은 후행 쉼표로 보지 않음
+_STRING_OR_TRAILING_COMMA_RE = re.compile(r'"(?:[^"\\]|\\.)*"|,(\s*[}\]])')
+_DANGLING_KEY_RE = re.compile(r'([{,])\s*"(?:[^"\\]|\\.)*"\s*(?::\s*)?$')
+
+# 파싱 결과 집계 (/health/llm 에서 조회)
+structured_output_stats = {"parsed": 0, "repaired": 0, "parse_failures": 0, "rule_based_fallbacks": 0}
+
+
+class StructuredOutputError(ValueError):
+    """로컬 복구로도 스키마에 맞는 객체를 만들지 못함"""
+
+
+class JSONStreamScanner:
+    """스트리밍 조각을 받아 첫 번째 최상위 JSON 객체의 범위를 추적 (문자열 안의 괄호·이스케이프 처리)"""
+
+    def __init__(self):
+        self.stack: List[str] = []
+        self.in_string = False
+        self.escape = False
+        self.start: Optional[int] = None
+        self.end: Optional[int] = None
+        self.position = 0
+
+    @property
+    def complete(self) -> bool:
+        return self.end is not None
+
+    def feed(self, text: str) -> bool:
+        """조각을 읽고 최상위 객체가 닫혔으면 True"""
+        for ch in text:
+            if self.complete:
+                break
+            self.position += 1
+            if self.start is None:
+                if ch == "{":
+                    self.start = self.position - 1
+                    self.stack.append("}")
+                continue
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "{":
+                self.stack.append("}")
+            elif ch == "[":
+                self.stack.append("]")
+            elif ch in "}]" and self.stack:
+                self.stack.pop()
+                if not self.stack:
+                    self.end = self.position
+        return self.complete
+
+
+def extract_json(text: str) -> Optional[str]:
+    """텍스트에서 첫 번째 JSON 객체를 잘라내고, 잘린 응답이면 열린 문자열·괄호를 닫아 완성"""
+    scanner = JSONStreamScanner()
+    scanner.feed(text)
+    if scanner.start is None:
+        return None
+    if scanner.complete:
+        return text[scanner.start:scanner.end]
+
+    candidate = text[scanner.start:]
+    if scanner.in_string:
+        candidate += '"'
+    # 값 없이 끊긴 키('"reason' 또는 '"reasons":')는 버림
+    candidate = _DANGLING_KEY_RE.sub(r"\1", candidate.rstrip()).rstrip().rstrip(",")
+    return candidate + "".join(reversed(scanner.stack))
+
+
+def strip_trailing_commas(candidate: str) -> str:
+    """닫는 괄호 바로 앞의 후행 쉼표 제거. 문자열 안의 ', ]' 같은 내용은 건드리지 않음"""
+    return _STRING_OR_TRAILING_COMMA_RE.sub(lambda m: m.group(0) if m.group(1) is None else m.group(1), candidate)
+
+
+def fill_missing(data: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """data에 없거나 None인 키를 defaults 값으로 채움 (중첩 dict는 재귀)"""
+    for key, value in defaults.items():
+        if data.get(key) is None:
+            data[key] = value
+        elif isinstance(data[key], dict) and isinstance(value, dict):
+            fill_missing(data[key], value)
+    return data
+
+
+@timed("parse")
+def parse_with_repair(text: str, model: Type[T],
+                      fill: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None) -> Tuple[T, bool]:
+    """(모델 객체, 복구 여부). 그대로 파싱되면 복구 없음, 아니면 로컬 복구 후 검증"""
+    try:
+        result = model.model_validate_json(text.strip())
+        structured_output_stats["parsed"] += 1
+        return result, False
+    except (ValidationError, ValueError):
+        pass
+
+    candidate = extract_json(text)
+    if candidate is not None:
+        candidate = strip_trailing_commas(candidate)
+        try:
+            data = json.loads(candidate)
+        except json.JSONDecodeError:
+            data = None
+        if isinstance(data, dict):
+            if fill is not None:
+                data = fill(data)
+            try:
+                result = model.model_validate(data)
+                structured_output_stats["repaired"] += 1
+                return result, True
+            except ValidationError:
+                pass
+
+    structured_output_stats["parse_failures"] += 1
+    raise StructuredOutputError(f"{model.__name__} 형식으로 복구할 수 없는 응답입니다.")
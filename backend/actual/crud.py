@@ -1,17 +1,22 @@
 # crud.py
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, exists, func
 import uuid
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 
 # 로컬 모듈 임포트
 from core.database import User, Conversation, Festival, FestivalDetail, FestivalIntro, PetInfo
 from schemas.models import UserCreate, UserInfo, ConversationInit
 from core.auth import get_password_hash
+from core.request_timing import timed
+
+# 축제 검색 한 번에 조회하는 최대 건수 (API 페이지 크기 상한과 별개로 DB 조회량을 제한)
+SEARCH_MAX_LIMIT = 500
 
 # ==================== 사용자 CRUD ====================
 
+@timed("db")
 def create_user(db: Session, username: str, email: str, hashed_password: str, full_name: str = None, profile_picture: str = None) -> User:
     db_user = User(username=username, email=email, hashed_password=hashed_password, full_name=full_name, profile_picture=profile_picture)
     db.add(db_user)
@@ -19,9 +24,11 @@ def create_user(db: Session, username: str, email: str, hashed_password: str, fu
     db.refresh(db_user)
     return db_user
 
+@timed("db")
 def get_user_by_username(db: Session, username: str) -> Optional[User]:
     return db.query(User).filter(User.username == username).first()
 
+@timed("db")
 def update_user_profile(db: Session, user_id: int, full_name: str = None, profile_picture: str = None) -> Optional[User]:
     """사용자 프로필 정보 업데이트"""
     user = db.query(User).filter(User.id == user_id).first()
@@ -36,6 +43,7 @@ def update_user_profile(db: Session, user_id: int, full_name: str = None, profil
 
 # ==================== 대화 세션 CRUD ====================
 
+@timed("db")
 def create_conversation(db: Session, user_id: int, init_data: ConversationInit) -> Conversation:
     session_id = str(uuid.uuid4())
     db_conversation = Conversation(
@@ -53,9 +61,11 @@ def create_conversation(db: Session, user_id: int, init_data: ConversationInit)
     db.refresh(db_conversation)
     return db_conversation
 
+@timed("db")
 def get_conversation_by_session_id(db: Session, session_id: str):
     return db.query(Conversation).filter(Conversation.session_id == session_id).first()
 
+@timed("db")
 def update_conversation_phase(db: Session, conversation_id: int, phase: str, **kwargs):
     conversation = db.query(Conversation).filter(Conversation.id == conversation_id).first()
     if conversation:
@@ -72,6 +82,7 @@ def update_conversation_phase(db: Session, conversation_id: int, phase: str, **k
 # 사용자 선호도 관련 함수는 제거됨 (새로운 RAG 시스템에서는 불필요)
 
 # 축제 관련 CRUD 함수들
+@timed("db")
 def create_festival(db: Session, festival_data: dict) -> Festival:
     """축제 기본 정보 생성"""
     db_festival = Festival(**festival_data)
@@ -80,14 +91,17 @@ def create_festival(db: Session, festival_data: dict) -> Festival:
     db.refresh(db_festival)
     return db_festival
 
+@timed("db")
 def get_festival_by_contentid(db: Session, contentid: str) -> Optional[Festival]:
     """contentid로 축제 조회"""
     return db.query(Festival).filter(Festival.contentid == contentid).first()
 
+@timed("db")
 def get_festivals_by_region(db: Session, region: str) -> List[Festival]:
     """지역별 축제 목록 조회"""
     return db.query(Festival).filter(Festival.region == region).all()
 
+@timed("db")
 def get_festivals_by_period(db: Session, start_date: str, end_date: str) -> List[Festival]:
     """기간별 축제 목록 조회"""
     return db.query(Festival).filter(
@@ -97,6 +111,7 @@ def get_festivals_by_period(db: Session, start_date: str, end_date: str) -> List
         )
     ).all()
 
+@timed("db")
 def create_festival_detail(db: Session, detail_data: dict) -> FestivalDetail:
     """축제 상세 정보 생성"""
     db_detail = FestivalDetail(**detail_data)
@@ -105,6 +120,7 @@ def create_festival_detail(db: Session, detail_data: dict) -> FestivalDetail:
     db.refresh(db_detail)
     return db_detail
 
+@timed("db")
 def create_festival_intro(db: Session, intro_data: dict) -> FestivalIntro:
     """축제 소개 정보 생성"""
     db_intro = FestivalIntro(**intro_data)
@@ -113,6 +129,7 @@ def create_festival_intro(db: Session, intro_data: dict) -> FestivalIntro:
     db.refresh(db_intro)
     return db_intro
 
+@timed("db")
 def create_pet_info(db: Session, pet_data: dict) -> PetInfo:
     """반려동물 정보 생성"""
     db_pet_info = PetInfo(**pet_data)
@@ -121,6 +138,17 @@ def create_pet_info(db: Session, pet_data: dict) -> PetInfo:
     db.refresh(db_pet_info)
     return db_pet_info
 
+@timed("db")
+def get_festival_modifiedtimes(db: Session, contentids: List[str]) -> Dict[str, Optional[str]]:
+    """contentid별 상세 정보 수정 시각 (추천 캐시 키 구성용)"""
+    if not contentids:
+        return {}
+    rows = db.query(FestivalDetail.contentid, FestivalDetail.modifiedtime).filter(
+        FestivalDetail.contentid.in_(contentids)
+    ).all()
+    return {contentid: modifiedtime for contentid, modifiedtime in rows}
+
+@timed("db")
 def get_festival_with_details(db: Session, contentid: str) -> Optional[dict]:
     """축제의 모든 정보를 함께 조회"""
     festival = get_festival_by_contentid(db, contentid)
@@ -138,12 +166,11 @@ def get_festival_with_details(db: Session, contentid: str) -> Optional[dict]:
         "pet_info": pet_info
     }
 
-def search_festivals(db: Session, 
-                    region: Optional[str] = None,
-                    period: Optional[str] = None,
-                    festival_type: Optional[str] = None,
-                    has_pet_info: bool = False) -> List[Festival]:
-    """축제 검색 (필터링 적용)"""
+def _festival_search_query(db: Session,
+                           region: Optional[str] = None,
+                           period: Optional[str] = None,
+                           festival_type: Optional[str] = None,
+                           has_pet_info: bool = False):
     query = db.query(Festival)
     
     if region:
@@ -156,12 +183,55 @@ def search_festivals(db: Session,
         query = query.filter(Festival.festivaltype == festival_type)
     
     if has_pet_info:
-        # 반려동물 정보가 있는 축제만 필터링
-        pet_contentids = db.query(PetInfo.contentid).distinct()
-        query = query.filter(Festival.contentid.in_(pet_contentids))
+        # 반려동물 정보가 있는 축제만 필터링 (pet_infos.contentid 인덱스를 타는 EXISTS 세미조인)
+        query = query.filter(exists().where(PetInfo.contentid == Festival.contentid))
     
-    return query.all()
+    return query
+
+@timed("db")
+def search_festivals(db: Session, 
+                    region: Optional[str] = None,
+                    period: Optional[str] = None,
+                    festival_type: Optional[str] = None,
+                    has_pet_info: bool = False,
+                    limit: int = 50,
+                    after: Optional[Tuple[Optional[str], str]] = None) -> List[Festival]:
+    """축제 검색 (필터링 적용, (start_date, contentid) 순).
+    after=(start_date, contentid)이면 그 다음 행부터 limit개 (키셋 페이지네이션, 최대 SEARCH_MAX_LIMIT개)"""
+    query = _festival_search_query(db, region, period, festival_type, has_pet_info)
+    if after is not None:
+        after_start_date, after_contentid = after
+        # MySQL·SQLite 오름차순 정렬에서는 NULL start_date가 먼저 오므로 NULL 구간 → 날짜 구간 순으로 이어짐
+        if after_start_date is None:
+            query = query.filter(or_(
+                and_(Festival.start_date.is_(None), Festival.contentid > after_contentid),
+                Festival.start_date.isnot(None)
+            ))
+        else:
+            query = query.filter(or_(
+                Festival.start_date > after_start_date,
+                and_(Festival.start_date == after_start_date, Festival.contentid > after_contentid)
+            ))
+    query = query.order_by(Festival.start_date, Festival.contentid)
+    return query.limit(min(limit, SEARCH_MAX_LIMIT)).all()
+
+@timed("db")
+def count_festivals(db: Session,
+                    region: Optional[str] = None,
+                    period: Optional[str] = None,
+                    festival_type: Optional[str] = None,
+                    has_pet_info: bool = False,
+                    cap: Optional[int] = None) -> Tuple[int, bool]:
+    """search_festivals와 같은 조건의 (건수, 정확 여부).
+    cap을 넘으면 cap+1개까지만 세고 (cap, False) 반환 → 테이블이 커져도 COUNT 비용이 cap에 묶임"""
+    query = _festival_search_query(db, region, period, festival_type, has_pet_info)
+    if cap is None:
+        return query.count(), True
+    bounded = query.with_entities(Festival.id).limit(cap + 1).subquery()
+    count = db.query(func.count()).select_from(bounded).scalar()
+    return (count, True) if count <= cap else (cap, False)
 
+@timed("db")
 def create_conversation(db: Session, user_id: int, session_data: dict) -> Conversation:
     """대화 세션 생성"""
     session_id = str(uuid.uuid4())
@@ -175,6 +245,7 @@ def create_conversation(db: Session, user_id: int, session_data: dict) -> Conver
     db.refresh(db_conversation)
     return db_conversation
 
+@timed("db")
 def update_conversation(db: Session, session_id: str, update_data: dict) -> Optional[Conversation]:
     """대화 세션 업데이트"""
     conversation = db.query(Conversation).filter(Conversation.session_id == session_id).first()
@@ -189,10 +260,12 @@ def update_conversation(db: Session, session_id: str, update_data: dict) -> Opti
     db.refresh(conversation)
     return conversation
 
+@timed("db")
 def get_conversation(db: Session, session_id: str) -> Optional[Conversation]:
     """세션 ID로 대화 조회"""
     return db.query(Conversation).filter(Conversation.session_id == session_id).first()
 
+@timed("db")
 def get_user_conversations(db: Session, user_id: int) -> List[Conversation]:
     """사용자의 모든 대화 세션 조회"""
     return db.query(Conversation).filter(Conversation.user_id == user_id).all()
\ No newline at end of file
@@ -99,15 +99,24 @@ ssh $VPC_SERVER_USER@$VPC_SERVER_IP "mysql -h $DB_HOST -u $DB_USER -p$DB_PASSWOR
 # username 컬럼 추가 (User 테이블에)
 ssh $VPC_SERVER_USER@$VPC_SERVER_IP "mysql -h $DB_HOST -u $DB_USER -p$DB_PASSWORD -e \"USE $DB_NAME; ALTER TABLE users ADD COLUMN username VARCHAR(255) UNIQUE NOT NULL AFTER id;\"" 2>/dev/null || echo "⚠️ username 컬럼이 이미 존재하거나 추가 중 오류 발생"
 
+# is_admin 컬럼 추가 (User 테이블에, /admin/* 접근 권한)
+ssh $VPC_SERVER_USER@$VPC_SERVER_IP "mysql -h $DB_HOST -u $DB_USER -p$DB_PASSWORD -e \"USE $DB_NAME; ALTER TABLE users ADD COLUMN is_admin BOOLEAN NOT NULL DEFAULT FALSE;\"" 2>/dev/null || echo "⚠️ is_admin 컬럼이 이미 존재하거나 추가 중 오류 발생"
+
 # 축제 관련 테이블 생성
 ssh $VPC_SERVER_USER@$VPC_SERVER_IP "mysql -h $DB_HOST -u $DB_USER -p$DB_PASSWORD -e \"USE $DB_NAME; CREATE TABLE IF NOT EXISTS festivals (id INT AUTO_INCREMENT PRIMARY KEY, contentid VARCHAR(50) UNIQUE NOT NULL, title VARCHAR(500) NOT NULL, contenttypeid VARCHAR(50), addr1 VARCHAR(500), start_date VARCHAR(20), end_date VARCHAR(20), image VARCHAR(1000), progresstype VARCHAR(100), festivaltype VARCHAR(100), tel VARCHAR(100), region VARCHAR(100), created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);\"" 2>/dev/null || echo "⚠️ festivals 테이블 생성 중 오류 발생"
 
-ssh $VPC_SERVER_USER@$VPC_SERVER_IP "mysql -h $DB_HOST -u $DB_USER -p$DB_PASSWORD -e \"USE $DB_NAME; CREATE TABLE IF NOT EXISTS festival_details (id INT AUTO_INCREMENT PRIMARY KEY, contentid VARCHAR(50), title VARCHAR(500) NOT NULL, createdtime VARCHAR(20), modifiedtime VARCHAR(20), tel VARCHAR(100), telname VARCHAR(100), homepage VARCHAR(1000), firstimage VARCHAR(1000), firstimage2 VARCHAR(1000), addr1 VARCHAR(500), addr2 VARCHAR(500), mapx VARCHAR(50), mapy VARCHAR(50), mlevel VARCHAR(50), overview TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (contentid) REFERENCES festivals(contentid));\"" 2>/dev/null || echo "⚠️ festival_details 테이블 생성 중 오류 발생"
+ssh $VPC_SERVER_USER@$VPC_SERVER_IP "mysql -h $DB_HOST -u $DB_USER -p$DB_PASSWORD -e \"USE $DB_NAME; CREATE TABLE IF NOT EXISTS festival_details (id INT AUTO_INCREMENT PRIMARY KEY, contentid VARCHAR(50), title VARCHAR(500) NOT NULL, createdtime VARCHAR(20), modifiedtime VARCHAR(20), tel VARCHAR(100), telname VARCHAR(100), homepage VARCHAR(1000), firstimage VARCHAR(1000), firstimage2 VARCHAR(1000), addr1 VARCHAR(500), addr2 VARCHAR(500), mapx DOUBLE NULL, mapy DOUBLE NULL, mlevel VARCHAR(50), overview TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (contentid) REFERENCES festivals(contentid));\"" 2>/dev/null || echo "⚠️ festival_details 테이블 생성 중 오류 발생"
 
 ssh $VPC_SERVER_USER@$VPC_SERVER_IP "mysql -h $DB_HOST -u $DB_USER -p$DB_PASSWORD -e \"USE $DB_NAME; CREATE TABLE IF NOT EXISTS festival_intros (id INT AUTO_INCREMENT PRIMARY KEY, contentid VARCHAR(50), sponsor1 VARCHAR(200), sponsor1tel VARCHAR(100), sponsor2 VARCHAR(200), eventenddate VARCHAR(20), playtime VARCHAR(200), eventplace VARCHAR(500), eventstartdate VARCHAR(20), usetimefestival VARCHAR(500), progresstype VARCHAR(100), festivaltype VARCHAR(100), created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (contentid) REFERENCES festivals(contentid));\"" 2>/dev/null || echo "⚠️ festival_intros 테이블 생성 중 오류 발생"
 
 ssh $VPC_SERVER_USER@$VPC_SERVER_IP "mysql -h $DB_HOST -u $DB_USER -p$DB_PASSWORD -e \"USE $DB_NAME; CREATE TABLE IF NOT EXISTS pet_infos (id INT AUTO_INCREMENT PRIMARY KEY, contentid VARCHAR(50), acmpyPsblCpam VARCHAR(200), relaRntlPrdlst VARCHAR(500), acmpyNeedMtr VARCHAR(500), etcAcmpyInfo TEXT, relaPurcPrdlst VARCHAR(500), relaAcdntRiskMtr VARCHAR(500), acmpyTypeCd VARCHAR(50), relaPosesFclty VARCHAR(500), created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (contentid) REFERENCES festivals(contentid));\"" 2>/dev/null || echo "⚠️ pet_infos 테이블 생성 중 오류 발생"
 
+# 축제 좌표 컬럼을 숫자형으로 변경 (빈 문자열은 NULL로 먼저 정리, 이미 DOUBLE이면 변화 없음)
+ssh $VPC_SERVER_USER@$VPC_SERVER_IP "mysql -h $DB_HOST -u $DB_USER -p$DB_PASSWORD -e \"USE $DB_NAME; UPDATE festival_details SET mapx = NULL WHERE TRIM(mapx) = ''; UPDATE festival_details SET mapy = NULL WHERE TRIM(mapy) = ''; ALTER TABLE festival_details MODIFY mapx DOUBLE NULL, MODIFY mapy DOUBLE NULL;\"" 2>/dev/null || echo "⚠️ festival_details 좌표 컬럼 변경 중 오류 발생"
+
+# 좌표 범위 조회 인덱스
+ssh $VPC_SERVER_USER@$VPC_SERVER_IP "mysql -h $DB_HOST -u $DB_USER -p$DB_PASSWORD -e \"USE $DB_NAME; CREATE INDEX idx_festival_details_mapy_mapx ON festival_details(mapy, mapx);\"" 2>/dev/null || echo "⚠️ idx_festival_details_mapy_mapx 인덱스가 이미 존재하거나 생성 중 오류 발생"
+
 log_info "✅ 데이터베이스 스키마 업데이트 완료"
 
 # ========================================
@@ -1,42 +1,61 @@
 # namdo_bot.py (전체 코드)
 
+import asyncio
 import logging
 import json
 import uuid
 import os
+import time
 from datetime import timedelta, datetime
 from typing import List, Optional
 
-from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File
+from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from fastapi.security import OAuth2PasswordRequestForm, HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 # --- 로컬 모듈 임포트 ---
-from core.database import get_db, create_tables, Conversation, User
-from core.auth import authenticate_user, create_access_token, get_current_active_user, create_user_helper, ACCESS_TOKEN_EXPIRE_MINUTES
+from core.database import get_db, create_tables, check_connection, probe_connection, get_pool_stats, Conversation, User
+from core.auth import authenticate_user, create_access_token, get_current_active_user, get_current_admin_user, create_user_helper, ACCESS_TOKEN_EXPIRE_MINUTES
+from core.llm_gateway import llm_gateway, LLMUnavailableError, LLMOverloadedError
+from core.llm_provider import create_chat_model, LLM_PROVIDER
+from core.structured_output import parse_with_repair, fill_missing, structured_output_stats, StructuredOutputError
+from core.service_registry import service_registry, ServiceUnavailableError
+from core.pagination import encode_cursor, decode_cursor
+from core.dataset_version import dataset_versions
+from core.http_cache import make_etag, cache_headers, is_not_modified, not_modified_response
+from core.request_timing import start_request, SERVER_TIMING_ENABLED, SLOW_REQUEST_MS
+from core.metrics import metrics, observe_request, http_requests_in_progress, rate_limited
+from core.rate_limit import enforce_llm_rate_limit
+from core.structured_logging import configure_logging, stats as log_stats
+from core.profiling import sample_cpu, memory_diff, ProfilerBusyError, PROFILE_MAX_SECONDS
 from crud import (
-    create_conversation, get_conversation_by_session_id, update_conversation_phase,
-    update_user_profile
+    create_conversation, get_conversation_by_session_id, update_conversation_phase, update_conversation,
+    update_user_profile, get_festival_modifiedtimes, count_festivals,
+    search_festivals as crud_search_festivals
 )
 from schemas.models import (
     UserCreate, Token, UserInfo, ConversationInit, ConversationUpdate,
     ChatResponse, RecommendationResponse, HealthCheck, FestivalRecommendation,
     UserPreference, UserPreferenceCreate, FestivalRecommendationRequest, FestivalRecommendationResponse,
     BotGreetingRequest, BotGreetingResponse, XAIFinalizeRequest, XAIFinalizeResponse,
-    StructuredRecommendationResponse, TopRecommendation, AlternativeRecommendation, ScoreBreakdown, RecommendationCriteria
+    StructuredRecommendationResponse, TopRecommendation, AlternativeRecommendation, ScoreBreakdown, RecommendationCriteria,
+    FestivalSearchItem, FestivalSearchFilters, FestivalSearchResponse, TourFestivalSearchResponse,
+    FestivalTextSearchHit, FestivalTextSearchResponse, FestivalNearbyItem, FestivalNearbyResponse
 )
-from services.tour_api import get_festivals_by_name
-from langchain_naver import ChatClovaX
-from langchain.chains import LLMChain
-from langchain.prompts import PromptTemplate
+from services.tour_api import get_festivals_by_name, ping as ping_tour_api
 from services.festival_service import festival_service
-from langchain.output_parsers import PydanticOutputParser
+from services.recommendation_cache import recommendation_cache
+from services.festival_search_index import festival_search_index
+from services.festival_geo_index import festival_geo_index
+from services.message_templates import CONVERSATION_SCENARIO, message_templates, scenario_turn
 
 # --- 로깅 및 FastAPI 앱 설정 ---
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 load_dotenv()
 
@@ -48,58 +67,234 @@ app = FastAPI(
 
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 
+@app.exception_handler(LLMOverloadedError)
+async def llm_overloaded_handler(request: Request, exc: LLMOverloadedError):
+    """ClovaX 대기열이 가득 차면 규칙 기반 대체 대신 429로 거절해 진행 중인 요청에 용량을 남김"""
+    rate_limited.inc("llm_overload")
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+@app.middleware("http")
+async def request_timing_middleware(request: Request, call_next):
+    """구간별 처리 시간을 Server-Timing 헤더와 /metrics 지표로 내보내고, SLOW_REQUEST_MS를 넘은 요청은 JSON 한 줄로 기록"""
+    timings = start_request()
+    http_requests_in_progress.inc()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        http_requests_in_progress.dec()
+        total_ms = timings.total_ms
+        # 매칭된 라우트 템플릿(/bot/conversation/{session_id})으로 집계해 레이블 수를 제한
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        observe_request(request.method, route, status_code, total_ms, timings.stages)
+    if SERVER_TIMING_ENABLED:
+        response.headers["Server-Timing"] = timings.server_timing(total_ms)
+    if total_ms >= SLOW_REQUEST_MS:
+        logger.warning("slow_request", extra={
+            "event": "slow_request",
+            "method": request.method,
+            "path": route,
+            "status": response.status_code,
+            "total_ms": round(total_ms, 1),
+            "stages": timings.summary(),
+        })
+    return response
+
+# 목록 API 한 페이지 최대 건수
+MAX_PAGE_SIZE = 200
+
+# 축제 조회 응답의 Cache-Control max-age (초). 만료 후에는 ETag로 재검증
+FESTIVAL_CACHE_MAX_AGE = int(os.getenv("FESTIVAL_CACHE_MAX_AGE", "60"))
+
+# 축제 검색 total_count를 셀 최대 건수 (넘으면 이 값과 total_count_exact=false 반환)
+FESTIVAL_COUNT_CAP = int(os.getenv("FESTIVAL_COUNT_CAP", "10000"))
+
 # ==================== RAG/LLM 연동 ====================
 
+# RAG 프롬프트 템플릿 버전 (템플릿을 바꾸면 올려서 기존 추천 캐시를 무효화)
+RAG_PROMPT_VERSION = "1"
+
 # LangChain RAG 시스템 초기화
 def initialize_rag_system():
-    """LangChain RAG 시스템 초기화"""
-    try:
-        # ClovaX LLM 초기화
-        llm = ChatClovaX(
-            model="clova-x-1-5-20240607",
-            api_key=os.getenv("CLOVASTUDIO_API_KEY"),
-            temperature=0.1  # 일관된 출력을 위해 낮은 temperature
-        )
+    """LangChain RAG 시스템 초기화 (langchain·ClovaX 모듈은 이 시점에 처음 로드)"""
+    from langchain.chains import LLMChain
+    from langchain.output_parsers import PydanticOutputParser
+    from langchain.prompts import PromptTemplate
+
+    # ClovaX LLM 초기화 (LLM_PROVIDER=fake이면 네트워크 없는 대역)
+    llm = create_chat_model(
+        model="clova-x-1-5-20240607",
+        temperature=0.1  # 일관된 출력을 위해 낮은 temperature
+    )
+    
+    # PydanticOutputParser 초기화
+    parser = PydanticOutputParser(pydantic_object=StructuredRecommendationResponse)
+    
+    # RAG 프롬프트 템플릿
+    rag_prompt_template = PromptTemplate(
+        input_variables=["context", "user_preferences", "festival_data"],
+        template="""
+        당신은 호남 지역 축제 추천 전문가입니다.
         
-        # PydanticOutputParser 초기화
-        parser = PydanticOutputParser(pydantic_object=StructuredRecommendationResponse)
+        사용자 정보:
+        {user_preferences}
         
-        # RAG 프롬프트 템플릿
-        rag_prompt_template = PromptTemplate(
-            input_variables=["context", "user_preferences", "festival_data"],
-            template="""
-            당신은 호남 지역 축제 추천 전문가입니다.
-            
-            사용자 정보:
-            {user_preferences}
-            
-            축제 데이터:
-            {festival_data}
-            
-            컨텍스트:
-            {context}
-            
-            반드시 아래 JSON 형식으로만 대답하세요:
-            {format_instructions}
-            
-            중요: 자연어가 아닌 JSON 형식으로만 응답하세요.
-            """,
-            partial_variables={"format_instructions": parser.get_format_instructions()}
-        )
+        축제 데이터:
+        {festival_data}
         
-        # RAG 체인 생성
-        rag_chain = LLMChain(llm=llm, prompt=rag_prompt_template)
+        컨텍스트:
+        {context}
         
-        return rag_chain, parser
+        반드시 아래 JSON 형식으로만 대답하세요:
+        {format_instructions}
         
-    except Exception as e:
-        print(f"RAG 시스템 초기화 실패: {e}")
+        중요: 자연어가 아닌 JSON 형식으로만 응답하세요.
+        """,
+        partial_variables={"format_instructions": parser.get_format_instructions()}
+    )
+    
+    # RAG 체인 생성
+    rag_chain = LLMChain(llm=llm, prompt=rag_prompt_template)
+    
+    return rag_chain, parser
+
+def probe_rag(rag_system) -> dict:
+    """readiness 점검: RAG 체인이 있고, LLM 게이트웨이의 부하·실패 현황 (ClovaX 자체는 호출하지 않음)"""
+    rag_chain, _ = rag_system
+    if rag_chain is None:
+        raise RuntimeError("RAG 체인이 초기화되지 않았습니다.")
+    report = llm_gateway.report()
+    return {"provider": LLM_PROVIDER, **{key: report[key] for key in ("in_flight", "waiting", "max_concurrency", "timeouts", "errors")}}
+
+def initialize_database():
+    """DB 접속 확인 후 테이블 생성 (startup 때 DB가 내려가 있었으면 readiness 점검이 다시 호출)"""
+    engine = check_connection()
+    create_tables()
+    return engine
+
+# startup 시 미리 초기화할 서비스 (LLM 경로를 처리하지 않는 워커는 "database"만 지정)
+WARMUP_SERVICES = [name.strip() for name in os.getenv("WARMUP_SERVICES", "database,rag").split(",") if name.strip()]
+
+# 서비스 레지스트리 등록 (실제 초기화는 startup 워밍업 또는 첫 사용 시점)
+service_registry.register("database", initialize_database, required=True, probe=probe_connection)
+# RAG를 워밍업하는 워커는 LLM 경로를 맡으므로 체인 초기화에 실패하면 ready에서 빠지게 함
+# ("database"만 워밍업하는 워커는 RAG 없이도 ready)
+service_registry.register("rag", initialize_rag_system, required="rag" in WARMUP_SERVICES, probe=probe_rag)
+# 축제 수집·/recommendations가 쓰는 외부 API (없어도 DB 기반 추천은 동작하므로 필수 아님)
+service_registry.register_probe("tour_api", ping_tour_api)
+
+# 수집 시점에 읽는 워커별 현재 값 (/metrics)
+def collect_runtime_metrics():
+    pool = get_pool_stats() or {}
+    yield ("namdo_db_pool_connections", "gauge", "SQLAlchemy 커넥션 풀 상태", ("state",),
+           [((state,), value) for state, value in pool.items()])
+    yield ("namdo_recommendation_cache_events_total", "counter", "추천 응답 캐시 조회·저장 수", ("result",),
+           [((result,), value) for result, value in recommendation_cache.stats.items()])
+    report = llm_gateway.report()
+    yield ("namdo_llm_in_flight", "gauge", "실행 중인 ClovaX 호출 수", (), [((), report["in_flight"])])
+    yield ("namdo_llm_waiting", "gauge", "동시 실행 제한으로 대기 중인 ClovaX 호출 수", (), [((), report["waiting"])])
+    yield ("namdo_log_records_total", "counter", "로그 레코드 수 (enqueued: 출력 대기열에 넣음, dropped: 대기열이 가득 차 버림, sampled_out: 디버그 샘플링으로 제외)",
+           ("result",), [((result,), value) for result, value in log_stats.items()])
+
+metrics.add_collector(collect_runtime_metrics)
+
+async def get_rag_system():
+    """(rag_chain, response_parser). 초기화에 실패했으면 (None, None) → 호출 측은 규칙 기반 결과 사용"""
+    try:
+        return await service_registry.aget("rag")
+    except ServiceUnavailableError:
         return None, None
 
-# RAG 시스템 초기화
-rag_chain, response_parser = initialize_rag_system()
+def generate_rule_based_recommendations(db: Session, conversation: Conversation) -> List[dict]:
+    """LLM 응답을 제때 받지 못했을 때 쓰는 규칙 기반 추천 (RecommendationResponse 항목 형식)"""
+    results = festival_service.get_festival_recommendations(
+        db,
+        conversation.travel_period,
+        conversation.companion_type,
+        conversation.energy_preference or "기본",
+        conversation.interest_focus or "기본",
+        conversation.additional_requirements or "기본"
+    )
+    return [
+        {
+            "rank": i + 1,
+            "name": rec["festival"].title,
+            "location": rec["festival"].addr1 or "",
+            "description": f"기간: {rec['festival'].start_date}~{rec['festival'].end_date}",
+            "image_url": rec["festival"].image or "",
+            "reason": ", ".join(rec["reasons"]),
+            "xai_explanation": f"조건 일치 점수 {rec['score']}점 ({', '.join(rec['reasons'])})"
+        }
+        for i, rec in enumerate(results)
+    ]
 
-async def generate_llm_recommendations(conversation: Conversation) -> List[FestivalRecommendation]:
+def _rule_based_item(rec: dict) -> dict:
+    """규칙 기반 추천 1건 → FestivalRecommendationItem 형식"""
+    festival = rec["festival"]
+    return {
+        "title": festival.title,
+        "region": festival.region or "",
+        "start_date": festival.start_date or "",
+        "end_date": festival.end_date or "",
+        "location": festival.addr1 or "",
+        "score": rec["score"],
+        "reasons": rec["reasons"],
+        "why_recommended": ", ".join(rec["reasons"]),
+        "image": festival.image,
+        "tel": festival.tel
+    }
+
+def build_rule_based_structured_response(conversation: Conversation, recommendations: List[dict]) -> StructuredRecommendationResponse:
+    """LLM 없이 규칙 기반 점수만으로 만든 구조화 응답 (LLM 실패 시 응답 및 누락 필드 기본값)"""
+    items = [_rule_based_item(rec) for rec in recommendations]
+    top = recommendations[0]
+    return StructuredRecommendationResponse(
+        user_profile_summary=(
+            f"{conversation.travel_period} {conversation.companion_type}와(과) 함께하는 "
+            f"{conversation.energy_preference or '기본'} {conversation.interest_focus or '기본'} 여행"
+        ),
+        top_recommendation=items[0],
+        alternative_recommendations=items[1:],
+        score_breakdown={**top["breakdown"], "total_score": top["score"]},
+        reasoning_explanation=f"'{top['festival'].title}'이(가) 조건 일치 점수 {top['score']}점으로 가장 높습니다 ({', '.join(top['reasons'])}).",
+        final_message="즐거운 호남 축제 여행 되세요!"
+    )
+
+def build_festival_data_str(recommendations: List[dict]) -> str:
+    """추천 후보 축제 → RAG 프롬프트의 축제 데이터 (한 줄에 한 축제)"""
+    return "\n".join([
+        f"제목: {rec['festival'].title}, 지역: {rec['festival'].region}, "
+        f"기간: {rec['festival'].start_date}~{rec['festival'].end_date}, "
+        f"위치: {rec['festival'].addr1}, 점수: {rec['score']}, "
+        f"이유: {', '.join(rec['reasons'])}"
+        for rec in recommendations
+    ])
+
+def build_user_preferences_str(conversation: Conversation) -> str:
+    """대화 세션 → RAG 프롬프트의 사용자 선호도 정보"""
+    return f"""
+            여행 시기: {conversation.travel_period}
+            동반자: {conversation.companion_type}
+            선호 분위기: {conversation.energy_preference or '기본'}
+            핵심 관심사: {conversation.interest_focus or '기본'}
+            추가 고려사항: {conversation.additional_requirements or '없음'}
+            """
+
+def fill_structured_defaults(data: dict, rule_based: StructuredRecommendationResponse) -> dict:
+    """LLM 응답에 빠진 필드를 규칙 기반 결과로 채움 (축제명이 같은 항목 우선)"""
+    defaults = rule_based.model_dump()
+    items_by_title = {item["title"]: item for item in [defaults["top_recommendation"], *defaults["alternative_recommendations"]]}
+    for item in [data.get("top_recommendation"), *(data.get("alternative_recommendations") or [])]:
+        if isinstance(item, dict):
+            fill_missing(item, items_by_title.get(item.get("title"), defaults["top_recommendation"]))
+    return fill_missing(data, defaults)
+
+async def generate_llm_recommendations(conversation: Conversation, db: Session) -> List[dict]:
     # TODO: 향후 대화 시나리오에 지역을 묻는 단계를 추가하고, DB에서 해당 값을 가져오도록 수정해야 합니다.
     # 현재는 예시로 '전라북도 부안군'을 하드코딩합니다.
     region_name = "전라북도"
@@ -109,7 +304,18 @@ async def generate_llm_recommendations(conversation: Conversation) -> List[Festi
     month = int(conversation.travel_period.replace("월", ""))
     event_start_date = f"{current_year}{month:02d}01"
 
-    festivals = get_festivals_by_name(region_name, sigungu_name, event_start_date)
+    # TourAPI 조회(동기 requests)는 이벤트 루프를 막지 않도록 스레드에서 실행하고,
+    # LLM 호출과 합쳐 LLM_TIMEOUT_SECONDS 예산 안에서 끝나게 함 (남은 시간만 LLM 마감으로 넘김)
+    budget_started = time.monotonic()
+    try:
+        festivals = await asyncio.wait_for(
+            asyncio.to_thread(get_festivals_by_name, region_name, sigungu_name, event_start_date),
+            timeout=llm_gateway.timeout_seconds,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(f"TourAPI 축제 조회가 {llm_gateway.timeout_seconds:.1f}초 안에 끝나지 않아 규칙 기반 추천으로 대체합니다.")
+        structured_output_stats["rule_based_fallbacks"] += 1
+        return generate_rule_based_recommendations(db, conversation)
     
     if festivals is None:
         raise HTTPException(status_code=503, detail="외부 축제 정보를 가져오는 데 실패했습니다. 잠시 후 다시 시도해주세요.")
@@ -127,50 +333,59 @@ async def generate_llm_recommendations(conversation: Conversation) -> List[Festi
         f"- 추가 요청사항: {conversation.additional_requirements}"
     )
     
-    result_json_str = rag_chain.run(context=context_str, user_preferences=user_preferences_str, festival_data=context_str)
+    cache_key = recommendation_cache.make_key(
+        RAG_PROMPT_VERSION,
+        profile={
+            "endpoint": "recommendations",
+            "travel_period": conversation.travel_period,
+            "companion_type": conversation.companion_type,
+            "has_pets": bool(conversation.has_pets),
+            "child_age_group": conversation.child_age_group,
+            "energy_preference": conversation.energy_preference,
+            "interest_focus": conversation.interest_focus,
+        },
+        candidates=[(f.get("contentid") or f["title"], f.get("modifiedtime")) for f in festivals],
+        free_text=conversation.additional_requirements,
+    )
+    cached_json_str = recommendation_cache.get(cache_key)
+    if cached_json_str is not None:
+        result_json_str = cached_json_str
+    else:
+        try:
+            rag_chain, _ = await get_rag_system()
+            remaining = llm_gateway.timeout_seconds - (time.monotonic() - budget_started)
+            result_json_str = await llm_gateway.stream_json(rag_chain, timeout=max(remaining, 0.1), context=context_str, user_preferences=user_preferences_str, festival_data=context_str)
+        except LLMUnavailableError as e:
+            logger.warning(f"{e} 규칙 기반 추천으로 대체합니다.")
+            structured_output_stats["rule_based_fallbacks"] += 1
+            return generate_rule_based_recommendations(db, conversation)
     
     try:
-        # PydanticOutputParser를 사용하여 구조화된 응답을 파싱합니다.
-        structured_recommendations = response_parser.parse(result_json_str)
-        
-        # 파싱된 데이터를 FestivalRecommendation 모델로 변환합니다.
-        recommendations = [FestivalRecommendation(**rec.dict()) for rec in structured_recommendations.recommendations]
-        
-        for rec in recommendations:
-            for fest in festivals:
-                if fest['title'] == rec.name:
-                    rec.image_url = fest['image']
-                    break
-        return recommendations
-        
-    except Exception as e:
-        logger.error(f"LLM 응답 파싱 실패: {e}")
+        # 구조화된 응답을 파싱하고, 형식이 어긋나면 모델 재호출 없이 로컬에서 복구합니다.
+        structured_recommendations, _ = parse_with_repair(result_json_str, StructuredRecommendationResponse)
+    except StructuredOutputError as e:
+        logger.error(f"LLM 응답 파싱 실패, 규칙 기반 추천으로 대체합니다: {e}")
         logger.error(f"원본 LLM 응답: {result_json_str}")
-        raise HTTPException(status_code=500, detail="추천 결과를 생성하는 데 실패했습니다.")
-
-# ==================== 대화 시나리오 정의 ====================
-CONVERSATION_SCENARIO = {
-    "initial": {
-        "message": "안녕하세요! {travel_period}에 {companion_type}와(과) 함께 떠나는 멋진 호남 여행을 계획하고 계시는군요! 😊\n\n이번 여행의 전체적인 분위기는 어떤 느낌을 선호하시나요?",
-        "options": ["A: 다양한 볼거리와 체험이 가득한 활기찬 분위기", "B: 아름다운 풍경을 보며 즐기는 여유롭고 고즈넉한 분위기"],
-        "next_phase": "energy_preference"
-    },
-    "energy_preference": {
-        "message": "좋은 선택이에요! ✨\n\n그렇다면 이번 여행에서 가장 만족하셨으면 하는 '핵심 경험'은 무엇일까요?",
-        "options": ["A: 눈이 즐거운 것 (아름다운 가을 꽃이나 단풍 구경)", "B: 입이 즐거운 것 (제철 식재료로 만든 건강한 남도 음식)", "C: 마음이 즐거운 것 (역사 유적지나 고즈넉한 사찰 탐방)"],
-        "next_phase": "interest_focus"
-    },
-    "interest_focus": {
-        "message": "역시 맛의 고장 호남 여행의 핵심은 음식이군요! 👍\n\n마지막으로 하나만 더 여쭤볼게요. 혹시 꼭 고려해야 할 점이 있을까요?\n\n예를 들어, '오래 걷는 것은 괜찮으신지' 혹은 '편하게 앉아서 쉴 공간이 많은 곳'이 좋은지 알려주시면, 정말 딱 맞는 곳으로 찾아 드릴게요!",
-        "options": None,
-        "next_phase": "additional_requirements"
-    },
-    "additional_requirements": {
-        "message": "알겠습니다! 모든 정보를 바탕으로 사용자님께 꼭 맞는 축제를 추천해 드릴게요! 잠시만 기다려주세요.",
-        "options": None,
-        "next_phase": "completed"
-    }
-}
+        structured_output_stats["rule_based_fallbacks"] += 1
+        return generate_rule_based_recommendations(db, conversation)
+    
+    if cached_json_str is None:
+        recommendation_cache.set(cache_key, structured_recommendations.model_dump_json())
+    
+    images = {fest['title']: fest['image'] for fest in festivals}
+    items = [structured_recommendations.top_recommendation, *structured_recommendations.alternative_recommendations]
+    return [
+        {
+            "rank": i + 1,
+            "name": item.title,
+            "location": item.location,
+            "description": f"기간: {item.start_date}~{item.end_date}",
+            "image_url": item.image or images.get(item.title) or "",
+            "reason": ", ".join(item.reasons),
+            "xai_explanation": item.why_recommended
+        }
+        for i, item in enumerate(items)
+    ]
 
 # ==================== API 엔드포인트 ====================
 
@@ -225,50 +440,50 @@ async def write_user_preference(pref_data: UserPreferenceCreate, current_user: U
 
 @app.post("/initialize", response_model=ChatResponse, tags=["Festival Recommendation"])
 async def initialize_conversation(init_data: ConversationInit, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)):
-    conversation = create_conversation(db, current_user.id, init_data)
+    conversation = create_conversation(db, current_user.id, init_data.model_dump())
     scenario = CONVERSATION_SCENARIO["initial"]
-    message = scenario["message"].format(travel_period=init_data.travel_period, companion_type=init_data.companion_type)
-    add_conversation_message(db, conversation.id, "assistant", message, 1)
-    return ChatResponse(session_id=conversation.session_id, message=message, turn_number=1, phase="initial", options=scenario["options"], is_final=False)
+    message = message_templates.scenario_message("initial", init_data.travel_period, init_data.companion_type)
+    return ChatResponse(session_id=conversation.session_id, message=message, turn_number=scenario_turn("initial"), phase="initial", options=scenario["options"], is_final=False)
 
 @app.post("/chat", response_model=ChatResponse, tags=["Festival Recommendation"])
 async def chat(chat_data: ConversationUpdate, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)):
     conversation = get_conversation_by_session_id(db, chat_data.session_id)
     if not conversation or conversation.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="유효하지 않은 세션 ID입니다.")
-    current_turn = len(get_conversation_messages(db, conversation.id)) + 1
-    add_conversation_message(db, conversation.id, "user", chat_data.user_response, current_turn)
+    # 대화 메시지는 저장하지 않으므로 턴 번호는 현재 단계에서 계산 (봇 질문 다음이 사용자 답변)
     current_phase = conversation.phase
+    current_turn = scenario_turn(current_phase) + 1
+    selected_option = chat_data.selected_option or ""
     scenario_step = CONVERSATION_SCENARIO.get(current_phase)
     if not scenario_step:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 대화 단계입니다.")
     update_data = {}
     if current_phase == "initial":
-        update_data["energy_preference"] = "활기찬" if "A" in chat_data.selected_option else "여유로운"
+        update_data["energy_preference"] = "활기찬" if "A" in selected_option else "여유로운"
     elif current_phase == "energy_preference":
-        update_data["interest_focus"] = "자연" if "A" in chat_data.selected_option else "음식" if "B" in chat_data.selected_option else "역사"
+        update_data["interest_focus"] = "자연" if "A" in selected_option else "음식" if "B" in selected_option else "역사"
     elif current_phase == "interest_focus":
         update_data["additional_requirements"] = chat_data.user_response
     next_phase = scenario_step["next_phase"]
     update_conversation_phase(db, conversation.id, next_phase, **update_data)
     next_scenario_step = CONVERSATION_SCENARIO[next_phase]
-    message = next_scenario_step["message"].format(companion_type=conversation.companion_type)
+    message = message_templates.scenario_message(next_phase, conversation.travel_period, conversation.companion_type)
     is_final = next_phase == "additional_requirements"
     if is_final:
         update_conversation_phase(db, conversation.id, "completed", status="completed")
-    add_conversation_message(db, conversation.id, "assistant", message, current_turn + 1)
     return ChatResponse(session_id=chat_data.session_id, message=message, turn_number=current_turn + 1, phase=next_phase, options=next_scenario_step["options"], is_final=is_final)
 
-@app.get("/recommendations/{session_id}", response_model=RecommendationResponse, tags=["Festival Recommendation"])
+@app.get("/recommendations/{session_id}", response_model=RecommendationResponse, tags=["Festival Recommendation"],
+         dependencies=[Depends(enforce_llm_rate_limit)])
 async def get_recommendations(session_id: str, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)):
     conversation = get_conversation_by_session_id(db, session_id)
     if not conversation or conversation.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="유효하지 않은 세션 ID입니다.")
     if conversation.phase != "completed":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="추천을 생성하기 위한 대화가 완료되지 않았습니다.")
-    recommendations = await generate_llm_recommendations(conversation)
+    recommendations = await generate_llm_recommendations(conversation, db)
     conversation_summary = f"{conversation.travel_period} {conversation.companion_type}와(과) 함께 떠나는 {conversation.energy_preference} {conversation.interest_focus} 여행"
-    return RecommendationResponse(recommendations=recommendations, conversation_summary=conversation_summary, total_turns=len(get_conversation_messages(db, conversation.id)))
+    return RecommendationResponse(recommendations=recommendations, conversation_summary=conversation_summary, total_turns=scenario_turn(conversation.phase))
 
 # ==================== 헬스체크 및 상태 확인 API ====================
 
@@ -284,6 +499,88 @@ async def health_check():
         version="1.0.0"
     )
 
+@app.get("/health/ready", tags=["Health Check"])
+async def readiness_check():
+    """
+    서브시스템별 준비 상태와 의존성 점검 결과 (필수 서비스 점검이 실패하면 503, 결과는 몇 초간 캐시)
+    """
+    body = await service_registry.check()
+    return JSONResponse(status_code=200 if body["ready"] else 503, content=body)
+
+@app.get("/metrics", tags=["Health Check"])
+async def metrics_endpoint(db: Session = Depends(get_db)):
+    """
+    Prometheus 텍스트 형식 지표 (METRICS_DIR 설정 시 모든 워커 합산)
+    """
+    extra = []
+    try:
+        phases = (
+            db.query(Conversation.phase, func.count(Conversation.id))
+            .filter(Conversation.status == "active")
+            .group_by(Conversation.phase)
+            .all()
+        )
+        extra.append(("namdo_active_conversations", "gauge", "진행 중인 대화 세션 수", ("phase",),
+                      [((phase or "unknown",), count) for phase, count in phases]))
+    except Exception as e:
+        # DB 장애 중에도 나머지 지표(풀·요청·LLM)는 수집되어야 하므로 이 시리즈만 뺌
+        logger.warning(f"활성 대화 집계 실패, namdo_active_conversations 생략: {e}")
+        db.rollback()
+    return Response(content=metrics.render(extra=extra),
+                    media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/health/llm", tags=["Health Check"])
+async def llm_health_check():
+    """
+    LLM 호출 게이트웨이 상태 (동시 실행 수, 대기열, 타임아웃 횟수, 지연 분위수)와 응답 파싱·복구 집계
+    """
+    return {"provider": LLM_PROVIDER, **llm_gateway.report(), "structured_output": structured_output_stats}
+
+# ==================== 관리자 프로파일링 API ====================
+
+def _profile_response(text: str, summary: dict, filename: str) -> PlainTextResponse:
+    """프로파일 결과를 파일로 내려받을 수 있게 (요약은 헤더로)"""
+    return PlainTextResponse(text, headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "X-Profile-Summary": json.dumps(summary),
+    })
+
+@app.get("/admin/profile/cpu", tags=["Admin"])
+async def profile_cpu(
+    seconds: float = Query(10, gt=0, le=PROFILE_MAX_SECONDS, description="샘플링 시간(초)"),
+    interval_ms: float = Query(10, ge=1, le=1000, description="샘플 간격(ms)"),
+    include_idle: bool = Query(False, description="대기 중인 스레드(이벤트 루프 select, threadpool 대기)도 포함"),
+    include_lines: bool = Query(False, description="프레임 이름에 줄 번호 포함"),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    이 요청을 받은 워커의 모든 스레드를 seconds 동안 샘플링해 collapsed stack 파일로 반환 (flamegraph.pl, speedscope)
+    """
+    try:
+        text, summary = await asyncio.to_thread(sample_cpu, seconds, interval_ms, include_idle, include_lines)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    logger.info(f"CPU 프로파일 완료 (요청자: {current_user.username}): {summary}")
+    return _profile_response(text, summary, f"cpu-{summary['pid']}-{int(time.time())}.collapsed")
+
+@app.get("/admin/profile/memory", tags=["Admin"])
+async def profile_memory(
+    seconds: float = Query(10, gt=0, le=PROFILE_MAX_SECONDS, description="추적 시간(초)"),
+    top: int = Query(30, ge=1, le=500, description="증가량 상위 항목 수"),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    nframes: int = Query(10, ge=1, le=50, description="group_by=traceback일 때 기록할 스택 깊이"),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    이 요청을 받은 워커에서 seconds 동안 tracemalloc을 켜고 시작·끝 스냅샷의 할당 증가량을 비교
+    """
+    try:
+        text, summary = await asyncio.to_thread(memory_diff, seconds, top, group_by, nframes)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    logger.info(f"메모리 프로파일 완료 (요청자: {current_user.username}): {summary}")
+    return _profile_response(text, summary, f"memory-{summary['pid']}-{int(time.time())}.txt")
+
 @app.get("/", tags=["Root"])
 async def root():
     """
@@ -302,15 +599,17 @@ class FestivalSearchRequest(BaseModel):
     region_name: str
     sigungu_name: Optional[str] = None
     event_start_date: str # "YYYYMMDD" 형식
+    cursor: Optional[str] = None
+    limit: int = Field(50, ge=1, le=MAX_PAGE_SIZE)
 
-@app.post("/api/festivals/search", tags=["Development & Test"])
-async def search_festivals_directly(req: FestivalSearchRequest):
-    """
-    TourAPI 연동 테스트를 위해 지역명과 날짜로 축제 목록을 직접 조회합니다.
-    (로그인 필요 없음)
-    """
+def _search_tour_festivals(req: FestivalSearchRequest) -> TourFestivalSearchResponse:
     logger.info(f"단순 검색 요청: {req.region_name} {req.sigungu_name or ''}, 시작일: {req.event_start_date}")
     
+    try:
+        offset = int(decode_cursor(req.cursor)["offset"]) if req.cursor else 0
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 커서입니다.")
+    
     festivals = get_festivals_by_name(
         region_name=req.region_name,
         sigungu_name=req.sigungu_name,
@@ -321,9 +620,48 @@ async def search_festivals_directly(req: FestivalSearchRequest):
         raise HTTPException(status_code=503, detail="TourAPI 호출에 실패했습니다. .env 파일의 TOUR_API_KEY 또는 네트워크를 확인하세요.")
     
     if not festivals:
-        return {"message": "해당 조건에 맞는 축제가 없습니다.", "festivals": []}
-        
-    return {"message": f"총 {len(festivals)}개의 축제를 찾았습니다.", "festivals": festivals}
+        return TourFestivalSearchResponse(message="해당 조건에 맞는 축제가 없습니다.", festivals=[])
+    
+    page = festivals[offset:offset + req.limit]
+    next_offset = offset + len(page)
+    return TourFestivalSearchResponse(
+        message=f"총 {len(festivals)}개의 축제를 찾았습니다.",
+        festivals=page,
+        next_cursor=encode_cursor({"offset": next_offset}) if next_offset < len(festivals) else None
+    )
+
+@app.post("/api/festivals/search", response_model=TourFestivalSearchResponse, tags=["Development & Test"])
+async def search_festivals_directly(req: FestivalSearchRequest):
+    """
+    TourAPI 연동 테스트를 위해 지역명과 날짜로 축제 목록을 직접 조회합니다.
+    (로그인 필요 없음, 응답은 limit개씩 next_cursor로 이어서 조회)
+    """
+    return _search_tour_festivals(req)
+
+@app.get("/api/festivals/search", response_model=TourFestivalSearchResponse, tags=["Development & Test"])
+async def search_festivals_directly_get(
+    request: Request,
+    region_name: str,
+    event_start_date: str,
+    sigungu_name: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE)
+):
+    """
+    POST /api/festivals/search의 조건부 GET 버전 (본문 해시 ETag, If-None-Match 일치 시 304)
+    """
+    result = _search_tour_festivals(FestivalSearchRequest(
+        region_name=region_name,
+        sigungu_name=sigungu_name,
+        event_start_date=event_start_date,
+        cursor=cursor,
+        limit=limit
+    ))
+    body = result.model_dump_json().encode("utf-8")
+    headers = cache_headers(make_etag(body), max_age=FESTIVAL_CACHE_MAX_AGE, private=False)
+    if is_not_modified(request, headers["ETag"]):
+        return not_modified_response(headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 # 축제 관련 API 엔드포인트들
 @app.post("/festivals/collect", response_model=dict)
@@ -345,36 +683,165 @@ async def collect_festival_data(
             detail=f"축제 데이터 수집 실패: {str(e)}"
         )
 
-@app.get("/festivals/search")
+@app.get("/festivals/search", response_model=FestivalSearchResponse)
 async def search_festivals(
+    request: Request,
+    response: Response,
     region: Optional[str] = None,
     period: Optional[str] = None,
     festival_type: Optional[str] = None,
     has_pet_info: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: UserInfo = Depends(get_current_active_user)
 ):
-    """축제 검색"""
+    """축제 검색 (limit개씩, 다음 페이지는 next_cursor로 조회)"""
+    try:
+        # 커서: 마지막 행의 정렬 키(start_date, contentid)와 첫 페이지에서 센 전체 건수
+        position = decode_cursor(cursor) if cursor else None
+        after = (position["d"], str(position["c"])) if position else None
+        total_count, total_count_exact = (int(position["n"]), bool(position["e"])) if position else (None, True)
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 커서입니다.")
+    
+    # 데이터셋 버전 + 검색 조건으로 ETag 계산 → 변경이 없으면 DB 조회 없이 304
+    version, last_modified = dataset_versions.current(db)
+    etag = make_etag("festivals/search", version, region, period, festival_type, has_pet_info, cursor, limit)
+    headers = cache_headers(etag, last_modified, max_age=FESTIVAL_CACHE_MAX_AGE)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(headers)
+    response.headers.update(headers)
+    
     try:
-        festivals = festival_service.search_festivals(
-            db, region, period, festival_type, has_pet_info
+        # 한 건 더 조회해서 다음 페이지 존재 여부 판단
+        festivals = crud_search_festivals(
+            db, region, period, festival_type, has_pet_info, limit=limit + 1, after=after
+        )
+        has_more = len(festivals) > limit
+        festivals = festivals[:limit]
+        if total_count is None:
+            # 건수는 첫 페이지에서만 세고 이후 페이지는 커서로 전달
+            total_count, total_count_exact = count_festivals(
+                db, region, period, festival_type, has_pet_info, cap=FESTIVAL_COUNT_CAP
+            )
+        next_cursor = None
+        if has_more:
+            last = festivals[-1]
+            next_cursor = encode_cursor({
+                "d": last.start_date, "c": last.contentid, "n": total_count, "e": total_count_exact
+            })
+        return FestivalSearchResponse(
+            festivals=[
+                FestivalSearchItem(
+                    contentid=f.contentid,
+                    title=f.title,
+                    region=f.region,
+                    addr1=f.addr1,
+                    start_date=f.start_date,
+                    end_date=f.end_date,
+                    image=f.image,
+                    progresstype=f.progresstype,
+                    festivaltype=f.festivaltype,
+                    tel=f.tel
+                )
+                for f in festivals
+            ],
+            total_count=total_count,
+            total_count_exact=total_count_exact,
+            next_cursor=next_cursor,
+            filters=FestivalSearchFilters(
+                region=region,
+                period=period,
+                festival_type=festival_type,
+                has_pet_info=has_pet_info
+            )
         )
-        return {
-            "festivals": festivals,
-            "total_count": len(festivals),
-            "filters": {
-                "region": region,
-                "period": period,
-                "festival_type": festival_type,
-                "has_pet_info": has_pet_info
-            }
-        }
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"축제 검색 실패: {str(e)}"
         )
 
+@app.get("/festivals/search/text", response_model=FestivalTextSearchResponse)
+async def search_festivals_by_keyword(
+    q: str = Query(..., min_length=1, max_length=100),
+    region: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    current_user: UserInfo = Depends(get_current_active_user)
+):
+    """축제 키워드 검색 (제목·주소·개요 n-gram 색인, 순위·하이라이트 포함)"""
+    started = time.perf_counter()
+    festival_search_index.ensure(db)
+    hits, total_count = festival_search_index.search(q, limit=limit, region=region)
+    return FestivalTextSearchResponse(
+        query=q,
+        results=[
+            FestivalTextSearchHit(
+                contentid=hit.festival.contentid,
+                title=hit.festival.title,
+                region=hit.festival.region,
+                addr1=hit.festival.addr1,
+                start_date=hit.festival.start_date,
+                end_date=hit.festival.end_date,
+                image=hit.festival.image,
+                score=hit.score,
+                highlights=hit.highlights
+            )
+            for hit in hits
+        ],
+        total_count=total_count,
+        took_ms=round((time.perf_counter() - started) * 1000, 2)
+    )
+
+@app.get("/festivals/nearby", response_model=FestivalNearbyResponse)
+async def get_nearby_festivals(
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    near: Optional[str] = Query(None, max_length=50),
+    radius_km: float = Query(30, gt=0, le=300),
+    date_from: Optional[str] = Query(None, pattern=r"^\d{8}$"),
+    date_to: Optional[str] = Query(None, pattern=r"^\d{8}$"),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    current_user: UserInfo = Depends(get_current_active_user)
+):
+    """좌표(lat, lng) 또는 지명(near) 기준 반경 radius_km 안에서 기간(date_from~date_to, YYYYMMDD)이 겹치는 축제 (가까운 순)"""
+    festival_geo_index.ensure(db)
+    if lat is None or lng is None:
+        center = festival_geo_index.resolve_place(near) if near else None
+        if center is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="lat/lng 좌표 또는 축제 주소에 있는 지명(near)을 입력해주세요."
+            )
+        lat, lng = center
+    
+    results = festival_geo_index.nearby(lat, lng, radius_km, date_from, date_to)
+    return FestivalNearbyResponse(
+        lat=lat,
+        lng=lng,
+        radius_km=radius_km,
+        festivals=[
+            FestivalNearbyItem(
+                contentid=f.contentid,
+                title=f.title,
+                region=f.region,
+                addr1=f.addr1,
+                start_date=f.start_date,
+                end_date=f.end_date,
+                image=f.image,
+                progresstype=f.progresstype,
+                festivaltype=f.festivaltype,
+                tel=f.tel,
+                distance_km=round(distance, 2)
+            )
+            for f, distance in results[:limit]
+        ],
+        total_count=len(results)
+    )
+
 @app.post("/festivals/recommend", response_model=FestivalRecommendationResponse)
 async def recommend_festivals(
     request: FestivalRecommendationRequest,
@@ -389,7 +856,9 @@ async def recommend_festivals(
             request.companion_type,
             request.atmosphere,
             request.core_experience,
-            request.additional_considerations
+            request.additional_considerations,
+            origin=(request.origin_lat, request.origin_lng)
+            if request.origin_lat is not None and request.origin_lng is not None else None
         )
         
         # 응답 형식 변환
@@ -435,55 +904,10 @@ async def bot_greeting(
         }
         conversation = create_conversation(db, current_user.id, session_data)
         
-        # 계절별 특징 매핑
-        season_features = {
-            "3월": "봄꽃이 피어나고 따뜻한 봄바람이 부는",
-            "4월": "벚꽃이 만발하고 새싹이 돋아나는",
-            "5월": "푸른 잎이 무성하고 산들바람이 부는",
-            "6월": "초록이 짙어지고 여름의 문턱에 선",
-            "7월": "푸른 여름이 한창이고 맑은 하늘이 펼쳐진",
-            "8월": "한여름의 열기가 가득하고 푸른 자연이 아름다운",
-            "9월": "가을의 문턱에 서서 선선한 바람이 부는",
-            "10월": "가을 단풍이 절정에 달하고 하늘이 높아진",
-            "11월": "단풍이 물들고 서늘한 가을 정취가 가득한",
-            "12월": "겨울의 문턱에 서서 차가운 바람이 부는"
-        }
-        
-        # 동반자별 특징 매핑
-        companion_features = {
-            "혼자": "자유롭고 독립적인",
-            "연인": "로맨틱하고 특별한",
-            "친구": "즐겁고 활기찬",
-            "아이 동반 가족": "아이들과 함께하는 즐거운",
-            "부모님 동반 가족": "부모님과 함께하는 의미있는"
-        }
-        
-        season_feature = season_features.get(request.travel_period, "아름다운")
-        companion_feature = companion_features.get(request.companion_type, "특별한")
-        
-        # 시작말 생성
-        greeting_message = f"""안녕하세요! {request.travel_period}에 {request.companion_type}와(과) 함께하는 호남 여행을 계획하고 계시는군요! 😊
-
-{season_feature} 시기 저희 호남은 {companion_feature} 여행을 위한 최고의 장소랍니다. 
-
-소중한 분과 함께하는 여행을 계획하는 그 마음, 저도 잘 알기에 진심으로 응원하게 되네요. 
-
-수많은 축제 정보 속에서 길을 잃지 않도록, 제가 여러분의 스타일에 꼭 맞는 '인생 축제'를 찾아 평생 기억에 남을 추억을 설계해 드릴게요.
-
-가장 완벽한 추천을 위해, 먼저 여러분이 꿈꾸시는 여행의 전반적인 분위기를 함께 그려보고 싶어요. 어떤 그림에 더 마음이 끌리시나요?"""
-
-        # 첫 번째 질문과 선택지
-        next_question = "여행의 전체적인 분위기를 선택해주세요:"
-        choices = [
-            "활기찬 체험형 여행 - 다양한 볼거리와 흥미진진한 프로그램들",
-            "여유로운 감상형 여행 - 아름다운 풍경을 배경으로 한 고즈넉한 축제"
-        ]
-        
-        return BotGreetingResponse(
-            greeting_message=greeting_message,
-            next_question=next_question,
-            choices=choices,
-            session_id=conversation.session_id
+        # 미리 직렬화된 시작말 응답 본문에 session_id만 덧붙임 (BotGreetingResponse 형식)
+        return Response(
+            content=message_templates.greeting_body(request.travel_period, request.companion_type, conversation.session_id),
+            media_type="application/json"
         )
         
     except Exception as e:
@@ -558,7 +982,7 @@ async def update_conversation_status(
     }
 
 # XAI 마무리 API
-@app.post("/bot/finalize", response_model=XAIFinalizeResponse)
+@app.post("/bot/finalize", response_model=XAIFinalizeResponse, dependencies=[Depends(enforce_llm_rate_limit)])
 async def finalize_conversation_with_xai(
     request: XAIFinalizeRequest,
     db: Session = Depends(get_db),
@@ -638,165 +1062,135 @@ async def finalize_conversation_with_xai(
                 timestamp=datetime.now().isoformat()
             )
         
+        # 규칙 기반 응답을 먼저 만들어 두고, LLM 설명이 실패하거나 복구 불가능하면 그대로 사용 (LLM 재호출 없음)
+        rule_based_response = build_rule_based_structured_response(conversation, recommendations)
+        structured_response = rule_based_response
+        
         # LangChain RAG를 사용하여 구조화된 응답 생성
+        rag_chain, response_parser = await get_rag_system()
         if rag_chain and response_parser:
+            festival_data_str = build_festival_data_str(recommendations)
+            user_preferences_str = build_user_preferences_str(conversation)
+            
+            # 컨텍스트 정보
+            context_str = f"호남 지역 축제 추천 시스템 - {len(recommendations)}개 축제 중 최적의 선택"
+            
+            # 동일 프로필·동일 후보 축제면 캐시된 LLM 응답을 사용 (ClovaX 호출 생략)
+            candidate_ids = [rec['festival'].contentid for rec in recommendations]
+            modifiedtimes = get_festival_modifiedtimes(db, candidate_ids)
+            cache_key = recommendation_cache.make_key(
+                RAG_PROMPT_VERSION,
+                profile={
+                    "endpoint": "finalize",
+                    "travel_period": conversation.travel_period,
+                    "companion_type": conversation.companion_type,
+                    "energy_preference": conversation.energy_preference,
+                    "interest_focus": conversation.interest_focus,
+                },
+                candidates=[(cid, modifiedtimes.get(cid)) for cid in candidate_ids],
+                free_text=conversation.additional_requirements,
+            )
+            cached_response = recommendation_cache.get(cache_key)
             try:
-                # 축제 데이터를 문자열로 변환
-                festival_data_str = "\n".join([
-                    f"제목: {rec['festival'].title}, 지역: {rec['festival'].region}, "
-                    f"기간: {rec['festival'].start_date}~{rec['festival'].end_date}, "
-                    f"위치: {rec['festival'].addr1}, 점수: {rec['score']}, "
-                    f"이유: {', '.join(rec['reasons'])}"
-                    for rec in recommendations
-                ])
+                if cached_response is not None:
+                    llm_response = cached_response
+                else:
+                    # LangChain RAG 실행 (JSON 객체가 닫히면 스트림을 끊고, 마감 시간 초과 시 LLMUnavailableError)
+                    llm_response = await llm_gateway.stream_json(
+                        rag_chain,
+                        context=context_str,
+                        user_preferences=user_preferences_str,
+                        festival_data=festival_data_str
+                    )
                 
-                # 사용자 선호도 정보
-                user_preferences_str = f"""
-                여행 시기: {conversation.travel_period}
-                동반자: {conversation.companion_type}
-                선호 분위기: {conversation.energy_preference or '기본'}
-                핵심 관심사: {conversation.interest_focus or '기본'}
-                추가 고려사항: {conversation.additional_requirements or '없음'}
-                """
-                
-                # 컨텍스트 정보
-                context_str = f"호남 지역 축제 추천 시스템 - {len(recommendations)}개 축제 중 최적의 선택"
-                
-                # LangChain RAG 실행
-                llm_response = rag_chain.run(
-                    context=context_str,
-                    user_preferences=user_preferences_str,
-                    festival_data=festival_data_str
-                )
-                
-                # PydanticOutputParser로 파싱
-                structured_response = response_parser.parse(llm_response)
-                
-                # 파싱된 응답을 XAIFinalizeResponse로 변환
-                return XAIFinalizeResponse(
-                    session_id=request.session_id,
-                    user_profile={
-                        "travel_period": conversation.travel_period,
-                        "companion_type": conversation.companion_type,
-                        "energy_preference": conversation.energy_preference or "기본",
-                        "interest_focus": conversation.interest_focus or "기본",
-                        "additional_requirements": conversation.additional_requirements or "없음"
-                    },
-                    recommendation_summary={
-                        "total_count": len(recommendations),
-                        "message": structured_response.user_profile_summary,
-                        "score_range": {
-                            "highest": max(rec["score"] for rec in recommendations),
-                            "lowest": min(rec["score"] for rec in recommendations)
-                        }
-                    },
-                    top_recommendation=TopRecommendation(
-                        title=structured_response.top_recommendation.title,
-                        region=structured_response.top_recommendation.region,
-                        start_date=structured_response.top_recommendation.start_date,
-                        end_date=structured_response.top_recommendation.end_date,
-                        location=structured_response.top_recommendation.location,
-                        score=structured_response.top_recommendation.score,
-                        reasons=structured_response.top_recommendation.reasons,
-                        why_best=structured_response.top_recommendation.why_recommended,
-                        image=structured_response.top_recommendation.image,
-                        tel=structured_response.top_recommendation.tel
-                    ),
-                    alternative_recommendations=[
-                        AlternativeRecommendation(
-                            rank=i+2,
-                            title=alt.title,
-                            region=alt.region,
-                            start_date=alt.start_date,
-                            end_date=alt.end_date,
-                            location=alt.location,
-                            score=alt.score,
-                            reasons=alt.reasons,
-                            why_alternative=alt.why_recommended,
-                            image=alt.image,
-                            tel=alt.tel
-                        )
-                        for i, alt in enumerate(structured_response.alternative_recommendations)
-                    ],
-                    score_breakdown=ScoreBreakdown(
-                        region_compatibility=structured_response.score_breakdown.get("region_compatibility", 0),
-                        season_matching=structured_response.score_breakdown.get("season_matching", 0),
-                        companion_optimization=structured_response.score_breakdown.get("companion_optimization", 0),
-                        interest_matching=structured_response.score_breakdown.get("interest_matching", 0),
-                        accessibility_consideration=structured_response.score_breakdown.get("accessibility_consideration", 0),
-                        total_score=structured_response.score_breakdown.get("total_score", 0)
-                    ),
-                    recommendation_criteria=RecommendationCriteria(
-                        region_priority="호남 지역 (전북, 전남, 광주)",
-                        season_focus=conversation.travel_period,
-                        companion_type=conversation.companion_type,
-                        interest_focus=conversation.interest_focus or "기본",
-                        accessibility_focus=conversation.additional_requirements or "기본"
-                    ),
-                    reasoning_summary={
-                        "message": structured_response.reasoning_explanation,
-                        "suggestions": [
-                            "추천된 축제의 상세 정보를 확인해보세요",
-                            "2순위 이하 축제도 고려해보세요",
-                            "추가 질문이 있으면 언제든 물어보세요"
-                        ]
-                    },
-                    timestamp=datetime.now().isoformat()
+                # 파싱 실패 시 코드 펜스·후행 텍스트·누락 필드를 로컬에서 복구
+                structured_response, _ = parse_with_repair(
+                    llm_response,
+                    StructuredRecommendationResponse,
+                    fill=lambda data: fill_structured_defaults(data, rule_based_response)
                 )
-                
-            except Exception as e:
-                logger.error(f"LangChain RAG 처리 실패: {e}")
-                # RAG 실패 시 기존 로직으로 fallback
-                pass
+                if cached_response is None:
+                    recommendation_cache.set(cache_key, structured_response.model_dump_json())
+            except (LLMUnavailableError, StructuredOutputError) as e:
+                logger.error(f"LangChain RAG 처리 실패, 규칙 기반 응답을 사용합니다: {e}")
+                structured_output_stats["rule_based_fallbacks"] += 1
+        else:
+            structured_output_stats["rule_based_fallbacks"] += 1
         
-        # 기존 로직 (fallback)
-        # 추천이 없는 경우 기본 응답
+        # 구조화된 응답을 XAIFinalizeResponse로 변환
         return XAIFinalizeResponse(
             session_id=request.session_id,
             user_profile={
                 "travel_period": conversation.travel_period,
                 "companion_type": conversation.companion_type,
-                "energy_preference": conversation.energy_preference or "미정",
-                "interest_focus": conversation.interest_focus or "미정",
+                "energy_preference": conversation.energy_preference or "기본",
+                "interest_focus": conversation.interest_focus or "기본",
                 "additional_requirements": conversation.additional_requirements or "없음"
             },
             recommendation_summary={
-                "total_count": 0,
-                "message": "추천할 축제를 찾을 수 없습니다."
+                "total_count": len(recommendations),
+                "message": structured_response.user_profile_summary,
+                "score_range": {
+                    "highest": max(rec["score"] for rec in recommendations),
+                    "lowest": min(rec["score"] for rec in recommendations)
+                }
             },
             top_recommendation=TopRecommendation(
-                title="",
-                region="",
-                start_date="",
-                end_date="",
-                location="",
-                score=0,
-                reasons=[],
-                why_best=""
+                title=structured_response.top_recommendation.title,
+                region=structured_response.top_recommendation.region,
+                start_date=structured_response.top_recommendation.start_date,
+                end_date=structured_response.top_recommendation.end_date,
+                location=structured_response.top_recommendation.location,
+                score=structured_response.top_recommendation.score,
+                reasons=structured_response.top_recommendation.reasons,
+                why_best=structured_response.top_recommendation.why_recommended,
+                image=structured_response.top_recommendation.image,
+                tel=structured_response.top_recommendation.tel
             ),
-            alternative_recommendations=[],
+            alternative_recommendations=[
+                AlternativeRecommendation(
+                    rank=i+2,
+                    title=alt.title,
+                    region=alt.region,
+                    start_date=alt.start_date,
+                    end_date=alt.end_date,
+                    location=alt.location,
+                    score=alt.score,
+                    reasons=alt.reasons,
+                    why_alternative=alt.why_recommended,
+                    image=alt.image,
+                    tel=alt.tel
+                )
+                for i, alt in enumerate(structured_response.alternative_recommendations)
+            ],
             score_breakdown=ScoreBreakdown(
-                region_compatibility=0,
-                season_matching=0,
-                companion_optimization=0,
-                interest_matching=0,
-                accessibility_consideration=0,
-                total_score=0
+                region_compatibility=structured_response.score_breakdown.get("region_compatibility", 0),
+                season_matching=structured_response.score_breakdown.get("season_matching", 0),
+                companion_optimization=structured_response.score_breakdown.get("companion_optimization", 0),
+                interest_matching=structured_response.score_breakdown.get("interest_matching", 0),
+                accessibility_consideration=structured_response.score_breakdown.get("accessibility_consideration", 0),
+                total_score=structured_response.score_breakdown.get("total_score", 0)
             ),
             recommendation_criteria=RecommendationCriteria(
-                region_priority="호남 지역",
+                region_priority="호남 지역 (전북, 전남, 광주)",
                 season_focus=conversation.travel_period,
                 companion_type=conversation.companion_type,
                 interest_focus=conversation.interest_focus or "기본",
                 accessibility_focus=conversation.additional_requirements or "기본"
             ),
             reasoning_summary={
-                "message": "더 구체적인 정보를 제공해주시면 정확한 추천이 가능합니다.",
-                "suggestions": ["여행 분위기를 선택해주세요", "핵심 관심사를 선택해주세요", "추가 고려사항을 입력해주세요"]
+                "message": structured_response.reasoning_explanation,
+                "suggestions": [
+                    "추천된 축제의 상세 정보를 확인해보세요",
+                    "2순위 이하 축제도 고려해보세요",
+                    "추가 질문이 있으면 언제든 물어보세요"
+                ]
             },
             timestamp=datetime.now().isoformat()
         )
         
+    except (HTTPException, LLMOverloadedError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -807,12 +1201,14 @@ async def finalize_conversation_with_xai(
 @app.on_event("startup")
 async def startup_event():
     logger.info("🚀 남도봇 축제 추천 시스템 시작 중...")
-    try:
-        create_tables()
-        logger.info("✅ 데이터베이스 테이블 생성 완료")
+    # 워커별 지표 스냅샷 기록 (METRICS_DIR 설정 시, 시작 단계 실패와 무관하게)
+    metrics.start_flusher()
+    # 테이블 생성은 database 초기화에 포함되므로 WARMUP_SERVICES와 무관하게 항상 먼저 워밍업
+    await service_registry.warm_up(["database", *[name for name in WARMUP_SERVICES if name != "database"]])
+    if service_registry.is_ready():
         logger.info("🎉 시스템 시작 완료! API 문서: http://127.0.0.1:8000/docs")
-    except Exception as e:
-        logger.error(f"❌ 시스템 시작 실패: {e}")
+    else:
+        logger.error("❌ 시스템 시작 실패: 필수 서비스가 준비되지 않았습니다. /health/ready 점검 시 다시 초기화합니다.")
 
 # ==================== 메인 실행 ====================
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 # schemas/models.py (Pydantic API models)
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -110,8 +110,8 @@ class FestivalDetail(BaseModel):
     firstimage2: str
     addr1: str
     addr2: str
-    mapx: str
-    mapy: str
+    mapx: Optional[float] = None
+    mapy: Optional[float] = None
     mlevel: str
     overview: str
 
@@ -146,6 +146,8 @@ class FestivalRecommendationRequest(BaseModel):
     atmosphere: str
     core_experience: str
     additional_considerations: str
+    origin_lat: Optional[float] = Field(None, ge=-90, le=90)  # 출발지 좌표 (있으면 거리 점수 반영)
+    origin_lng: Optional[float] = Field(None, ge=-180, le=180)
 
 # 축제 추천 응답 모델
 class FestivalRecommendation(BaseModel):
@@ -165,6 +167,70 @@ class FestivalRecommendationResponse(BaseModel):
     total_count: int
     reasoning: str
 
+# 축제 검색 응답 모델 (커서 페이지네이션)
+class FestivalSearchItem(BaseModel):
+    contentid: str
+    title: str
+    region: Optional[str] = None
+    addr1: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    image: Optional[str] = None
+    progresstype: Optional[str] = None
+    festivaltype: Optional[str] = None
+    tel: Optional[str] = None
+
+class FestivalSearchFilters(BaseModel):
+    region: Optional[str] = None
+    period: Optional[str] = None
+    festival_type: Optional[str] = None
+    has_pet_info: bool = False
+
+class FestivalSearchResponse(BaseModel):
+    festivals: List[FestivalSearchItem]
+    total_count: int
+    total_count_exact: bool = True  # False면 total_count는 FESTIVAL_COUNT_CAP에서 잘린 하한값
+    next_cursor: Optional[str] = None
+    filters: FestivalSearchFilters
+
+# 축제 키워드 검색 응답 모델
+class FestivalTextSearchHit(FestivalSearchItem):
+    score: float
+    highlights: Dict[str, str] = {}  # title / addr1 / overview 중 일치 구간을 <em>으로 감싼 HTML
+
+class FestivalTextSearchResponse(BaseModel):
+    query: str
+    results: List[FestivalTextSearchHit]
+    total_count: int
+    took_ms: float
+
+# 주변 축제 조회 응답 모델
+class FestivalNearbyItem(FestivalSearchItem):
+    distance_km: float
+
+class FestivalNearbyResponse(BaseModel):
+    lat: float
+    lng: float
+    radius_km: float
+    festivals: List[FestivalNearbyItem]
+    total_count: int
+
+# TourAPI 직접 조회 응답 모델
+class TourFestivalItem(BaseModel):
+    contentid: Optional[str] = None
+    modifiedtime: Optional[str] = None
+    title: Optional[str] = None
+    addr1: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    image: Optional[str] = None
+    tel: Optional[str] = None
+
+class TourFestivalSearchResponse(BaseModel):
+    message: str
+    festivals: List[TourFestivalItem]
+    next_cursor: Optional[str] = None
+
 # 봇 시작말 요청/응답 모델
 class BotGreetingRequest(BaseModel):
     travel_period: str
@@ -180,16 +246,6 @@ class BotGreetingResponse(BaseModel):
 class XAIFinalizeRequest(BaseModel):
     session_id: str
 
-class XAIFinalizeResponse(BaseModel):
-    session_id: str
-    user_profile_summary: str
-    recommendation_summary: str
-    top_recommendation: dict
-    alternative_recommendations: List[dict]
-    reasoning_explanation: str
-    final_message: str
-    timestamp: str
-
 # LangChain PydanticOutputParser용 모델들
 class FestivalRecommendationItem(BaseModel):
     title: str
@@ -243,6 +299,17 @@ class RecommendationCriteria(BaseModel):
     interest_focus: str
     accessibility_focus: str
 
+class XAIFinalizeResponse(BaseModel):
+    session_id: str
+    user_profile: dict
+    recommendation_summary: dict
+    top_recommendation: TopRecommendation
+    alternative_recommendations: List[AlternativeRecommendation]
+    score_breakdown: ScoreBreakdown
+    recommendation_criteria: RecommendationCriteria
+    reasoning_summary: dict
+    timestamp: str
+
 class StructuredRecommendationResponse(BaseModel):
     user_profile_summary: str
     top_recommendation: FestivalRecommendationItem
@@ -3,6 +3,8 @@
 # Or: cd backend/actual && python scripts/honam_festivals_to_csv.py
 
 import csv
+import logging
+import os
 import sys
 from datetime import datetime
 import requests
@@ -10,7 +12,6 @@ import json
 
 # Allow running as script: cd backend/actual && python scripts/honam_festivals_to_csv.py
 if __name__ == "__main__" and __package__ is None:
-    import os
     _root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     sys.path.insert(0, _root)
 
@@ -20,6 +21,9 @@ from services.tour_api import (
     _fetch_and_find_codes,
     TlsAdapter,
 )
+from core.structured_logging import configure_logging
+
+logger = logging.getLogger(__name__)
 
 
 def fetch_all_festivals(area_code, sigungu_code, event_start_date):
@@ -68,7 +72,7 @@ def get_festivals_by_name(region_name: str, sigungu_name: str, event_start_date:
 
         codes = _fetch_and_find_codes(session, region_name, sigungu_name)
         if not codes:
-            print(f"❌ [오류] '{region_name}' 지역 코드 변환 실패")
+            logger.warning("'%s' 지역 코드 변환 실패", region_name)
             return []
 
         area_code, sigungu_code = codes
@@ -87,7 +91,7 @@ def get_festivals_by_name(region_name: str, sigungu_name: str, event_start_date:
             for item in items
         ]
     except (requests.RequestException, json.JSONDecodeError) as e:
-        print(f"❌ [오류] 축제 조회 실패: {e}")
+        logger.warning("축제 조회 실패: %s", e)
         return []
 
 
@@ -110,7 +114,7 @@ def get_all_honam_festivals():
 def save_to_csv(festivals, filename="honam_festivals.csv"):
     """축제 데이터를 CSV로 저장"""
     if not festivals:
-        print("⚠️ 저장할 축제 데이터가 없습니다.")
+        logger.warning("저장할 축제 데이터가 없습니다.")
         return
 
     keys = ["region", "title", "addr1", "start_date", "end_date", "tel", "image"]
@@ -119,9 +123,10 @@ def save_to_csv(festivals, filename="honam_festivals.csv"):
         writer.writeheader()
         writer.writerows(festivals)
 
-    print(f"✅ {filename} 파일로 저장 완료! (총 {len(festivals)}건)")
+    logger.info("%s 파일로 저장 완료 (총 %d건)", filename, len(festivals))
 
 
 if __name__ == "__main__":
+    configure_logging(fmt=os.getenv("LOG_FORMAT", "text"))
     results = get_all_honam_festivals()
     save_to_csv(results)
@@ -0,0 +1,164 @@
+# festival_geo_index.py
+# 축제 좌표 격자 색인 (주변 축제 조회·추천 거리 점수용)
+#
+# 위경도를 GEO_CELL_DEGREES 크기의 격자 칸으로 나눠 칸 → 축제 목록을 들고 있고,
+# 반경 R km 질의는 경계 상자에 걸치는 칸의 축제만 거리 계산 → 전체 스캔 없음
+# 색인은 데이터셋 버전(core.dataset_version)이 바뀌면 다음 조회 시 다시 만든다
+
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from core.database import Festival, FestivalDetail
+from core.dataset_version import dataset_versions
+
+load_dotenv()
+
+GEO_CELL_DEGREES = float(os.getenv("GEO_CELL_DEGREES", "0.1"))  # 약 11km
+
+EARTH_RADIUS_KM = 6371.0088
+_KM_PER_DEGREE_LAT = 111.32
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def overlaps(start_date: Optional[str], end_date: Optional[str],
+             date_from: Optional[str], date_to: Optional[str]) -> bool:
+    """축제 기간이 [date_from, date_to]와 겹치는지 (YYYYMMDD 문자열, 빈 경계는 열린 구간)"""
+    start = start_date or end_date
+    end = end_date or start_date
+    if date_to and start and start > date_to:
+        return False
+    if date_from and end and end < date_from:
+        return False
+    return True
+
+
+@dataclass
+class GeoFestival:
+    contentid: str
+    title: str
+    addr1: Optional[str]
+    region: Optional[str]
+    start_date: Optional[str]
+    end_date: Optional[str]
+    image: Optional[str]
+    progresstype: Optional[str]
+    festivaltype: Optional[str]
+    tel: Optional[str]
+    lat: float
+    lng: float
+
+
+class FestivalGeoIndex:
+    def __init__(self, cell_degrees: float = 0.1):
+        self.cell_degrees = cell_degrees
+        self.version: Optional[int] = None
+        self.build_ms = 0.0
+        self._cells: Dict[Tuple[int, int], List[GeoFestival]] = {}
+        self._by_contentid: Dict[str, GeoFestival] = {}
+        self._lock = threading.Lock()
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees)
+
+    def ensure(self, db: Session) -> None:
+        """데이터셋 버전이 바뀌었으면 색인을 다시 만듦"""
+        version, _ = dataset_versions.current(db)
+        if version == self.version:
+            return
+        with self._lock:
+            if version != self.version:
+                self.build(db, version)
+
+    def build(self, db: Session, version: Optional[int] = None) -> None:
+        started = time.perf_counter()
+        rows = (
+            db.query(Festival, FestivalDetail.mapy, FestivalDetail.mapx)
+            .join(FestivalDetail, FestivalDetail.contentid == Festival.contentid)
+            .filter(FestivalDetail.mapx.isnot(None), FestivalDetail.mapy.isnot(None))
+            .all()
+        )
+        cells: Dict[Tuple[int, int], List[GeoFestival]] = defaultdict(list)
+        by_contentid: Dict[str, GeoFestival] = {}
+        for f, lat, lng in rows:
+            if f.contentid in by_contentid:
+                continue
+            item = GeoFestival(
+                contentid=f.contentid,
+                title=f.title,
+                addr1=f.addr1,
+                region=f.region,
+                start_date=f.start_date,
+                end_date=f.end_date,
+                image=f.image,
+                progresstype=f.progresstype,
+                festivaltype=f.festivaltype,
+                tel=f.tel,
+                lat=float(lat),
+                lng=float(lng)
+            )
+            by_contentid[f.contentid] = item
+            cells[self._cell(item.lat, item.lng)].append(item)
+
+        self._cells, self._by_contentid = dict(cells), by_contentid
+        self.version = version
+        self.build_ms = (time.perf_counter() - started) * 1000
+
+    def nearby(self, lat: float, lng: float, radius_km: float,
+               date_from: Optional[str] = None, date_to: Optional[str] = None,
+               limit: Optional[int] = None) -> List[Tuple[GeoFestival, float]]:
+        """반경 radius_km 안에서 기간이 겹치는 축제를 가까운 순으로 (축제, 거리 km)"""
+        cells = self._cells
+        d_lat = radius_km / _KM_PER_DEGREE_LAT
+        d_lng = radius_km / (_KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01))
+        lat_lo, lng_lo = self._cell(lat - d_lat, lng - d_lng)
+        lat_hi, lng_hi = self._cell(lat + d_lat, lng + d_lng)
+
+        results = []
+        for cell_lat in range(lat_lo, lat_hi + 1):
+            for cell_lng in range(lng_lo, lng_hi + 1):
+                for item in cells.get((cell_lat, cell_lng), ()):
+                    if not overlaps(item.start_date, item.end_date, date_from, date_to):
+                        continue
+                    distance = haversine_km(lat, lng, item.lat, item.lng)
+                    if distance <= radius_km:
+                        results.append((item, distance))
+        results.sort(key=lambda pair: (pair[1], pair[0].contentid))
+        return results[:limit] if limit is not None else results
+
+    def distance_km(self, contentid: str, lat: float, lng: float) -> Optional[float]:
+        item = self._by_contentid.get(contentid)
+        return haversine_km(lat, lng, item.lat, item.lng) if item else None
+
+    def resolve_place(self, name: str) -> Optional[Tuple[float, float]]:
+        """지명('순천', '담양군')을 주소에 포함한 축제 좌표의 중심점"""
+        name = name.strip()
+        points = [(item.lat, item.lng) for item in self._by_contentid.values() if name and name in (item.addr1 or "")]
+        if not points:
+            return None
+        return sum(p[0] for p in points) / len(points), sum(p[1] for p in points) / len(points)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "version": self.version,
+            "festivals": len(self._by_contentid),
+            "cells": len(self._cells),
+            "build_ms": round(self.build_ms, 1),
+        }
+
+
+festival_geo_index = FestivalGeoIndex(cell_degrees=GEO_CELL_DEGREES)
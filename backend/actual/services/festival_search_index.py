@@ -0,0 +1,217 @@
+# festival_search_index.py
+# 축제 키워드 검색용 프로세스 내 n-gram 역색인 (제목·주소·개요)
+#
+# 한국어는 형태소 분석 없이 단어 내부 문자 bigram으로 색인 ('벚꽃축제' → 벚꽃, 꽃축, 축제)
+# 질의 bigram 중 SEARCH_MIN_COVERAGE 이상을 포함한 축제만 후보로 삼고, 필드 가중치를 준 BM25식 점수로 순위를 매김
+# 색인은 데이터셋 버전(core.dataset_version)이 바뀌면 다음 검색 시 다시 만든다 → LIKE 스캔이나 임베딩 호출 없음
+
+import html
+import math
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from core.database import Festival, FestivalDetail
+from core.dataset_version import dataset_versions
+
+load_dotenv()
+
+SEARCH_MIN_COVERAGE = float(os.getenv("SEARCH_MIN_COVERAGE", "0.6"))
+
+# 필드별 가중치 (제목 일치를 가장 높게)
+FIELD_WEIGHTS = {"title": 3.0, "addr1": 1.5, "overview": 1.0}
+
+_WORD_RE = re.compile(r"\w+")
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+_BM25_K1 = 1.2
+_SNIPPET_CHARS = 60
+
+
+def clean_text(text: Optional[str]) -> str:
+    """TourAPI 개요의 HTML 태그(<br> 등)와 연속 공백 제거"""
+    return _SPACE_RE.sub(" ", _TAG_RE.sub(" ", html.unescape(text or ""))).strip()
+
+
+def _lower(text: str) -> str:
+    # 글자 수가 바뀌지 않게 소문자화 (하이라이트 위치를 원문과 맞추기 위함)
+    return "".join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+
+
+def ngrams(text: str) -> List[str]:
+    """단어별 문자 bigram (한 글자 단어는 그대로)"""
+    grams = []
+    for word in _WORD_RE.findall(_lower(text)):
+        if len(word) == 1:
+            grams.append(word)
+        else:
+            grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+
+def highlight(text: str, grams: List[str], max_chars: Optional[int] = None,
+              pre: str = "<em>", post: str = "</em>") -> Optional[str]:
+    """질의 n-gram이 나타난 구간을 pre/post로 감싼 HTML 이스케이프 문자열.
+    max_chars가 있으면 첫 일치 주변만 잘라낸 스니펫. 일치가 없으면 None"""
+    lowered = _lower(text)
+    marked = [False] * len(text)
+    for gram in set(grams):
+        start = lowered.find(gram)
+        while start != -1:
+            for i in range(start, start + len(gram)):
+                marked[i] = True
+            start = lowered.find(gram, start + 1)
+    if not any(marked):
+        return None
+
+    begin, end = 0, len(text)
+    if max_chars is not None and len(text) > max_chars:
+        first = marked.index(True)
+        begin = max(0, first - max_chars // 3)
+        end = min(len(text), begin + max_chars)
+
+    parts = ["…"] if begin > 0 else []
+    i = begin
+    while i < end:
+        j = i
+        while j < end and marked[j] == marked[i]:
+            j += 1
+        chunk = html.escape(text[i:j])
+        parts.append(f"{pre}{chunk}{post}" if marked[i] else chunk)
+        i = j
+    if end < len(text):
+        parts.append("…")
+    return "".join(parts)
+
+
+@dataclass
+class IndexedFestival:
+    contentid: str
+    title: str
+    addr1: str
+    overview: str
+    region: Optional[str]
+    start_date: Optional[str]
+    end_date: Optional[str]
+    image: Optional[str]
+
+
+@dataclass
+class SearchHit:
+    festival: IndexedFestival
+    score: float
+    highlights: Dict[str, str]
+
+
+class FestivalSearchIndex:
+    def __init__(self, min_coverage: float = 0.6):
+        self.min_coverage = min_coverage
+        self.version: Optional[int] = None
+        self.build_ms = 0.0
+        self._docs: List[IndexedFestival] = []
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def ensure(self, db: Session) -> None:
+        """데이터셋 버전이 바뀌었으면 색인을 다시 만듦"""
+        version, _ = dataset_versions.current(db)
+        if version == self.version:
+            return
+        with self._lock:
+            if version != self.version:
+                self.build(db, version)
+
+    def build(self, db: Session, version: Optional[int] = None) -> None:
+        started = time.perf_counter()
+        overviews = dict(
+            db.query(FestivalDetail.contentid, FestivalDetail.overview)
+            .filter(FestivalDetail.overview.isnot(None))
+            .all()
+        )
+        docs: List[IndexedFestival] = []
+        postings: Dict[str, Dict[int, float]] = defaultdict(lambda: defaultdict(float))
+        for f in db.query(Festival).order_by(Festival.id).all():
+            doc = IndexedFestival(
+                contentid=f.contentid,
+                title=clean_text(f.title),
+                addr1=clean_text(f.addr1),
+                overview=clean_text(overviews.get(f.contentid)),
+                region=f.region,
+                start_date=f.start_date,
+                end_date=f.end_date,
+                image=f.image
+            )
+            doc_id = len(docs)
+            docs.append(doc)
+            for field, weight in FIELD_WEIGHTS.items():
+                for gram in ngrams(getattr(doc, field)):
+                    postings[gram][doc_id] += weight
+
+        # 교체는 참조 대입 한 번으로 (검색 중인 요청은 이전 색인을 그대로 사용)
+        self._docs, self._postings = docs, {gram: dict(hits) for gram, hits in postings.items()}
+        self.version = version
+        self.build_ms = (time.perf_counter() - started) * 1000
+
+    def search(self, query: str, limit: int = 20, region: Optional[str] = None) -> Tuple[List[SearchHit], int]:
+        """(상위 limit개 결과, 조건에 맞는 전체 건수)"""
+        docs, postings = self._docs, self._postings
+        grams = list(dict.fromkeys(ngrams(query)))
+        if not grams or not docs:
+            return [], 0
+
+        scores: Dict[int, float] = defaultdict(float)
+        matched: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            hits = postings.get(gram)
+            if not hits:
+                continue
+            idf = math.log(1 + (len(docs) - len(hits) + 0.5) / (len(hits) + 0.5))
+            for doc_id, tf in hits.items():
+                scores[doc_id] += idf * tf * (_BM25_K1 + 1) / (tf + _BM25_K1)
+                matched[doc_id] += 1
+
+        needed = math.ceil(len(grams) * self.min_coverage)
+        normalized = _lower(query.strip())
+        candidates = []
+        for doc_id, count in matched.items():
+            doc = docs[doc_id]
+            if count < needed or (region and doc.region != region):
+                continue
+            score = scores[doc_id] * count / len(grams)
+            if normalized and normalized in _lower(doc.title):
+                score *= 2  # 질의가 제목에 그대로 들어 있으면 우선
+            candidates.append((score, doc_id))
+
+        candidates.sort(key=lambda item: (-item[0], item[1]))
+        results = []
+        for score, doc_id in candidates[:limit]:
+            doc = docs[doc_id]
+            highlights = {
+                "title": highlight(doc.title, grams),
+                "addr1": highlight(doc.addr1, grams),
+                "overview": highlight(doc.overview, grams, max_chars=_SNIPPET_CHARS * 2),
+            }
+            results.append(SearchHit(
+                festival=doc,
+                score=round(score, 4),
+                highlights={field: value for field, value in highlights.items() if value}
+            ))
+        return results, len(candidates)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "version": self.version,
+            "documents": len(self._docs),
+            "terms": len(self._postings),
+            "build_ms": round(self.build_ms, 1),
+        }
+
+
+festival_search_index = FestivalSearchIndex(min_coverage=SEARCH_MIN_COVERAGE)
@@ -2,6 +2,8 @@ import os
 import csv
 import requests
 import json
+import logging
+import time
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
@@ -11,14 +13,28 @@ from urllib3.poolmanager import PoolManager
 
 from core.database import get_db, Festival, FestivalDetail, FestivalIntro, PetInfo
 from crud import create_festival, create_festival_detail, create_festival_intro, create_pet_info
+from core.dataset_version import dataset_versions
+from core.metrics import MeteredSession
+from core.request_timing import record, timed
+from services.festival_geo_index import festival_geo_index
 
 load_dotenv()
+logger = logging.getLogger(__name__)
 
 TOUR_API_KEY = os.getenv("TOUR_API_KEY")
-KOR_SERVICE_URL = "https://apis.data.go.kr/B551011/KorService2"
+# 로컬 대역 서버(benchmarks/fake_tour_api.py) 등으로 바꿀 때 TOUR_API_BASE_URL 지정
+KOR_SERVICE_URL = os.getenv("TOUR_API_BASE_URL", "https://apis.data.go.kr/B551011/KorService2").rstrip("/")
 FESTIVAL_API_URL = f"{KOR_SERVICE_URL}/searchFestival2"
 AREA_CODE_API_URL = f"{KOR_SERVICE_URL}/areaCode2"
 
+def _to_float(value) -> Optional[float]:
+    """TourAPI 좌표 문자열('126.9780') → float, 빈 값·0은 None"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number or None
+
 class TlsAdapter(HTTPAdapter):
     def init_poolmanager(self, connections, maxsize, block=False):
         ctx = ssl.create_default_context()
@@ -32,10 +48,11 @@ class TlsAdapter(HTTPAdapter):
 
 class FestivalService:
     def __init__(self):
-        self.session = requests.Session()
+        self.session = MeteredSession("tour_api")
         self.session.mount("https://", TlsAdapter())
         self._area_code_cache = {}
 
+    @timed("tour_api")
     def _fetch_codes(self, area_code: str = "") -> Optional[List[Dict]]:
         params = {
             "serviceKey": TOUR_API_KEY,
@@ -54,7 +71,7 @@ class FestivalService:
             items = response.json().get("response", {}).get("body", {}).get("items", {}).get("item", [])
             return items
         except requests.RequestException as e:
-            print(f"❌ areaCode API 호출 실패: {e}")
+            logger.warning("areaCode API 호출 실패: %s", e)
             return None
 
     def _fetch_and_find_codes(self, region_name: str, sigungu_name: Optional[str] = None) -> Optional[Tuple[str, str]]:
@@ -66,7 +83,7 @@ class FestivalService:
 
         area_code = self._area_code_cache["main_areas"].get(region_name)
         if not area_code:
-            print(f"오류: '{region_name}' 광역 지역을 찾을 수 없습니다.")
+            logger.warning("'%s' 광역 지역을 찾을 수 없습니다.", region_name)
             return None
 
         sigungu_code = ""
@@ -80,11 +97,12 @@ class FestivalService:
 
             sigungu_code = self._area_code_cache[cache_key].get(sigungu_name)
             if sigungu_code is None:
-                print(f"오류: '{region_name}'에서 '{sigungu_name}' 시군구를 찾을 수 없습니다.")
+                logger.warning("'%s'에서 '%s' 시군구를 찾을 수 없습니다.", region_name, sigungu_name)
                 return None
 
         return area_code, sigungu_code
 
+    @timed("tour_api")
     def fetch_detail_common(self, content_id: str, content_type_id: str) -> Dict:
         params = {
             "serviceKey": TOUR_API_KEY,
@@ -110,15 +128,16 @@ class FestivalService:
                 "firstimage2": item.get("firstimage2", ""),
                 "addr1": item.get("addr1", ""),
                 "addr2": item.get("addr2", ""),
-                "mapx": item.get("mapx", ""),
-                "mapy": item.get("mapy", ""),
+                "mapx": _to_float(item.get("mapx")),
+                "mapy": _to_float(item.get("mapy")),
                 "mlevel": item.get("mlevel", ""),
                 "overview": item.get("overview", ""),
             }
         except (requests.RequestException, json.JSONDecodeError) as e:
-            print(f"⚠️ [Common Info Error] contentId: {content_id}, Error: {e}")
+            logger.warning("detailCommon 조회 실패 (contentId: %s): %s", content_id, e)
             return {}
 
+    @timed("tour_api")
     def fetch_detail_intro(self, content_id: str, content_type_id: str) -> Dict:
         params = {
             "serviceKey": TOUR_API_KEY,
@@ -147,9 +166,10 @@ class FestivalService:
                 "festivaltype": item.get("festivaltype", ""),
             }
         except (requests.RequestException, json.JSONDecodeError) as e:
-            print(f"⚠️ [Intro Info Error] contentId: {content_id}, Error: {e}")
+            logger.warning("detailIntro 조회 실패 (contentId: %s): %s", content_id, e)
             return {}
 
+    @timed("tour_api")
     def fetch_pet_info(self, content_id: str) -> Dict:
         params = {
             "serviceKey": TOUR_API_KEY,
@@ -190,6 +210,7 @@ class FestivalService:
         except (requests.RequestException, json.JSONDecodeError):
             return {}
 
+    @timed("tour_api")
     def fetch_all_festivals(self, area_code, sigungu_code, event_start_date):
         all_items = []
         page = 1
@@ -223,7 +244,7 @@ class FestivalService:
         try:
             codes = self._fetch_and_find_codes(region_name, sigungu_name)
             if not codes:
-                print(f"❌ [오류] '{region_name}' 지역 코드 변환 실패")
+                logger.warning("'%s' 지역 코드 변환 실패", region_name)
                 return []
 
             area_code, sigungu_code = codes
@@ -245,7 +266,7 @@ class FestivalService:
                 for item in items
             ]
         except (requests.RequestException, json.JSONDecodeError) as e:
-            print(f"❌ [오류] 축제 조회 실패: {e}")
+            logger.warning("축제 조회 실패: %s", e)
             return []
 
     def collect_all_honam_festivals(self, db):
@@ -254,15 +275,15 @@ class FestivalService:
         total_collected = 0
 
         for region in regions:
-            print(f"\n--- {region} 지역 축제 정보 수집 시작 ---")
+            logger.info("%s 지역 축제 정보 수집 시작", region)
             festivals = self.get_festivals_by_name(region_name=region, sigungu_name=None, event_start_date=today)
 
             if not festivals:
-                print(f"--- {region} 지역에 예정된 축제가 없습니다. ---")
+                logger.info("%s 지역에 예정된 축제가 없습니다.", region)
                 continue
 
             for i, f in enumerate(festivals):
-                print(f"({i+1}/{len(festivals)}) '{f.get('title', f.get('contentid'))}' 상세 정보 조회 중...")
+                logger.debug("(%d/%d) '%s' 상세 정보 조회 중", i + 1, len(festivals), f.get("title", f.get("contentid")))
                 content_id = f["contentid"]
                 content_type_id = f["contenttypeid"]
 
@@ -288,55 +309,90 @@ class FestivalService:
                         create_pet_info(db, pet_info)
 
                     total_collected += 1
-                    print(f"✅ '{f.get('title')}' 저장 완료")
+                    logger.debug("'%s' 저장 완료", f.get("title"))
 
                 except Exception as e:
-                    print(f"❌ '{f.get('title')}' 저장 실패: {e}")
-
-        print(f"\n🎉 총 {total_collected}개의 축제 정보 수집 완료!")
+                    # 이미 있는 축제(contentid 중복) 등으로 실패하면 세션을 되돌려야 다음 축제·버전 갱신이 진행됨
+                    db.rollback()
+                    logger.warning("'%s' 저장 실패: %s", f.get("title"), e)
+
+        logger.info("총 %d개의 축제 정보 수집 완료", total_collected)
+        if total_collected:
+            # 읽기 API의 ETag가 바뀌도록 데이터셋 버전 갱신
+            version = dataset_versions.bump(db)
+            logger.info("축제 데이터셋 버전: %s", version)
         return total_collected
 
     def get_festival_recommendations(self, db, travel_period: str, companion_type: str,
                                    atmosphere: str, core_experience: str,
-                                   additional_considerations: str) -> List[Dict]:
-        festivals = db.query(Festival).filter(
-            Festival.start_date >= travel_period
-        ).all()
-
+                                   additional_considerations: str,
+                                   origin: Optional[Tuple[float, float]] = None) -> List[Dict]:
+        with timed("db"):
+            festivals = db.query(Festival).filter(
+                Festival.start_date >= travel_period
+            ).all()
+            if origin is not None:
+                festival_geo_index.ensure(db)
+
+        scoring_started = time.perf_counter()
         recommendations = []
         for festival in festivals:
             score = 0
             reasons = []
+            breakdown = {
+                "region_compatibility": 0,
+                "season_matching": 0,
+                "companion_optimization": 0,
+                "interest_matching": 0,
+                "accessibility_consideration": 0
+            }
 
             if "전북" in festival.region or "전남" in festival.region or "광주" in festival.region:
                 score += 10
+                breakdown["region_compatibility"] += 10
                 reasons.append("호남 지역 축제")
 
             if travel_period in festival.start_date or travel_period in festival.end_date:
                 score += 15
+                breakdown["season_matching"] += 15
                 reasons.append("계절에 적합")
 
             if companion_type == "부모님 동반 가족":
                 if "휴식" in atmosphere or "여유" in atmosphere:
                     score += 20
+                    breakdown["companion_optimization"] += 20
                     reasons.append("부모님과 함께하기 좋은 여유로운 분위기")
 
             if core_experience == "음식" and "음식" in str(festival.festivaltype):
                 score += 25
+                breakdown["interest_matching"] += 25
                 reasons.append("음식 중심 축제")
 
             if "걷기" in additional_considerations and "평지" in str(festival.progresstype):
                 score += 15
+                breakdown["accessibility_consideration"] += 15
                 reasons.append("걷기 편한 평지 조성")
 
+            if origin is not None:
+                # 출발지에서 가까울수록 이동 부담이 적음
+                distance = festival_geo_index.distance_km(festival.contentid, *origin)
+                if distance is not None:
+                    proximity = 15 if distance <= 30 else 10 if distance <= 80 else 5 if distance <= 150 else 0
+                    if proximity:
+                        score += proximity
+                        breakdown["accessibility_consideration"] += proximity
+                        reasons.append(f"출발지에서 약 {distance:.0f}km")
+
             if score > 30:
                 recommendations.append({
                     "festival": festival,
                     "score": score,
-                    "reasons": reasons
+                    "reasons": reasons,
+                    "breakdown": breakdown
                 })
 
         recommendations.sort(key=lambda x: x["score"], reverse=True)
+        record("rules", (time.perf_counter() - scoring_started) * 1000)
         return recommendations[:5]
 
 
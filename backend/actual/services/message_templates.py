@@ -0,0 +1,152 @@
+# message_templates.py
+# 봇 시작말·대화 시나리오 메시지 템플릿 레지스트리
+# 여행 시기(월) × 동반자 유형 조합은 수십 개뿐이므로 모든 변형을 미리 렌더링하고,
+# 시작말 응답은 session_id 앞부분까지 JSON 바이트로 직렬화해 두어 요청마다 조립하지 않음
+
+import json
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from schemas.models import BotGreetingResponse
+
+# ==================== 대화 시나리오 정의 ====================
+CONVERSATION_SCENARIO = {
+    "initial": {
+        "message": "안녕하세요! {travel_period}에 {companion_type}와(과) 함께 떠나는 멋진 호남 여행을 계획하고 계시는군요! 😊\n\n이번 여행의 전체적인 분위기는 어떤 느낌을 선호하시나요?",
+        "options": ["A: 다양한 볼거리와 체험이 가득한 활기찬 분위기", "B: 아름다운 풍경을 보며 즐기는 여유롭고 고즈넉한 분위기"],
+        "next_phase": "energy_preference"
+    },
+    "energy_preference": {
+        "message": "좋은 선택이에요! ✨\n\n그렇다면 이번 여행에서 가장 만족하셨으면 하는 '핵심 경험'은 무엇일까요?",
+        "options": ["A: 눈이 즐거운 것 (아름다운 가을 꽃이나 단풍 구경)", "B: 입이 즐거운 것 (제철 식재료로 만든 건강한 남도 음식)", "C: 마음이 즐거운 것 (역사 유적지나 고즈넉한 사찰 탐방)"],
+        "next_phase": "interest_focus"
+    },
+    "interest_focus": {
+        "message": "역시 맛의 고장 호남 여행의 핵심은 음식이군요! 👍\n\n마지막으로 하나만 더 여쭤볼게요. 혹시 꼭 고려해야 할 점이 있을까요?\n\n예를 들어, '오래 걷는 것은 괜찮으신지' 혹은 '편하게 앉아서 쉴 공간이 많은 곳'이 좋은지 알려주시면, 정말 딱 맞는 곳으로 찾아 드릴게요!",
+        "options": None,
+        "next_phase": "additional_requirements"
+    },
+    "additional_requirements": {
+        "message": "알겠습니다! 모든 정보를 바탕으로 사용자님께 꼭 맞는 축제를 추천해 드릴게요! 잠시만 기다려주세요.",
+        "options": None,
+        "next_phase": "completed"
+    }
+}
+
+# 시나리오 진행 순서 (대화 메시지는 저장하지 않으므로 턴 번호는 단계 순서로 계산)
+SCENARIO_PHASES = list(CONVERSATION_SCENARIO)
+
+
+def scenario_turn(phase: str) -> int:
+    """phase 단계의 질문을 보낸 봇 메시지의 턴 번호 (봇 질문·사용자 답변이 번갈아 한 턴씩, completed는 마지막 안내 메시지)"""
+    index = SCENARIO_PHASES.index(phase) if phase in CONVERSATION_SCENARIO else len(SCENARIO_PHASES) - 1
+    return 2 * index + 1
+
+
+# ==================== 봇 시작말 ====================
+# 계절별 특징 매핑
+SEASON_FEATURES = {
+    "3월": "봄꽃이 피어나고 따뜻한 봄바람이 부는",
+    "4월": "벚꽃이 만발하고 새싹이 돋아나는",
+    "5월": "푸른 잎이 무성하고 산들바람이 부는",
+    "6월": "초록이 짙어지고 여름의 문턱에 선",
+    "7월": "푸른 여름이 한창이고 맑은 하늘이 펼쳐진",
+    "8월": "한여름의 열기가 가득하고 푸른 자연이 아름다운",
+    "9월": "가을의 문턱에 서서 선선한 바람이 부는",
+    "10월": "가을 단풍이 절정에 달하고 하늘이 높아진",
+    "11월": "단풍이 물들고 서늘한 가을 정취가 가득한",
+    "12월": "겨울의 문턱에 서서 차가운 바람이 부는"
+}
+
+# 동반자별 특징 매핑
+COMPANION_FEATURES = {
+    "혼자": "자유롭고 독립적인",
+    "연인": "로맨틱하고 특별한",
+    "친구": "즐겁고 활기찬",
+    "아이 동반 가족": "아이들과 함께하는 즐거운",
+    "부모님 동반 가족": "부모님과 함께하는 의미있는"
+}
+
+GREETING_TEMPLATE = """안녕하세요! {travel_period}에 {companion_type}와(과) 함께하는 호남 여행을 계획하고 계시는군요! 😊
+
+{season_feature} 시기 저희 호남은 {companion_feature} 여행을 위한 최고의 장소랍니다. 
+
+소중한 분과 함께하는 여행을 계획하는 그 마음, 저도 잘 알기에 진심으로 응원하게 되네요. 
+
+수많은 축제 정보 속에서 길을 잃지 않도록, 제가 여러분의 스타일에 꼭 맞는 '인생 축제'를 찾아 평생 기억에 남을 추억을 설계해 드릴게요.
+
+가장 완벽한 추천을 위해, 먼저 여러분이 꿈꾸시는 여행의 전반적인 분위기를 함께 그려보고 싶어요. 어떤 그림에 더 마음이 끌리시나요?"""
+
+# 첫 번째 질문과 선택지
+GREETING_NEXT_QUESTION = "여행의 전체적인 분위기를 선택해주세요:"
+GREETING_CHOICES = [
+    "활기찬 체험형 여행 - 다양한 볼거리와 흥미진진한 프로그램들",
+    "여유로운 감상형 여행 - 아름다운 풍경을 배경으로 한 고즈넉한 축제"
+]
+
+
+def _dumps(value) -> str:
+    # FastAPI JSONResponse와 같은 형식 (ensure_ascii=False, 공백 없는 구분자)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def render_greeting(travel_period: str, companion_type: str) -> str:
+    return GREETING_TEMPLATE.format(
+        travel_period=travel_period,
+        companion_type=companion_type,
+        season_feature=SEASON_FEATURES.get(travel_period, "아름다운"),
+        companion_feature=COMPANION_FEATURES.get(companion_type, "특별한")
+    )
+
+
+def render_scenario_message(phase: str, travel_period: Optional[str], companion_type: Optional[str]) -> str:
+    return CONVERSATION_SCENARIO[phase]["message"].format(travel_period=travel_period, companion_type=companion_type)
+
+
+# 미리 렌더링되지 않은 조합(알 수 없는 입력값)은 크기 제한 캐시로 처리
+_render_scenario_cached = lru_cache(maxsize=256)(render_scenario_message)
+
+
+def render_greeting_body_prefix(travel_period: str, companion_type: str) -> bytes:
+    """BotGreetingResponse JSON에서 session_id 값 앞까지의 바이트"""
+    prefix = (
+        '{"greeting_message":' + _dumps(render_greeting(travel_period, companion_type))
+        + ',"next_question":' + _dumps(GREETING_NEXT_QUESTION)
+        + ',"choices":' + _dumps(GREETING_CHOICES)
+        + ',"session_id":'
+    ).encode("utf-8")
+    # 응답을 response_model 없이 바이트로 보내므로 렌더링 시점에 스키마를 검증 (모델 필드가 바뀌면 시작 시 바로 실패)
+    BotGreetingResponse.model_validate_json(prefix + b'""}')
+    return prefix
+
+
+class MessageTemplateRegistry:
+    """알려진 (여행 시기, 동반자) 조합의 메시지를 미리 렌더링해 두고 키로 조회"""
+
+    def __init__(self, travel_periods: List[str], companion_types: List[str]):
+        self._greeting_prefixes: Dict[Tuple[str, str], bytes] = {}
+        self._scenario_messages: Dict[Tuple[str, str, str], str] = {}
+        for travel_period in travel_periods:
+            for companion_type in companion_types:
+                key = (travel_period, companion_type)
+                self._greeting_prefixes[key] = render_greeting_body_prefix(travel_period, companion_type)
+                for phase in CONVERSATION_SCENARIO:
+                    self._scenario_messages[(phase, travel_period, companion_type)] = render_scenario_message(
+                        phase, travel_period, companion_type
+                    )
+
+    def greeting_body(self, travel_period: str, companion_type: str, session_id: str) -> bytes:
+        """미리 직렬화된 시작말 응답 본문에 session_id만 덧붙임"""
+        prefix = self._greeting_prefixes.get((travel_period, companion_type))
+        if prefix is None:
+            prefix = render_greeting_body_prefix(travel_period, companion_type)
+        return prefix + _dumps(session_id).encode("utf-8") + b"}"
+
+    def scenario_message(self, phase: str, travel_period: Optional[str] = None, companion_type: Optional[str] = None) -> str:
+        message = self._scenario_messages.get((phase, travel_period, companion_type))
+        if message is None:
+            message = _render_scenario_cached(phase, travel_period, companion_type)
+        return message
+
+
+message_templates = MessageTemplateRegistry(list(SEASON_FEATURES), list(COMPANION_FEATURES))
@@ -0,0 +1,220 @@
+# recommendation_cache.py
+# ClovaX 추천 응답 캐시 (정확 일치 + 추가 요청사항 유사도 일치)
+#
+# 키 = hash(프롬프트 템플릿 버전, 사용자 프로필 범주형 필드, 후보 축제 contentid+modifiedtime, 정규화된 추가 요청사항)
+# 1차: 프로세스 내 LRU(TTL)  2차: 선택적 SQLite 파일 (여러 워커가 공유)
+# 정확 일치가 없으면 추가 요청사항만 다른 항목 중 문자 bigram Jaccard 유사도가 임계값 이상인 것을 사용
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+RECOMMENDATION_CACHE_SIZE = int(os.getenv("RECOMMENDATION_CACHE_SIZE", "512"))
+RECOMMENDATION_CACHE_TTL = int(os.getenv("RECOMMENDATION_CACHE_TTL", "3600"))
+RECOMMENDATION_CACHE_DB = os.getenv("RECOMMENDATION_CACHE_DB")  # 미설정 시 프로세스 내 캐시만 사용
+RECOMMENDATION_CACHE_SIMILARITY = float(os.getenv("RECOMMENDATION_CACHE_SIMILARITY", "0.8"))
+
+_NORMALIZE_RE = re.compile(r"[\s\W_]+")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """공백·구두점을 제거하고 소문자로 통일 ('오래 걷기 힘들어요!' → '오래걷기힘들어요')"""
+    return _NORMALIZE_RE.sub("", (text or "").lower())
+
+
+def _bigrams(text: str) -> FrozenSet[str]:
+    if len(text) < 2:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i:i + 2] for i in range(len(text) - 1))
+
+
+def _jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    exact: str
+    bucket: str  # 추가 요청사항을 제외한 나머지 조건의 해시 (유사도 검색 범위)
+    free_text: str
+
+
+class RecommendationCache:
+    """TTL + LRU 메모리 캐시와 선택적 SQLite 공유 캐시"""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: int = 3600,
+                 sqlite_path: Optional[str] = None, similarity_threshold: float = 0.8):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sqlite_path = sqlite_path
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[str, Tuple[float, str, str]]" = OrderedDict()  # exact → (만료, 값, bucket)
+        self._buckets: Dict[str, Dict[str, FrozenSet[str]]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "similar_hits": 0, "shared_hits": 0, "misses": 0, "stores": 0}
+
+        if sqlite_path:
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS recommendation_cache ("
+                    " cache_key TEXT PRIMARY KEY, bucket TEXT NOT NULL, free_text TEXT NOT NULL,"
+                    " value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS ix_recommendation_cache_bucket ON recommendation_cache (bucket)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.sqlite_path, timeout=2)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(prompt_version: str, profile: Dict[str, object],
+                 candidates: Iterable[Tuple[Optional[str], Optional[str]]], free_text: Optional[str]) -> CacheKey:
+        """캐시 키 생성. candidates는 (contentid, modifiedtime) 목록이며 순서는 무시한다."""
+        base = json.dumps(
+            {
+                "v": prompt_version,
+                "profile": {k: profile[k] for k in sorted(profile)},
+                "candidates": sorted((str(cid or ""), str(mtime or "")) for cid, mtime in candidates),
+            },
+            ensure_ascii=False, sort_keys=True,
+        )
+        normalized = normalize_text(free_text)
+        bucket = hashlib.sha256(base.encode("utf-8")).hexdigest()
+        exact = hashlib.sha256(f"{bucket}|{normalized}".encode("utf-8")).hexdigest()
+        return CacheKey(exact=exact, bucket=bucket, free_text=normalized)
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            value = self._get_local(key.exact, now)
+            if value is not None:
+                self.stats["hits"] += 1
+                return value
+
+            similar = self._find_similar_local(key, now)
+            if similar is not None:
+                self.stats["similar_hits"] += 1
+                return similar
+
+        shared = self._get_shared(key, now)
+        with self._lock:
+            if shared is not None:
+                self.stats["shared_hits"] += 1
+                self._set_local(key, shared[0], shared[1])
+                return shared[0]
+            self.stats["misses"] += 1
+        return None
+
+    def set(self, key: CacheKey, value: str) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._set_local(key, value, expires_at)
+            self.stats["stores"] += 1
+        if self.sqlite_path:
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO recommendation_cache (cache_key, bucket, free_text, value, expires_at)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        (key.exact, key.bucket, key.free_text, value, expires_at),
+                    )
+            except sqlite3.Error:
+                pass  # 공유 캐시 실패는 추천 응답에 영향을 주지 않음
+
+    def hit_ratio(self) -> float:
+        hits = self.stats["hits"] + self.stats["similar_hits"] + self.stats["shared_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    # ==================== 내부 구현 ====================
+
+    def _get_local(self, exact: str, now: float) -> Optional[str]:
+        entry = self._entries.get(exact)
+        if entry is None:
+            return None
+        expires_at, value, _ = entry
+        if expires_at < now:
+            self._evict(exact)
+            return None
+        self._entries.move_to_end(exact)
+        return value
+
+    def _set_local(self, key: CacheKey, value: str, expires_at: float) -> None:
+        self._entries[key.exact] = (expires_at, value, key.bucket)
+        self._entries.move_to_end(key.exact)
+        self._buckets.setdefault(key.bucket, {})[key.exact] = _bigrams(key.free_text)
+        while len(self._entries) > self.max_entries:
+            self._evict(next(iter(self._entries)))
+
+    def _evict(self, exact: str) -> None:
+        entry = self._entries.pop(exact, None)
+        if entry is None:
+            return
+        members = self._buckets.get(entry[2], {})
+        members.pop(exact, None)
+        if not members:
+            self._buckets.pop(entry[2], None)
+
+    def _find_similar_local(self, key: CacheKey, now: float) -> Optional[str]:
+        members = self._buckets.get(key.bucket)
+        if not members:
+            return None
+        # 만료된 항목이 가장 비슷하다고 골라져 적중을 놓치지 않도록 먼저 정리 (_get_shared와 같은 기준)
+        for exact in [exact for exact in members if self._entries[exact][0] < now]:
+            self._evict(exact)
+        members = self._buckets.get(key.bucket)
+        if not members:
+            return None
+        target = _bigrams(key.free_text)
+        best = max(members.items(), key=lambda item: _jaccard(target, item[1]))
+        if _jaccard(target, best[1]) < self.similarity_threshold:
+            return None
+        return self._get_local(best[0], now)
+
+    def _get_shared(self, key: CacheKey, now: float) -> Optional[Tuple[str, float]]:
+        if not self.sqlite_path:
+            return None
+        try:
+            with self._connect() as conn:
+                rows: List[Tuple[str, str, float]] = conn.execute(
+                    "SELECT free_text, value, expires_at FROM recommendation_cache"
+                    " WHERE bucket = ? AND expires_at >= ? LIMIT 100",
+                    (key.bucket, now),
+                ).fetchall()
+        except sqlite3.Error:
+            return None
+        target = _bigrams(key.free_text)
+        best = None
+        for free_text, value, expires_at in rows:
+            score = 1.0 if free_text == key.free_text else _jaccard(target, _bigrams(free_text))
+            if score >= self.similarity_threshold and (best is None or score > best[0]):
+                best = (score, value, expires_at)
+        return (best[1], best[2]) if best else None
+
+
+recommendation_cache = RecommendationCache(
+    max_entries=RECOMMENDATION_CACHE_SIZE,
+    ttl_seconds=RECOMMENDATION_CACHE_TTL,
+    sqlite_path=RECOMMENDATION_CACHE_DB,
+    similarity_threshold=RECOMMENDATION_CACHE_SIMILARITY,
+)
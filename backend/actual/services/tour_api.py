@@ -3,16 +3,22 @@
 import requests
 import os
 import json
+import logging
 from dotenv import load_dotenv
 from typing import List, Dict, Optional, Tuple
 import ssl
 from requests.adapters import HTTPAdapter
 from urllib3.poolmanager import PoolManager
 
+from core.metrics import MeteredSession
+from core.request_timing import timed
+
 load_dotenv()
+logger = logging.getLogger(__name__)
 TOUR_API_KEY = os.getenv("TOUR_API_KEY")
 
-KOR_SERVICE_URL = "https://apis.data.go.kr/B551011/KorService2"
+# 로컬 대역 서버(benchmarks/fake_tour_api.py) 등으로 바꿀 때 TOUR_API_BASE_URL 지정
+KOR_SERVICE_URL = os.getenv("TOUR_API_BASE_URL", "https://apis.data.go.kr/B551011/KorService2").rstrip("/")
 FESTIVAL_API_URL = f"{KOR_SERVICE_URL}/searchFestival2"
 AREA_CODE_API_URL = f"{KOR_SERVICE_URL}/areaCode2"
 _area_code_cache = {}
@@ -28,6 +34,25 @@ class TlsAdapter(HTTPAdapter):
             ssl_context=ctx
         )
 
+def ping(_=None) -> Dict:
+    """readiness 점검: areaCode2 1건 조회로 TourAPI 도달 여부 확인 (실패 시 예외)"""
+    if not TOUR_API_KEY:
+        raise RuntimeError("TOUR_API_KEY가 설정되지 않았습니다.")
+    session = requests.Session()
+    session.mount("https://", TlsAdapter())
+    params = {"serviceKey": TOUR_API_KEY, "MobileOS": "ETC", "MobileApp": "NamdoBot", "_type": "json", "numOfRows": 1}
+    try:
+        response = session.get(AREA_CODE_API_URL, params=params, timeout=5)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        # 예외 메시지의 URL에 serviceKey가 들어 있으므로 종류만 노출
+        raise RuntimeError(f"TourAPI 호출 실패: {type(e).__name__}") from None
+    header = response.json().get("response", {}).get("header", {})
+    if header.get("resultCode") not in (None, "0000"):
+        raise RuntimeError(f"TourAPI 오류 응답: {header.get('resultCode')} {header.get('resultMsg')}")
+    return {"status_code": response.status_code}
+
+@timed("tour_api")
 def _fetch_codes(session: requests.Session, area_code: str = "") -> Optional[List[Dict]]:
     params = {
         "serviceKey": TOUR_API_KEY,
@@ -41,14 +66,14 @@ def _fetch_codes(session: requests.Session, area_code: str = "") -> Optional[Lis
         params["areaCode"] = area_code
 
     try:
-        print(f"  [디버그] areaCode API 호출 시작... (areaCode: {area_code or '전체'})")
+        logger.debug("areaCode API 호출 시작 (areaCode: %s)", area_code or "전체")
         response = session.get(AREA_CODE_API_URL, params=params, timeout=5)
         response.raise_for_status()
         items = response.json().get("response", {}).get("body", {}).get("items", {}).get("item", [])
-        print(f"  [디버그] areaCode API 호출 성공. {len(items)}개 결과 수신.")
+        logger.debug("areaCode API 호출 성공: %d개 결과", len(items))
         return items
     except requests.RequestException as e:
-        print(f"  [디버그] ❌ areaCode API 호출 실패: {e}")
+        logger.warning("areaCode API 호출 실패: %s", e)
         return None
 
 def _fetch_and_find_codes(session: requests.Session, region_name: str, sigungu_name: Optional[str] = None) -> Optional[Tuple[str, str]]:
@@ -59,7 +84,7 @@ def _fetch_and_find_codes(session: requests.Session, region_name: str, sigungu_n
 
     area_code = _area_code_cache["main_areas"].get(region_name)
     if not area_code:
-        print(f"오류: '{region_name}' 광역 지역을 찾을 수 없습니다.")
+        logger.warning("'%s' 광역 지역을 찾을 수 없습니다.", region_name)
         return None
 
     sigungu_code = ""
@@ -72,29 +97,29 @@ def _fetch_and_find_codes(session: requests.Session, region_name: str, sigungu_n
 
         sigungu_code = _area_code_cache[cache_key].get(sigungu_name)
         if sigungu_code is None:
-            print(f"오류: '{region_name}'에서 '{sigungu_name}' 시군구를 찾을 수 없습니다.")
+            logger.warning("'%s'에서 '%s' 시군구를 찾을 수 없습니다.", region_name, sigungu_name)
             return None
 
     return area_code, sigungu_code
 
 def get_festivals_by_name(region_name: str, sigungu_name: Optional[str], event_start_date: str) -> Optional[List[Dict]]:
     if not TOUR_API_KEY:
-        print("❌ [오류] .env 파일에 TOUR_API_KEY가 설정되지 않았습니다.")
+        logger.error(".env 파일에 TOUR_API_KEY가 설정되지 않았습니다.")
         return None
 
     try:
-        session = requests.Session()
+        session = MeteredSession("tour_api")
         session.mount("https://", TlsAdapter())
 
-        print("\n[과정 1] 지역명을 지역코드로 변환합니다...")
         codes = _fetch_and_find_codes(session, region_name, sigungu_name)
 
         if not codes:
-            print("❌ [오류] 지역명->코드 변환 실패. 함수를 중단합니다.")
+            logger.warning("지역명->코드 변환 실패: %s %s", region_name, sigungu_name or "")
             return None
 
         area_code, sigungu_code = codes
-        print(f"✅ [성공] 지역명 변환 완료: '{region_name}' -> areaCode={area_code}, '{sigungu_name or '전체'}' -> sigunguCode={sigungu_code or '(전체검색)'}")
+        logger.debug("지역명 변환: '%s' -> areaCode=%s, '%s' -> sigunguCode=%s",
+                     region_name, area_code, sigungu_name or "전체", sigungu_code or "(전체검색)")
 
         params = {
             "serviceKey": TOUR_API_KEY,
@@ -107,23 +132,22 @@ def get_festivals_by_name(region_name: str, sigungu_name: Optional[str], event_s
         if sigungu_code:
             params["sigunguCode"] = sigungu_code
 
-        print("\n[과정 2] 변환된 코드로 축제 정보를 검색합니다...")
-        print(f"  - 요청 파라미터: {params}")
-        response = session.get(FESTIVAL_API_URL, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        logger.debug("축제 검색 요청: %s", {key: value for key, value in params.items() if key != "serviceKey"})
+        with timed("tour_api"):
+            response = session.get(FESTIVAL_API_URL, params=params, timeout=10)
+            response.raise_for_status()
+            data = response.json()
         items = data.get("response", {}).get("body", {}).get("items", {}).get("item", [])
 
-        print(f"✅ [성공] 축제 정보 조회 완료. {len(items) if items else 0}개의 결과를 받았습니다.")
+        logger.debug("축제 검색 결과: %d건", len(items) if items else 0)
 
         if not items:
             return []
 
-        return [{"title": item.get("title"), "addr1": item.get("addr1"), "start_date": item.get("eventstartdate"), "end_date": item.get("eventenddate"), "image": item.get("firstimage", "https://via.placeholder.com/300x200.png?text=No+Image"), "tel": item.get("tel")} for item in items]
+        return [{"contentid": item.get("contentid"), "modifiedtime": item.get("modifiedtime"), "title": item.get("title"), "addr1": item.get("addr1"), "start_date": item.get("eventstartdate"), "end_date": item.get("eventenddate"), "image": item.get("firstimage", "https://via.placeholder.com/300x200.png?text=No+Image"), "tel": item.get("tel")} for item in items]
     except requests.exceptions.RequestException as e:
-        print(f"❌ [오류] API 호출에 실패했습니다: {e}")
+        logger.warning("축제 검색 API 호출 실패: %s", e)
         return None
     except json.JSONDecodeError:
-        print("❌ [오류] API 응답이 JSON 형식이 아닙니다!")
-        print(f"  - 서버 원본 응답 내용: {response.text}")
+        logger.error("축제 검색 API 응답이 JSON 형식이 아닙니다: %s", response.text[:500])
         return None
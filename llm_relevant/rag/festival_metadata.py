@@ -0,0 +1,163 @@
+# festival_metadata.py
+# 축제 문서에 구조화 메타데이터(지역, 시군구, 기간, 반려동물 정보, 축제 유형)를 붙이고
+# 비트맵 인덱스로 검색 전에 후보 문서를 걸러내기 위한 모듈
+
+import csv
+import os
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+from langchain_core.documents import Document
+
+_CONTENTID_RE = re.compile(r"^\ufeff?contentid: (\S+)", re.MULTILINE)
+_MONTH_RE = re.compile(r"(1[0-2]|[1-9])\s*월")
+_PET_KEYWORDS = ("반려", "강아지", "애견", "펫", "고양이")
+_PET_COLUMNS = ("acmpyPsblCpam", "acmpyTypeCd", "acmpyNeedMtr", "etcAcmpyInfo", "relaPosesFclty")
+
+# 질의에 등장하는 약칭 → CSV의 region 값
+REGION_ALIASES = {
+    "전북특별자치도": "전북특별자치도",
+    "전라북도": "전북특별자치도",
+    "전북": "전북특별자치도",
+    "전라남도": "전라남도",
+    "전남": "전라남도",
+    "광주광역시": "광주",
+    "광주": "광주",
+}
+
+
+def sigungu_from_addr(addr1: str) -> str:
+    """'전북특별자치도 고창군 고창읍 ...' → '고창군'"""
+    parts = (addr1 or "").split()
+    return parts[1] if len(parts) > 1 else ""
+
+
+def load_festival_metadata(data_dir: str, filename: str = "honam_festivals_base.csv") -> Dict[str, Dict]:
+    """기본 CSV에서 contentid별 메타데이터를 읽어옴"""
+    path = os.path.join(data_dir, filename)
+    metadata = {}
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            metadata[row["contentid"]] = {
+                "contentid": row["contentid"],
+                "title": row.get("title", ""),
+                "region": row.get("region", ""),
+                "sigungu": sigungu_from_addr(row.get("addr1", "")),
+                "start_date": row.get("start_date", ""),
+                "end_date": row.get("end_date", ""),
+                "has_pet_info": any(row.get(col) for col in _PET_COLUMNS),
+                "festivaltype": row.get("festivaltype", ""),
+            }
+    return metadata
+
+
+def attach_metadata(documents: List[Document], metadata: Dict[str, Dict]) -> int:
+    """CSV 행 문서의 contentid로 메타데이터를 붙임 (청크 분할 전에 호출해야 청크에 상속됨)"""
+    attached = 0
+    for doc in documents:
+        match = _CONTENTID_RE.search(doc.page_content)
+        if match and match.group(1) in metadata:
+            doc.metadata.update(metadata[match.group(1)])
+            attached += 1
+    return attached
+
+
+@dataclass
+class FestivalFilter:
+    """검색 전에 적용할 메타데이터 조건 (None인 항목은 조건 없음)"""
+
+    region: Optional[str] = None
+    sigungu: Optional[str] = None
+    month: Optional[int] = None
+    has_pet_info: Optional[bool] = None
+    festivaltype: Optional[str] = None
+
+    def is_empty(self) -> bool:
+        return all(value is None for value in vars(self).values())
+
+    @classmethod
+    def from_query(cls, query: str, index: "MetadataBitmapIndex") -> "FestivalFilter":
+        """질의 문장에서 지역/시군구/월/반려동물 조건을 추출 (인덱스에 존재하는 값만 사용)"""
+        found = cls()
+
+        for sigungu in index.values("sigungu"):
+            stem = sigungu[:-1]
+            if sigungu in query or (len(stem) >= 2 and stem in query):
+                found.sigungu = sigungu
+                break
+
+        if found.sigungu is None:
+            for alias, region in REGION_ALIASES.items():
+                if alias in query and region in index.values("region"):
+                    found.region = region
+                    break
+
+        month = _MONTH_RE.search(query)
+        if month:
+            found.month = int(month.group(1))
+
+        if any(keyword in query for keyword in _PET_KEYWORDS):
+            found.has_pet_info = True
+
+        return found
+
+
+def _months_between(start_date: str, end_date: str) -> Set[int]:
+    """YYYYMMDD 기간이 걸치는 월(1~12) 집합"""
+    if len(start_date) < 6 or len(end_date) < 6:
+        return set()
+    year, month = int(start_date[:4]), int(start_date[4:6])
+    end_year, end_month = int(end_date[:4]), int(end_date[4:6])
+    months = set()
+    while (year, month) <= (end_year, end_month) and len(months) < 12:
+        months.add(month)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def bitmap_to_ids(bits: int) -> List[int]:
+    """비트맵에서 켜진 비트의 위치(문서 번호) 목록"""
+    ids = []
+    while bits:
+        low = bits & -bits
+        ids.append(low.bit_length() - 1)
+        bits ^= low
+    return ids
+
+
+class MetadataBitmapIndex:
+    """필드 값별로 문서 번호 비트맵(int)을 유지하여 AND 연산으로 후보 집합을 구함"""
+
+    FIELDS = ("region", "sigungu", "has_pet_info", "festivaltype")
+
+    def __init__(self, documents: List[Document]):
+        self.n_docs = len(documents)
+        self.all_docs = (1 << self.n_docs) - 1
+        self.bitmaps: Dict[str, Dict[object, int]] = {field: defaultdict(int) for field in self.FIELDS}
+        self.month_bitmaps: Dict[int, int] = defaultdict(int)
+
+        for doc_id, doc in enumerate(documents):
+            bit = 1 << doc_id
+            for field in self.FIELDS:
+                if field in doc.metadata:
+                    self.bitmaps[field][doc.metadata[field]] |= bit
+            for month in _months_between(doc.metadata.get("start_date", ""), doc.metadata.get("end_date", "")):
+                self.month_bitmaps[month] |= bit
+
+    def values(self, field: str) -> List:
+        return [value for value in self.bitmaps[field] if value]
+
+    def eligible(self, festival_filter: Optional[FestivalFilter]) -> Optional[int]:
+        """조건을 만족하는 문서 비트맵 (조건이 없으면 None)"""
+        if festival_filter is None or festival_filter.is_empty():
+            return None
+        bits = self.all_docs
+        for field in self.FIELDS:
+            value = getattr(festival_filter, field)
+            if value is not None:
+                bits &= self.bitmaps[field].get(value, 0)
+        if festival_filter.month is not None:
+            bits &= self.month_bitmaps.get(festival_filter.month, 0)
+        return bits
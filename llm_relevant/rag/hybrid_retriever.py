@@ -0,0 +1,206 @@
+# hybrid_retriever.py
+# BM25(한국어 문자 n-gram 역색인) + FAISS 벡터 검색을 RRF(Reciprocal Rank Fusion)로 결합하는 리트리버
+
+import heapq
+import logging
+import math
+import re
+import time
+from collections import Counter, defaultdict, deque
+from typing import AbstractSet, Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import PrivateAttr
+
+from festival_metadata import FestivalFilter, MetadataBitmapIndex, bitmap_to_ids
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"[0-9a-z가-힣]+")
+
+
+def tokenize(text: str, n: int = 2) -> List[str]:
+    """어절 단위 토큰 + 어절 내부 문자 n-gram (형태소 분석기 없이 '순창장류축제' 같은 복합어를 부분 매칭)"""
+    tokens = []
+    for word in _WORD_RE.findall(text.lower()):
+        tokens.append(word)
+        if len(word) > n:
+            tokens.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return tokens
+
+
+def document_key(doc: Document) -> Tuple[Any, Any, str]:
+    """FAISS docstore에서 꺼낸 문서와 원본 청크를 대응시키기 위한 키"""
+    return doc.metadata.get("source"), doc.metadata.get("row"), doc.page_content
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[int]], k: int = 60) -> List[Tuple[int, float]]:
+    """여러 순위 목록을 RRF 점수(sum 1 / (k + rank))로 결합"""
+    fused: Dict[int, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            fused[doc_id] += 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+class BM25Index:
+    """문서 목록 위에 구축하는 인메모리 역색인 (Okapi BM25)"""
+
+    def __init__(self, texts: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.doc_lengths: List[int] = []
+
+        for doc_id, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            self.doc_lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self.postings[term].append((doc_id, tf))
+
+        self.n_docs = len(self.doc_lengths)
+        self.avg_length = sum(self.doc_lengths) / self.n_docs if self.n_docs else 0.0
+        self.idf = {
+            term: math.log(1 + (self.n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+    def search(self, query: str, k: int, allowed: Optional[AbstractSet[int]] = None) -> List[Tuple[int, float]]:
+        """질의 토큰의 posting만 순회하여 상위 k개 (doc_id, score) 반환 (allowed가 있으면 그 문서만 점수 계산)"""
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf[term]
+            for doc_id, tf in postings:
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                norm = tf + self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / self.avg_length)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / norm
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+
+class HybridRetriever(BaseRetriever):
+    """BM25와 FAISS 순위를 RRF로 결합하여 상위 k개 문서를 반환
+
+    metadata_index가 있으면 지역/시군구/월/반려동물 조건을 검색 전에 적용하여
+    조건을 만족하는 문서만 BM25 점수 계산 및 FAISS 검색(IDSelector) 대상으로 삼는다.
+    """
+
+    vectorstore: Any
+    documents: List[Document]
+    k: int = 5
+    fetch_k: int = 20
+    rrf_k: int = 60
+    latency_budget_ms: float = 300.0
+    metadata_index: Optional[MetadataBitmapIndex] = None
+    filters: Optional[FestivalFilter] = None
+    auto_filter: bool = False
+
+    _bm25: BM25Index = PrivateAttr()
+    _faiss_to_doc: Dict[int, int] = PrivateAttr(default_factory=dict)
+    _doc_to_faiss: Dict[int, int] = PrivateAttr(default_factory=dict)
+    _latencies: Deque[Dict[str, float]] = PrivateAttr(default_factory=lambda: deque(maxlen=1000))
+
+    def model_post_init(self, __context: Any) -> None:
+        self._bm25 = BM25Index([doc.page_content for doc in self.documents])
+
+        key_to_doc = {document_key(doc): i for i, doc in enumerate(self.documents)}
+        for faiss_id, docstore_id in self.vectorstore.index_to_docstore_id.items():
+            stored = self.vectorstore.docstore.search(docstore_id)
+            if isinstance(stored, Document) and document_key(stored) in key_to_doc:
+                self._faiss_to_doc[faiss_id] = key_to_doc[document_key(stored)]
+        self._doc_to_faiss = {doc_id: faiss_id for faiss_id, doc_id in self._faiss_to_doc.items()}
+
+    @classmethod
+    def from_documents(cls, documents: List[Document], vectorstore: Any, **kwargs: Any) -> "HybridRetriever":
+        return cls(vectorstore=vectorstore, documents=documents, **kwargs)
+
+    def _vector_ranking(self, query: str, allowed: Optional[List[int]] = None) -> List[int]:
+        import faiss
+
+        vector = np.array([self.vectorstore._embed_query(query)], dtype=np.float32)
+        if self.vectorstore._normalize_L2:
+            faiss.normalize_L2(vector)
+
+        if allowed is None:
+            _, ids = self.vectorstore.index.search(vector, self.fetch_k)
+        else:
+            faiss_ids = np.array([self._doc_to_faiss[i] for i in allowed if i in self._doc_to_faiss], dtype=np.int64)
+            if not len(faiss_ids):
+                return []
+            params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(faiss_ids))
+            _, ids = self.vectorstore.index.search(vector, min(self.fetch_k, len(faiss_ids)), params=params)
+        return [self._faiss_to_doc[i] for i in ids[0] if i in self._faiss_to_doc]
+
+    def _resolve_filter(self, query: str, filters: Optional[FestivalFilter]) -> Optional[List[int]]:
+        """적용할 조건의 후보 문서 번호 목록 (조건이 없으면 None)"""
+        if self.metadata_index is None:
+            return None
+        explicit = filters or self.filters
+        if explicit is not None:
+            bits = self.metadata_index.eligible(explicit)
+            return None if bits is None else bitmap_to_ids(bits)
+        if self.auto_filter:
+            inferred = FestivalFilter.from_query(query, self.metadata_index)
+            bits = self.metadata_index.eligible(inferred)
+            if bits:
+                return bitmap_to_ids(bits)
+            if bits == 0:
+                # 질의에서 추정한 조건은 틀릴 수 있으므로, 후보가 하나도 없으면 필터 없이 검색
+                logger.info(f"추정 필터 {inferred}에 해당하는 문서가 없어 전체 검색으로 대체합니다.")
+        return None
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun,
+        filters: Optional[FestivalFilter] = None,
+    ) -> List[Document]:
+        started = time.perf_counter()
+        allowed = self._resolve_filter(query, filters)
+        if allowed is not None and not allowed:
+            return []
+        filter_done = time.perf_counter()
+        bm25_ranking = [
+            doc_id for doc_id, _ in self._bm25.search(query, self.fetch_k, None if allowed is None else set(allowed))
+        ]
+        bm25_done = time.perf_counter()
+        vector_ranking = self._vector_ranking(query, allowed)
+        vector_done = time.perf_counter()
+        fused = reciprocal_rank_fusion([bm25_ranking, vector_ranking], k=self.rrf_k)[:self.k]
+        finished = time.perf_counter()
+
+        timing = {
+            "filter_ms": (filter_done - started) * 1000,
+            "bm25_ms": (bm25_done - filter_done) * 1000,
+            "vector_ms": (vector_done - bm25_done) * 1000,
+            "fusion_ms": (finished - vector_done) * 1000,
+            "total_ms": (finished - started) * 1000,
+        }
+        self._latencies.append(timing)
+        if timing["total_ms"] > self.latency_budget_ms:
+            logger.warning(f"하이브리드 검색 지연 예산 초과: {timing['total_ms']:.1f}ms > {self.latency_budget_ms}ms (query={query!r})")
+
+        return [self.documents[doc_id] for doc_id, _ in fused]
+
+    def latency_report(self) -> Dict[str, Dict[str, float]]:
+        """단계별 p50/p95/max 지연(ms) 및 예산 초과 횟수"""
+        if not self._latencies:
+            return {}
+        report = {}
+        for stage in ("filter_ms", "bm25_ms", "vector_ms", "fusion_ms", "total_ms"):
+            values = sorted(t[stage] for t in self._latencies)
+            report[stage] = {
+                "p50": values[len(values) // 2],
+                "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+                "max": values[-1],
+            }
+        report["budget"] = {
+            "budget_ms": self.latency_budget_ms,
+            "queries": len(self._latencies),
+            "over_budget": sum(1 for t in self._latencies if t["total_ms"] > self.latency_budget_ms),
+        }
+        return report
@@ -0,0 +1,122 @@
+# prompt_builder.py
+# 시스템 프롬프트를 정적 프리픽스 / 대화 예시 / 턴별 섹션으로 조립하고 섹션별 토큰 수를 측정
+
+import re
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, get_buffer_string
+from langchain_core.outputs import LLMResult
+from langchain_core.prompts.chat import BaseChatPromptTemplate
+from pydantic import PrivateAttr
+
+from prompts import SAMPLE_DIALOGUE, SYSTEM_INSTRUCTIONS, TURN_TEMPLATE
+
+_HANGUL_RE = re.compile(r"[가-힣]")
+_OTHER_RE = re.compile(r"[^\s가-힣]")
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 쓰는 근사치: 한글 음절당 1토큰, 그 외 문자는 4자당 1토큰"""
+    hangul = len(_HANGUL_RE.findall(text))
+    other = len(_OTHER_RE.findall(text))
+    return hangul + (other + 3) // 4
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class SectionedChatPrompt(BaseChatPromptTemplate):
+    """ConversationalRetrievalChain의 combine_docs 프롬프트로 쓰는 섹션 조립기
+
+    - instructions: 모든 턴에서 동일하게 맨 앞에 오는 정적 프리픽스 (프리픽스 캐시 대상)
+    - sample_dialogue: 1단계(대화 기록이 없는 첫 턴)에서만 포함, compact=False면 항상 포함
+    - turn: 대화 기록 + 검색 문서 (매 턴 변하는 부분)
+    """
+
+    input_variables: List[str] = ["chat_history", "context", "question"]
+    instructions: str = SYSTEM_INSTRUCTIONS
+    sample_dialogue: str = SAMPLE_DIALOGUE
+    turn_template: str = TURN_TEMPLATE
+    compact: bool = True
+
+    _section_tokens: Deque[Dict[str, int]] = PrivateAttr(default_factory=lambda: deque(maxlen=1000))
+
+    def format_messages(self, **kwargs: Any) -> List[BaseMessage]:
+        chat_history = kwargs.get("chat_history") or ""
+        if isinstance(chat_history, list):
+            chat_history = get_buffer_string(chat_history)
+        question = kwargs.get("question", "")
+
+        sections = {"instructions": self.instructions}
+        if not (self.compact and chat_history.strip()):
+            sections["sample_dialogue"] = self.sample_dialogue
+        sections["turn"] = self.turn_template.format(chat_history=chat_history, context=kwargs.get("context", ""))
+
+        tokens = {name: estimate_tokens(text) for name, text in sections.items()}
+        tokens["question"] = estimate_tokens(question)
+        tokens["total"] = sum(tokens.values())
+        self._section_tokens.append(tokens)
+
+        return [SystemMessage(content="\n".join(sections.values())), HumanMessage(content=question)]
+
+    @property
+    def last_section_tokens(self) -> Dict[str, int]:
+        return self._section_tokens[-1] if self._section_tokens else {}
+
+    def token_report(self) -> Dict[str, Dict[str, float]]:
+        """섹션별 평균/최대 추정 토큰 수"""
+        if not self._section_tokens:
+            return {}
+        names = {name for tokens in self._section_tokens for name in tokens}
+        return {
+            name: {
+                "avg": sum(t.get(name, 0) for t in self._section_tokens) / len(self._section_tokens),
+                "max": max(t.get(name, 0) for t in self._section_tokens),
+            }
+            for name in sorted(names)
+        }
+
+
+class PromptUsageTracker(BaseCallbackHandler):
+    """LLM 응답의 usage_metadata로 실제 입력 토큰과 프리픽스 캐시 적중 토큰을 집계
+
+    ClovaX(OpenAI 호환 응답)가 prompt_tokens_details.cached_tokens를 내려주면 cache_read로
+    잡히고, 내려주지 않으면 캐시 적중 여부를 알 수 없으므로 'unreported'로 표시한다.
+    """
+
+    def __init__(self, maxlen: int = 1000):
+        self.calls: Deque[Dict[str, Optional[int]]] = deque(maxlen=maxlen)
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if not usage:
+                    continue
+                details = usage.get("input_token_details") or {}
+                self.calls.append({
+                    "input_tokens": usage.get("input_tokens", 0),
+                    "output_tokens": usage.get("output_tokens", 0),
+                    "cache_read": details.get("cache_read"),
+                })
+
+    def report(self) -> Dict[str, Any]:
+        if not self.calls:
+            return {}
+        inputs = [c["input_tokens"] for c in self.calls]
+        cache_reads = [c["cache_read"] for c in self.calls if c["cache_read"] is not None]
+        return {
+            "calls": len(self.calls),
+            "input_tokens_p50": _percentile(inputs, 0.5),
+            "input_tokens_p95": _percentile(inputs, 0.95),
+            "output_tokens_total": sum(c["output_tokens"] for c in self.calls),
+            "prefix_cache": (
+                {"status": "reported", "cached_tokens_total": sum(cache_reads),
+                 "cached_ratio": sum(cache_reads) / max(1, sum(inputs))}
+                if cache_reads else {"status": "unreported"}
+            ),
+        }
@@ -0,0 +1,166 @@
+# session_memory.py
+# 토큰 예산이 있는 요약형 대화 메모리 (최근 N턴은 원문 유지, 오래된 턴은 누적 요약으로 접음)
+# 세션 상태는 SQLite 파일에 저장하여 여러 워커 프로세스가 같은 대화를 이어받을 수 있다.
+
+import json
+import logging
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.memory import BaseMemory
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from prompt_builder import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PROMPT = """다음은 호남 축제 추천 상담의 이전 대화 요약과 새로 접을 대화입니다.
+사용자의 여행 시기, 동반자, 선호 분위기, 관심사, 제약 조건, 이미 추천·거절된 축제를 빠짐없이 남기고
+인사말·예시 문구는 버린 뒤, 5문장 이내의 한국어 요약으로 다시 작성하세요.
+
+# 이전 요약
+{summary}
+
+# 새로 접을 대화
+{dialogue}
+
+# 갱신된 요약
+"""
+
+
+@dataclass
+class SessionState:
+    summary: str = ""
+    turns: List[Dict[str, str]] = field(default_factory=list)
+    version: int = 0
+
+
+class SqliteSessionStore:
+    """세션별 (요약, 최근 턴, 버전)을 저장하는 SQLite 저장소 (버전 비교로 동시 갱신 충돌 감지)"""
+
+    def __init__(self, path: str, timeout: float = 5.0):
+        self.path = path
+        self.timeout = timeout
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS session_memory ("
+                " session_id TEXT PRIMARY KEY, summary TEXT NOT NULL, turns TEXT NOT NULL,"
+                " version INTEGER NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=self.timeout)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def load(self, session_id: str) -> SessionState:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT summary, turns, version FROM session_memory WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        if not row:
+            return SessionState()
+        return SessionState(summary=row[0], turns=json.loads(row[1]), version=row[2])
+
+    def save(self, session_id: str, state: SessionState) -> bool:
+        """state.version이 저장된 버전과 같을 때만 저장 (다른 워커가 먼저 갱신했으면 False)"""
+        turns = json.dumps(state.turns, ensure_ascii=False)
+        with self._connect() as conn:
+            if state.version == 0:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO session_memory (session_id, summary, turns, version, updated_at)"
+                    " VALUES (?, ?, ?, 1, ?)",
+                    (session_id, state.summary, turns, time.time()),
+                )
+            else:
+                cursor = conn.execute(
+                    "UPDATE session_memory SET summary = ?, turns = ?, version = version + 1, updated_at = ?"
+                    " WHERE session_id = ? AND version = ?",
+                    (state.summary, turns, time.time(), session_id, state.version),
+                )
+            return cursor.rowcount == 1
+
+    def delete(self, session_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM session_memory WHERE session_id = ?", (session_id,))
+
+
+class SummaryBufferSessionMemory(BaseMemory):
+    """ConversationBufferMemory 대체: 최근 max_turns턴 + 누적 요약, 전체가 max_token_budget을 넘지 않음"""
+
+    store: Any
+    session_id: str
+    llm: Optional[Any] = None
+    memory_key: str = "chat_history"
+    input_key: str = "question"
+    output_key: str = "answer"
+    max_turns: int = 3
+    max_token_budget: int = 1200
+    max_retries: int = 3
+
+    @property
+    def memory_variables(self) -> List[str]:
+        return [self.memory_key]
+
+    def load_memory_variables(self, inputs: Dict[str, Any]) -> Dict[str, List[BaseMessage]]:
+        state = self.store.load(self.session_id)
+        messages: List[BaseMessage] = []
+        if state.summary:
+            messages.append(SystemMessage(content=f"이전 대화 요약: {state.summary}"))
+        for turn in state.turns:
+            messages.append(HumanMessage(content=turn["human"]))
+            messages.append(AIMessage(content=turn["ai"]))
+        return {self.memory_key: messages}
+
+    def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
+        turn = {"human": str(inputs.get(self.input_key, "")), "ai": str(outputs.get(self.output_key, ""))}
+        for _ in range(self.max_retries):
+            state = self.store.load(self.session_id)
+            state.turns.append(turn)
+            self._fold(state)
+            if self.store.save(self.session_id, state):
+                return
+        logger.warning(f"세션 메모리 저장 충돌이 반복되어 이번 턴을 저장하지 못했습니다: {self.session_id}")
+
+    def clear(self) -> None:
+        self.store.delete(self.session_id)
+
+    def _tokens(self, state: SessionState) -> int:
+        return estimate_tokens(state.summary) + sum(
+            estimate_tokens(turn["human"]) + estimate_tokens(turn["ai"]) for turn in state.turns
+        )
+
+    def _fold(self, state: SessionState) -> None:
+        """턴 수 또는 토큰 예산을 넘은 오래된 턴들을 요약으로 접음 (가장 최근 턴은 항상 원문 유지)"""
+        overflow = []
+        while len(state.turns) > 1 and (len(state.turns) > self.max_turns or self._tokens(state) > self.max_token_budget):
+            overflow.append(state.turns.pop(0))
+        if overflow:
+            state.summary = self._summarize(state.summary, overflow)
+
+    def _summarize(self, summary: str, turns: List[Dict[str, str]]) -> str:
+        dialogue = "\n".join(f"사용자: {t['human']}\n어시스턴트: {t['ai']}" for t in turns)
+        if self.llm is not None:
+            try:
+                result = self.llm.invoke(SUMMARY_PROMPT.format(summary=summary or "(없음)", dialogue=dialogue))
+                return self._truncate(getattr(result, "content", str(result)).strip())
+            except Exception as e:
+                logger.warning(f"대화 요약 LLM 호출 실패, 사용자 발화만 남깁니다: {e}")
+        # LLM이 없거나 실패하면 사용자 발화만 이어 붙임 (조건 정보는 대부분 사용자 발화에 있음)
+        user_lines = " / ".join(t["human"] for t in turns)
+        return self._truncate(f"{summary} / {user_lines}" if summary else user_lines)
+
+    def _truncate(self, summary: str) -> str:
+        """요약 자체가 예산의 절반을 넘지 않도록 앞부분(오래된 내용)부터 잘라냄"""
+        limit = self.max_token_budget // 2
+        while summary and estimate_tokens(summary) > limit:
+            summary = summary[len(summary) // 10 + 1:]
+        return summary
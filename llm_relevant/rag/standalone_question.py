@@ -0,0 +1,102 @@
+# standalone_question.py
+# 질문 재구성(condense) LLM 호출이 필요 없는 질문을 값싼 규칙으로 판별하여 호출을 생략하는 래퍼
+
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from langchain.chains.base import Chain
+from langchain_core.callbacks import CallbackManagerForChainRun
+from pydantic import PrivateAttr
+
+from festival_metadata import REGION_ALIASES
+
+# 이전 대화를 가리키는 지시어가 있으면 축제명이 없는 한 재구성이 필요하다고 본다
+_ANAPHORA_RE = re.compile(r"(거기|그곳|저기|그\s*축제|그\s*행사|이\s*축제|그거|이거|아까|방금|위에|첫\s*번째|두\s*번째|[0-9]\s*번)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+class FestivalNameIndex:
+    """축제명·지역명·시군구명 사전 (질문에 명시적인 대상이 있는지 판별)"""
+
+    def __init__(self, titles: Iterable[str], places: Iterable[str]):
+        self.titles = sorted({_SPACE_RE.sub("", t) for t in titles if t}, key=len, reverse=True)
+        names = set(REGION_ALIASES)
+        for place in places:
+            if not place:
+                continue
+            names.add(place)
+            if len(place) >= 3:
+                names.add(place[:-1])  # '고창군' → '고창'
+        self.places = sorted(names, key=len, reverse=True)
+
+    @classmethod
+    def from_metadata(cls, metadata: Dict[str, Dict]) -> "FestivalNameIndex":
+        return cls(
+            titles=(m.get("title", "") for m in metadata.values()),
+            places=(m.get("sigungu", "") for m in metadata.values()),
+        )
+
+    def find_festival(self, question: str) -> Optional[str]:
+        compact = _SPACE_RE.sub("", question)
+        return next((title for title in self.titles if title in compact), None)
+
+    def find_place(self, question: str) -> Optional[str]:
+        return next((place for place in self.places if place in question), None)
+
+
+def is_standalone(question: str, chat_history: str, names: FestivalNameIndex) -> bool:
+    """대화 기록 없이도 검색 가능한 질문인지 판별"""
+    if not chat_history.strip():
+        return True
+    if names.find_festival(question):
+        return True
+    if _ANAPHORA_RE.search(question):
+        return False
+    return names.find_place(question) is not None
+
+
+class StandaloneAwareQuestionGenerator(Chain):
+    """ConversationalRetrievalChain.question_generator 대체: 독립 질문이면 원문 그대로 반환하고 LLM 호출 생략"""
+
+    condense_chain: Chain
+    names: Any
+
+    _calls: int = PrivateAttr(default=0)
+    _skipped: int = PrivateAttr(default=0)
+    _condense_seconds: float = PrivateAttr(default=0.0)
+
+    @property
+    def input_keys(self) -> List[str]:
+        return ["question", "chat_history"]
+
+    @property
+    def output_keys(self) -> List[str]:
+        return ["text"]
+
+    def _call(self, inputs: Dict[str, Any], run_manager: Optional[CallbackManagerForChainRun] = None) -> Dict[str, str]:
+        self._calls += 1
+        question = inputs["question"]
+        if is_standalone(question, inputs.get("chat_history", ""), self.names):
+            self._skipped += 1
+            return {"text": question}
+
+        started = time.perf_counter()
+        callbacks = run_manager.get_child() if run_manager else None
+        result = self.condense_chain.invoke(
+            {"question": question, "chat_history": inputs["chat_history"]}, config={"callbacks": callbacks}
+        )
+        self._condense_seconds += time.perf_counter() - started
+        return {"text": result[self.condense_chain.output_keys[0]]}
+
+    def report(self) -> Dict[str, float]:
+        """생략 비율과 (실제 호출 평균 지연 × 생략 횟수)로 추정한 절감 시간"""
+        condensed = self._calls - self._skipped
+        avg_ms = self._condense_seconds / condensed * 1000 if condensed else 0.0
+        return {
+            "calls": self._calls,
+            "skipped": self._skipped,
+            "skip_ratio": self._skipped / self._calls if self._calls else 0.0,
+            "avg_condense_ms": avg_ms,
+            "estimated_saved_ms": avg_ms * self._skipped,
+        }
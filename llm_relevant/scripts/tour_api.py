@@ -96,7 +96,8 @@ from urllib3.poolmanager import PoolManager
 load_dotenv()
 TOUR_API_KEY = os.getenv("PUBLIC_DATA_SERVICE_KEY")
 
-KOR_SERVICE_URL = "https://apis.data.go.kr/B551011/KorService2"
+# 로컬 대역 서버(benchmarks/fake_tour_api.py) 등으로 바꿀 때 TOUR_API_BASE_URL 지정
+KOR_SERVICE_URL = os.getenv("TOUR_API_BASE_URL", "https://apis.data.go.kr/B551011/KorService2").rstrip("/")
 FESTIVAL_API_URL = f"{KOR_SERVICE_URL}/searchFestival2"
 AREA_CODE_API_URL = f"{KOR_SERVICE_URL}/areaCode2"
 _area_code_cache = {}